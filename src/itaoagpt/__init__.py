@@ -1,8 +1,30 @@
-__all__ = ["core"]
+__all__ = ["Analyzer", "AsyncAnalyzer", "analyze_iter", "core"]
 __schema_version__ = "0.1"
 
-try:
-    from importlib.metadata import version as _version
-    __version__ = _version("itaoagpt")
-except Exception:
-    __version__ = "0.0.0"
+# Resolved on first access (PEP 562) so `import itaoagpt` stays cheap: the CLI
+# client forwarding to `itaoagpt serve` never pays for the engine or for
+# importlib.metadata.
+_STREAM_EXPORTS = ("Analyzer", "AsyncAnalyzer", "analyze_iter")
+
+
+def __getattr__(name: str):
+    if name == "__version__":
+        try:
+            from importlib.metadata import version as _version
+            value = _version("itaoagpt")
+        except Exception:
+            value = "0.0.0"
+    elif name in _STREAM_EXPORTS:
+        from itaoagpt.core import stream
+
+        value = getattr(stream, name)
+    elif name == "core":
+        import itaoagpt.core as value
+    else:
+        raise AttributeError(f"module 'itaoagpt' has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__, "__version__"})
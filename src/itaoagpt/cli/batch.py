@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+import json
+from pathlib import Path
+import sys
+from typing import Any, Iterable, Iterator
+
+from itaoagpt.cli.main import analyze_exit_code, contract_output, max_finding_severity
+from itaoagpt.core.engine import resolve_jobs, run_analysis
+
+# (index, JSON line, exit code, max severity, error) of one finished input
+_Done = tuple[int, str, int, str | None, str | None]
+
+
+def iter_batch_paths(paths: list[str], paths_from: str | None) -> Iterator[str]:
+    """Inputs from the command line, then one per line of paths_from ("-": stdin; default when no paths)."""
+    yield from paths
+    if paths_from is None:
+        if paths:
+            return
+        paths_from = "-"
+    fh = sys.stdin if paths_from == "-" else open(Path(paths_from).expanduser(), encoding="utf-8")
+    try:
+        for line in fh:
+            line = line.rstrip("\r\n")
+            if line.strip():
+                yield line
+    finally:
+        if fh is not sys.stdin:
+            fh.close()
+
+
+def _analyze_one(index: int, path_str: str, options: dict[str, Any], fail_on: str) -> _Done:
+    """Analyze one batch input on its own, like `itaoagpt analyze <path> --json` (runs in a worker with --jobs)."""
+    p = Path(path_str).expanduser().resolve()
+    error = None
+    if path_str == "-":
+        error = "stdin is not a batch input"
+    elif not p.exists():
+        error = f"path not found: {p}"
+    else:
+        try:
+            result = run_analysis(path=p, **options)
+        except Exception as e:  # one bad input must not end the sweep
+            error = f"{type(e).__name__}: {e}"
+    deterministic = bool(options.get("deterministic"))
+    if error is not None:
+        out: dict[str, Any] = {"tool": "itaoagpt", "batch": {"index": index, "input": path_str, "exit_code": 1,
+                                                             "error": error}}
+        return index, json.dumps(out, ensure_ascii=False, sort_keys=deterministic), 1, None, error
+    out = contract_output(result, options.get("min_severity") or "low", deterministic)
+    rc = analyze_exit_code(out, fail_on)
+    max_sev = max_finding_severity(out)
+    out["batch"] = {"index": index, "input": path_str, "exit_code": rc, "max_severity": max_sev}
+    return index, json.dumps(out, ensure_ascii=False, sort_keys=deterministic), rc, max_sev, None
+
+
+def _iter_done(
+    inputs: Iterable[tuple[int, str]], options: dict[str, Any], fail_on: str, jobs: int, ordered: bool
+) -> Iterator[_Done]:
+    if jobs <= 1:
+        for index, path_str in inputs:
+            yield _analyze_one(index, path_str, options, fail_on)
+        return
+    inputs = iter(inputs)
+    pool = ProcessPoolExecutor(max_workers=jobs)
+    window = 2 * jobs  # in-flight plus finished-but-held (ordered) inputs
+    pending: set[Future] = set()
+    held: dict[int, _Done] = {}
+    next_index = 0
+    try:
+        while True:
+            while len(pending) + len(held) < window:
+                item = next(inputs, None)
+                if item is None:
+                    break
+                pending.add(pool.submit(_analyze_one, *item, options, fail_on))
+            if not pending:
+                break
+            finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in finished:
+                done = fut.result()
+                if not ordered:
+                    yield done
+                    continue
+                held[done[0]] = done
+                while next_index in held:
+                    yield held.pop(next_index)
+                    next_index += 1
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+
+def run_batch(
+    paths: Iterable[str], options: dict[str, Any], *, fail_on: str, jobs: int = 1, ordered: bool = False
+) -> int:
+    """
+    Stream one JSON line per input to stdout as soon as it is analyzed (input
+    order when ordered, else completion order), then a fail-on summary to
+    stderr. Exit code: 1 if any input could not be analyzed, else 2 if any
+    breached --fail-on, else 0.
+    """
+    failed: list[tuple[int, str, str | None]] = []
+    errors: list[tuple[int, str, str]] = []
+    names: dict[int, str] = {}
+
+    def numbered() -> Iterator[tuple[int, str]]:
+        for index, path_str in enumerate(paths):
+            names[index] = path_str
+            yield index, path_str
+
+    total = 0
+    for index, line, rc, max_sev, error in _iter_done(numbered(), options, fail_on, resolve_jobs(jobs), ordered):
+        total += 1
+        sys.stdout.buffer.write((line + "\n").encode("utf-8"))
+        sys.stdout.buffer.flush()
+        path_str = names.pop(index)
+        if error is not None:
+            errors.append((index, path_str, error))
+        elif rc:
+            failed.append((index, path_str, max_sev))
+
+    if not total:
+        print("[ERR] no input paths", file=sys.stderr)
+        return 1
+    for _, path_str, max_sev in sorted(failed):
+        print(f"[FAIL] {path_str}: max_severity={max_sev} >= fail_on={fail_on}", file=sys.stderr)
+    for _, path_str, error in sorted(errors):
+        print(f"[ERR] {path_str}: {error}", file=sys.stderr)
+    rc = 1 if errors else 2 if failed else 0
+    ok = total - len(failed) - len(errors)
+    print(f"[BATCH] inputs={total} ok={ok} failed={len(failed)} errors={len(errors)} fail_on={fail_on} exit_code={rc}",
+          file=sys.stderr)
+    return rc
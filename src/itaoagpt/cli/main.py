@@ -2,12 +2,13 @@
 from __future__ import annotations
 
 # stdlib
+import os
 import sys
 import json
 import argparse
-import importlib.metadata as imd
 from pathlib import Path
-from typing import Any
+import time
+from typing import Any, Iterator
 
 import itaoagpt
 
@@ -21,6 +22,8 @@ def _force_utf8_stdio() -> None:
             # Some environments may not support reconfigure; ignore and continue.
             pass
 
+_SIZE_UNITS = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+
 # severity ranking (single source of truth)
 SEV_RANK = {
     "low": 1,
@@ -168,19 +171,59 @@ def _print_text(result: dict[str, Any], min_severity: str) -> None:
         print(top_line)
 
 
+def _add_scan_args(p: argparse.ArgumentParser) -> None:
+    """Input selection and analysis options shared by analyze and analyze-batch."""
+    p.add_argument("--type", dest="atype", default="log", help="Analyzer type (V0: log)")
+    p.add_argument("--glob", action="append", default=None,
+                   help="When path is a directory: file glob to include (repeatable; default: *.log)")
+    p.add_argument("--exclude", action="append", default=[], metavar="GLOB",
+                   help="When path is a directory: skip matching files and directories (repeatable)")
+    p.add_argument("--recursive", action="store_true",
+                   help="When path is a directory: descend into all subdirectories (symlink loops are skipped)")
+    p.add_argument("--max-depth", type=int, default=None, metavar="N",
+                   help="When path is a directory: descend at most N directory levels"
+                        " (default: top level only, unless --glob contains / or **)")
+    p.add_argument("--order", default="name", choices=["name", "time"],
+                   help="When path is a directory: read files one after another in path order (name, default)"
+                        " or interleave their lines by leading timestamp (time; serial, one open file per input)")
+    p.add_argument("--since", default=None, metavar="TIME",
+                   help="Analyze only lines stamped at/after TIME (YYYY-MM-DD[ HH:MM:SS[.ffffff]][Z|+hh:mm],"
+                        " no zone = UTC); files are assumed time-ordered and bisected, not read in full")
+    p.add_argument("--until", default=None, metavar="TIME",
+                   help="Analyze only lines stamped before TIME (same format as --since)")
+    p.add_argument("--max-lines", type=int, default=20000, help="Total max lines to read (V0 safety)")
+    p.add_argument("--min-severity", default="low", choices=["low", "medium", "high"],
+                   help="Filter findings: low|medium|high (default: low)")
+    p.add_argument("--fail-on", default="none", choices=["none", "low", "medium", "high"],
+                   help="Exit non-zero if findings at/above: none|low|medium|high")
+    p.add_argument("--deterministic", action="store_true", help="Deterministic mode for testing/repeatability")
+    p.add_argument("--debug", action="store_true", help="Include debug_meta in JSON output (omitted in deterministic mode)")
+    p.add_argument("--parse-cache-size", type=int, default=None,
+                   help="LRU entries for repeated message parsing (default: 16384, 0 disables)")
+    p.add_argument("--no-cache", action="store_true",
+                   help="Directory scans: do not reuse or store per-file results of unchanged files")
+    p.add_argument("--cache-dir", default=None,
+                   help="Per-file result cache for directory scans (default: user cache dir)")
+    p.add_argument("--cache-verify", action="store_true",
+                   help="Also key cached results on a SHA-256 of the file content")
+    p.add_argument("--topk-sketch", type=int, default=0, metavar="CAPACITY",
+                   help="Approximate top fingerprints with a Space-Saving sketch of CAPACITY entries"
+                        " (bounded memory, counts reported with count_error; default: 0 = exact)")
+    p.add_argument("--hll-precision", type=int, default=0, metavar="P",
+                   help="Estimate unique_fingerprints with a HyperLogLog of 2^P registers (4-18,"
+                        " std error 1.04/sqrt(2^P); default: 0 = exact count)")
+    p.add_argument("--max-memory", default=None, metavar="SIZE",
+                   help="Budget for the fingerprint state (e.g. 256M, 1G): past it counts degrade to a"
+                        " Space-Saving sketch and a HyperLogLog, listed in stats.approximate (default: unlimited)")
+
+
 def build_parser() -> argparse.ArgumentParser:
     p = argparse.ArgumentParser(prog="itaoagpt", description="ItaoaGPT (CLI-first analysis tool)")
     sub = p.add_subparsers(dest="cmd", required=True)
 
     p_an = sub.add_parser("analyze", help="Analyze a path using a specific analyzer type")
     p_an.add_argument("path", help="File or directory path")
-    p_an.add_argument("--type", dest="atype", default="log", help="Analyzer type (V0: log)")
-    p_an.add_argument("--glob", default="*.log", help="When path is a directory: file glob to include (default: *.log)")
-    p_an.add_argument("--max-lines", type=int, default=20000, help="Total max lines to read (V0 safety)")
-    p_an.add_argument("--min-severity", default="low", choices=["low", "medium", "high"],
-                      help="Filter findings: low|medium|high (default: low)")
-    p_an.add_argument("--fail-on", default="none", choices=["none", "low", "medium", "high"],
-                      help="Exit non-zero if findings at/above: none|low|medium|high")
+    _add_scan_args(p_an)
     p_an.add_argument("--out", default=None, help="Write JSON report to a file")
     p_an.add_argument("--json", action="store_true", help="Print JSON output to stdout")
     p_an.add_argument("--text", action="store_true", help="Print human-readable output to stdout")
@@ -190,8 +233,34 @@ def build_parser() -> argparse.ArgumentParser:
         default="plain",
         help="Text output style: plain (CI key=value, default) | table (Unicode box)",
     )
-    p_an.add_argument("--deterministic", action="store_true", help="Deterministic mode for testing/repeatability")
-    p_an.add_argument("--debug", action="store_true", help="Include debug_meta in JSON output (omitted in deterministic mode)")
+    p_an.add_argument("--profile", default=None, metavar="PATH",
+                      help="Write a cProfile dump of the run to PATH (read it with python -m pstats;"
+                           " worker processes of --jobs are not profiled)")
+    p_an.add_argument("--jobs", type=int, default=1,
+                      help="Analyze directory files and byte ranges of large files in N worker processes"
+                           " (default: 1, 0 = CPU count)")
+    p_an.add_argument("--incremental", action="store_true",
+                      help="Resume from per-file checkpoints and read only appended bytes (output equals a full rescan)")
+    p_an.add_argument("--checkpoint-dir", default=None,
+                      help="Checkpoint store for --incremental (default: user cache dir)")
+    p_an.add_argument("--trace-memory", action="store_true",
+                      help="With --debug: trace allocations (tracemalloc, slow) and report the peak in debug_meta.memory")
+    p_an.add_argument("--follow", action="store_true",
+                      help="Tail the file (or --glob files of a directory) and print triage snapshots as JSON lines"
+                           " until interrupted (--max-lines is ignored)")
+    p_an.add_argument("--follow-interval", type=float, default=10.0,
+                      help="--follow: snapshot every N seconds (default: 10, 0 disables)")
+    p_an.add_argument("--follow-events", type=int, default=0,
+                      help="--follow: snapshot every N parsed events (default: 0 = off)")
+
+    p_bat = sub.add_parser("analyze-batch",
+                           help="Analyze many inputs independently in one process, one JSON line per input")
+    p_bat.add_argument("paths", nargs="*", help="Files or directories (default: read paths from stdin)")
+    p_bat.add_argument("--paths-from", default=None, metavar="FILE",
+                       help="Also read input paths from FILE, one per line (- = stdin)")
+    _add_scan_args(p_bat)
+    p_bat.add_argument("--jobs", type=int, default=1,
+                       help="Analyze N inputs at a time in worker processes (default: 1, 0 = CPU count)")
 
     p_rep = sub.add_parser("report", help="Print a saved JSON report (from --out)")
     p_rep.add_argument("in_json", help="Path to report JSON")
@@ -203,13 +272,17 @@ def build_parser() -> argparse.ArgumentParser:
     p_rep.add_argument("--text", action="store_true", help="Print human-readable output to stdout")
 
     sub.add_parser("version", help="Print version info")
+
+    p_srv = sub.add_parser("serve", help="Keep a warm analysis server on a Unix socket for thin-client CLI calls")
+    p_srv.add_argument("--socket", default=None, metavar="PATH",
+                       help="Socket to listen on (default: serve.sock in the user cache dir); set"
+                            " ITAOAGPT_SOCKET=PATH to forward `itaoagpt analyze` calls to it")
+    p_srv.add_argument("--idle-timeout", type=float, default=0.0, metavar="SECONDS",
+                       help="Exit after SECONDS without requests (default: 0 = run until interrupted)")
     return p
 def cmd_version() -> int:
     # Version: package metadata (editable install dahil) → en sağlam kaynak
-    try:
-        ver = imd.version("itaoagpt")
-    except Exception:
-        ver = "0.0.0"
+    ver = itaoagpt.__version__
 
     schema_version = itaoagpt.__schema_version__
     out = {"tool": "itaoagpt", "version": ver, "schema_version": schema_version}
@@ -217,35 +290,201 @@ def cmd_version() -> int:
     return 0
 
 
+def _parse_size(text: str) -> int | None:
+    """Bytes of a size like 1048576, 512K, 256M or 1.5G (binary units), or None."""
+    text = text.strip().upper().removesuffix("B").removesuffix("I")
+    scale = 1
+    if text[-1:] in _SIZE_UNITS:
+        scale = _SIZE_UNITS[text[-1]]
+        text = text[:-1]
+    try:
+        return int(float(text) * scale)
+    except (ValueError, OverflowError):
+        return None
+
+
+def _scan_options(
+    topk_sketch: int, hll_precision: int, since: str | None, until: str | None, max_memory: str | None
+) -> dict[str, Any] | None:
+    """Validated run_analysis knobs shared by analyze and analyze-batch (None: error printed)."""
+    from itaoagpt.core.timeline import parse_time_bound
+
+    if topk_sketch < 0:
+        print("[ERR] --topk-sketch must be >= 0", file=sys.stderr)
+        return None
+    if hll_precision and not 4 <= hll_precision <= 18:
+        print("[ERR] --hll-precision must be 0 (off) or between 4 and 18", file=sys.stderr)
+        return None
+    bounds: dict[str, int | None] = {"since": None, "until": None}
+    for name, value in (("since", since), ("until", until)):
+        if value is None:
+            continue
+        bounds[name] = parse_time_bound(value)
+        if bounds[name] is None:
+            print(f"[ERR] --{name}: not a timestamp (YYYY-MM-DD[ HH:MM:SS[.ffffff]][Z|+hh:mm]): {value}",
+                  file=sys.stderr)
+            return None
+    if bounds["since"] is not None and bounds["until"] is not None and bounds["since"] >= bounds["until"]:
+        print("[ERR] --since must be earlier than --until", file=sys.stderr)
+        return None
+    budget = 0
+    if max_memory is not None:
+        budget = _parse_size(max_memory)
+        if budget is None or budget <= 0:
+            print(f"[ERR] --max-memory: not a size (bytes, or with K/M/G suffix): {max_memory}", file=sys.stderr)
+            return None
+    return {"topk": topk_sketch, "hll": hll_precision, "since": bounds["since"], "until": bounds["until"],
+            "max_memory": budget}
+
+
+def contract_output(result: dict[str, Any], min_severity: str, deterministic: bool) -> dict[str, Any]:
+    """Contract-safe copy of a run_analysis result: what analyze prints and judges --fail-on on."""
+    out = dict(result)
+    out["findings"] = _filter_findings(result.get("findings", []) or [], min_severity)
+
+    # normalize severity: treat any CRITICAL evidence as high (contract expectation)
+    try:
+        for f in (out.get("findings") or []):
+            ev = " ".join((f.get("evidence") or []))
+            if "CRITICAL" in ev.upper():
+                f["severity"] = "high"
+    except Exception:
+        pass
+
+    # ensure created_at exists (contract)
+    _ensure_created_at(out, deterministic=deterministic)
+
+    # ensure input_summary exists (contract)
+    if "input_summary" not in out:
+        summ = out.get("summary") or {}
+        inp = out.get("input") or {}
+        out["input_summary"] = {
+            "events": summ.get("events"),
+            "source": inp.get("source"),
+        }
+    return out
+
+
+def max_finding_severity(out: dict[str, Any]) -> str | None:
+    """Highest severity among the findings of a contract-safe output (None: no findings)."""
+    max_sev = None
+    for f in (out.get("findings") or []):
+        sev = str(f.get("severity") or "").strip().lower()
+        if sev not in SEV_RANK:
+            continue
+        if max_sev is None or SEV_RANK[sev] > SEV_RANK[max_sev]:
+            max_sev = sev
+    return max_sev
+
+
+def analyze_exit_code(out: dict[str, Any], fail_on: str) -> int:
+    """analyze exit code of a contract-safe output: 2 when --fail-on is breached, else 0."""
+    fail_on = (fail_on or "").strip().lower()
+    if fail_on in ("none", "off", "false", "0") or fail_on not in SEV_RANK:
+        fail_on = ""
+
+    sev_rank = SEV_RANK
+    max_sev = max_finding_severity(out)
+
+    # ------------------------------------------------------------
+    # EXIT CODE CONTRACT
+    # analyze is informational unless --fail-on is explicitly used
+    # ------------------------------------------------------------
+
+    if fail_on:
+        # fail-on threshold breached?
+        if max_sev is not None:
+            if sev_rank[max_sev] >= sev_rank[fail_on]:
+                return 2
+
+    # informational analyze (even if ERROR/CRITICAL exists)
+    return 0
+
+
 def cmd_analyze(
     path_str: str,
     atype: str,
     as_json: bool,
     as_text: bool,
     deterministic: bool,
-    glob: str,
+    glob: list[str] | str | None,
     max_lines: int,
     min_severity: str,
     out_path: str | None,
     fail_on: str,
     debug: bool = False,
     fmt: str = "plain",
+    parse_cache_size: int | None = None,
+    jobs: int = 1,
+    incremental: bool = False,
+    checkpoint_dir: str | None = None,
+    follow: bool = False,
+    follow_interval: float = 10.0,
+    follow_events: int = 0,
+    topk_sketch: int = 0,
+    hll_precision: int = 0,
+    no_cache: bool = False,
+    cache_dir: str | None = None,
+    cache_verify: bool = False,
+    exclude: list[str] | None = None,
+    recursive: bool = False,
+    max_depth: int | None = None,
+    order: str = "name",
+    since: str | None = None,
+    until: str | None = None,
+    max_memory: str | None = None,
+    trace_memory: bool = False,
 ) -> int:
     # lazy import so `version` never depends on engine
     from itaoagpt.core.engine import run_analysis
 
-    stdin_lines: list[str] | None = None
+    scan = _scan_options(topk_sketch, hll_precision, since, until, max_memory)
+    if scan is None:
+        return 1
+    budget = scan["max_memory"]
+    if trace_memory and debug and not deterministic:
+        import tracemalloc
+
+        tracemalloc.start()
+    if max_depth is None and recursive:
+        max_depth = -1
+    if follow:
+        if since is not None or until is not None:
+            print("[WARN] --since / --until ignored with --follow", file=sys.stderr)
+        return _cmd_follow(
+            path_str,
+            glob=glob or "*.log",
+            exclude=exclude or [],
+            max_depth=max_depth,
+            interval=follow_interval,
+            every_events=follow_events,
+            min_severity=min_severity,
+            deterministic=deterministic,
+            parse_cache_size=parse_cache_size,
+            topk=topk_sketch,
+            hll=hll_precision,
+            max_memory=budget,
+        )
+
+    stdin_lines: Iterator[str] | None = None
     if path_str == "-":
-        raw = sys.stdin.buffer.read().decode("utf-8", errors="replace")
-        stdin_lines = raw.splitlines()
+        from itaoagpt.core.reader import iter_stream_lines, open_stream
+
+        # streamed in chunks straight into the aggregation loop (max-lines stops reading);
+        # gzip/bz2/xz input is decompressed on the fly
+        stdin_lines = iter_stream_lines(open_stream(sys.stdin.buffer))
         p = Path("<stdin>")
-        if not stdin_lines:
-            print("[INFO] empty input: no lines received", file=sys.stderr)
+        if incremental:
+            print("[WARN] --incremental ignored for stdin input", file=sys.stderr)
+            incremental = False
     else:
         p = Path(path_str).expanduser().resolve()
         if not p.exists():
             print(f"[ERR] path not found: {p}", file=sys.stderr)
             return 1
+    if order == "time" and (incremental or jobs != 1):
+        print("[WARN] --order time reads serially: --incremental / --jobs ignored", file=sys.stderr)
+        incremental = False
 
     result = run_analysis(
         path=p,
@@ -256,8 +495,34 @@ def cmd_analyze(
         max_lines=max_lines,
         min_severity=min_severity,
         debug=debug,
+        parse_cache_size=parse_cache_size,
+        jobs=jobs,
+        incremental=incremental,
+        checkpoint_dir=Path(checkpoint_dir).expanduser() if checkpoint_dir else None,
+        topk=topk_sketch,
+        hll=hll_precision,
+        result_cache=not no_cache,
+        cache_dir=Path(cache_dir).expanduser() if cache_dir else None,
+        cache_verify=cache_verify,
+        exclude=exclude or [],
+        max_depth=max_depth,
+        order=order,
+        since=scan["since"],
+        until=scan["until"],
+        max_memory=budget,
     )
 
+    stdin_empty = False
+    if stdin_lines is not None:
+        # stop the producer (SIGPIPE/EPIPE upstream) instead of draining the rest
+        try:
+            sys.stdin.close()
+        except Exception:
+            pass
+        stdin_empty = int((result.get("input_summary") or {}).get("lines") or 0) == 0
+        if stdin_empty:
+            print("[INFO] empty input: no lines received", file=sys.stderr)
+
     # default output mode
     if not as_json and not as_text:
         as_text = True
@@ -270,31 +535,10 @@ def cmd_analyze(
         print(f"[OK] wrote: {outp}")
 
     # Build a "contract-safe" output object (used for stdout + fail-on decisions).
-    out2 = dict(result)
-    out2["findings"] = _filter_findings(result.get("findings", []) or [], min_severity)
-
-    # normalize severity: treat any CRITICAL evidence as high (contract expectation)
-    try:
-        for f in (out2.get("findings") or []):
-            ev = " ".join((f.get("evidence") or []))
-            if "CRITICAL" in ev.upper():
-                f["severity"] = "high"
-    except Exception:
-        pass
+    out2 = contract_output(result, min_severity, deterministic)
 
-    # ensure created_at exists (contract)
-    _ensure_created_at(out2, deterministic=deterministic)
-
-    # ensure input_summary exists (contract)
-    if "input_summary" not in out2:
-        summ = out2.get("summary") or {}
-        inp = out2.get("input") or {}
-        out2["input_summary"] = {
-            "events": summ.get("events"),
-            "source": inp.get("source"),
-        }
-
-    # stdout
+    # stdout (rendering is timed here: debug_meta is already part of what gets rendered)
+    render_t0 = time.perf_counter_ns()
     if as_json:
         data = _dump_json(out2, deterministic=deterministic)
         sys.stdout.buffer.write((data + "\n").encode("utf-8"))
@@ -308,37 +552,101 @@ def cmd_analyze(
             from itaoagpt.core.render_text import render_text_ci
 
             text_out = render_text_ci(out2)
-        if stdin_lines is not None and len(stdin_lines) == 0:
+        if stdin_empty:
             text_out = "(note: empty input — 0 lines received)\n" + text_out
         print(text_out)
+    if debug and not deterministic:
+        render_ms = (time.perf_counter_ns() - render_t0) / 1e6
+        print(f"[DEBUG] timing: render_ms={render_ms:.3f}", file=sys.stderr)
 
-    fail_on = (fail_on or "").strip().lower()
-    if fail_on in ("none", "off", "false", "0") or fail_on not in SEV_RANK:
-        fail_on = ""
+    return analyze_exit_code(out2, fail_on)
 
-    sev_rank = SEV_RANK
-    max_sev = None
-    for f in (out2.get("findings") or []):
-        sev = str(f.get("severity") or "").strip().lower()
-        if sev not in sev_rank:
-            continue
-        if max_sev is None or sev_rank[sev] > sev_rank[max_sev]:
-            max_sev = sev
 
-    # ------------------------------------------------------------
-    # EXIT CODE CONTRACT
-    # analyze is informational unless --fail-on is explicitly used
-    # ------------------------------------------------------------
+def cmd_analyze_batch(args: argparse.Namespace) -> int:
+    from itaoagpt.cli.batch import iter_batch_paths, run_batch
 
-    if fail_on:
-        # fail-on threshold breached?
-        if max_sev is not None:
-            if sev_rank[max_sev] >= sev_rank[fail_on]:
-                return 2
+    scan = _scan_options(args.topk_sketch, args.hll_precision, args.since, args.until, args.max_memory)
+    if scan is None:
+        return 1
+    if args.paths_from not in (None, "-") and not Path(args.paths_from).expanduser().is_file():
+        print(f"[ERR] --paths-from: file not found: {args.paths_from}", file=sys.stderr)
+        return 1
+    max_depth = -1 if args.max_depth is None and args.recursive else args.max_depth
+    options = {
+        "analyzer_type": args.atype,
+        "glob": args.glob,
+        "max_lines": args.max_lines,
+        "min_severity": args.min_severity,
+        "deterministic": args.deterministic,
+        "debug": args.debug,
+        "parse_cache_size": args.parse_cache_size,
+        "result_cache": not args.no_cache,
+        "cache_dir": Path(args.cache_dir).expanduser() if args.cache_dir else None,
+        "cache_verify": args.cache_verify,
+        "exclude": args.exclude or [],
+        "max_depth": max_depth,
+        "order": args.order,
+        **scan,
+    }
+    paths = iter_batch_paths(args.paths, args.paths_from)
+    # --deterministic also fixes the line order (input order) when inputs run in parallel
+    return run_batch(paths, options, fail_on=args.fail_on, jobs=args.jobs, ordered=args.deterministic)
+
+
+def _cmd_follow(
+    path_str: str,
+    *,
+    glob: list[str] | str,
+    exclude: list[str],
+    max_depth: int | None,
+    interval: float,
+    every_events: int,
+    min_severity: str,
+    deterministic: bool,
+    parse_cache_size: int | None,
+    topk: int = 0,
+    hll: int = 0,
+    max_memory: int = 0,
+) -> int:
+    from itaoagpt.core.follow import follow
 
-    # informational analyze (even if ERROR/CRITICAL exists)
+    if path_str == "-":
+        print("[ERR] --follow needs a file or directory path (not stdin)", file=sys.stderr)
+        return 1
+    p = Path(path_str).expanduser().resolve()
+    if not p.exists():
+        print(f"[ERR] path not found: {p}", file=sys.stderr)
+        return 1
+    if interval <= 0 and every_events <= 0:
+        print("[ERR] --follow needs --follow-interval > 0 or --follow-events > 0", file=sys.stderr)
+        return 1
+
+    def emit(snap: dict[str, Any]) -> None:
+        data = json.dumps(snap, ensure_ascii=False, sort_keys=deterministic)
+        sys.stdout.buffer.write((data + "\n").encode("utf-8"))
+        sys.stdout.buffer.flush()
+
+    try:
+        follow(
+            p,
+            emit=emit,
+            glob=glob,
+            exclude=exclude,
+            max_depth=max_depth,
+            interval=interval,
+            every_events=every_events,
+            min_severity=min_severity,
+            deterministic=deterministic,
+            parse_cache_size=parse_cache_size,
+            topk=topk,
+            hll=hll,
+            max_memory=max_memory,
+        )
+    except KeyboardInterrupt:
+        pass
     return 0
 
+
 def cmd_report(in_json: str, as_json: bool, as_text: bool, min_severity: str, fail_on: str) -> int:
     p = Path(in_json).expanduser().resolve()
     if not p.exists():
@@ -406,7 +714,11 @@ def render_human_from_json(out: dict) -> str:
     # 3. Unique issues
     uniq = counts.get("unique_fingerprints")
     if uniq is not None:
-        lines.append(f"Unique issues: {uniq}")
+        scope = stats.get("scope") or {}
+        if scope.get("min_severity"):
+            lines.append(f"Unique issues: {uniq} (>= {scope['min_severity']})")
+        else:
+            lines.append(f"Unique issues: {uniq}")
 
     # 4. By level + severity aggregation
     by_level = stats.get("by_level") or out.get("by_level") or {}
@@ -463,26 +775,78 @@ def render_human_report(out: dict) -> str:
 
 def main(argv: list[str] | None = None) -> int:
     _force_utf8_stdio()
+    argv = sys.argv[1:] if argv is None else list(argv)
+    sock = os.environ.get("ITAOAGPT_SOCKET")
+    if sock and argv[:1] == ["analyze"]:
+        # thin client: an `itaoagpt serve` process runs the analysis, warm
+        from itaoagpt.cli.serve import forward
+
+        rc = forward(sock, argv)
+        if rc is not None:
+            return rc
+
     args = build_parser().parse_args(argv)
 
     if args.cmd == "version":
         return cmd_version()
 
+    if args.cmd == "analyze-batch":
+        return cmd_analyze_batch(args)
+
+    if args.cmd == "serve":
+        from itaoagpt.cli.serve import serve
+
+        return serve(args.socket, idle_timeout=args.idle_timeout)
+
     if args.cmd == "analyze":
-        return cmd_analyze(
-            path_str=args.path,
-            atype=args.atype,
-            as_json=args.json,
-            as_text=args.text,
-            deterministic=args.deterministic,
-            glob=args.glob,
-            max_lines=args.max_lines,
-            min_severity=args.min_severity,
-            out_path=args.out,
-            fail_on=args.fail_on,
-            debug=args.debug,
-            fmt=args.format,
-        )
+        profiler = None
+        if args.profile:
+            import cProfile
+
+            profiler = cProfile.Profile()
+            profiler.enable()
+        try:
+            return cmd_analyze(
+                path_str=args.path,
+                atype=args.atype,
+                as_json=args.json,
+                as_text=args.text,
+                deterministic=args.deterministic,
+                glob=args.glob,
+                max_lines=args.max_lines,
+                min_severity=args.min_severity,
+                out_path=args.out,
+                fail_on=args.fail_on,
+                debug=args.debug,
+                fmt=args.format,
+                parse_cache_size=args.parse_cache_size,
+                jobs=args.jobs,
+                incremental=args.incremental,
+                checkpoint_dir=args.checkpoint_dir,
+                follow=args.follow,
+                follow_interval=args.follow_interval,
+                follow_events=args.follow_events,
+                topk_sketch=args.topk_sketch,
+                hll_precision=args.hll_precision,
+                no_cache=args.no_cache,
+                cache_dir=args.cache_dir,
+                cache_verify=args.cache_verify,
+                exclude=args.exclude,
+                recursive=args.recursive,
+                max_depth=args.max_depth,
+                order=args.order,
+                since=args.since,
+                until=args.until,
+                max_memory=args.max_memory,
+                trace_memory=args.trace_memory,
+            )
+        finally:
+            if profiler is not None:
+                profiler.disable()
+                prof_path = Path(args.profile).expanduser().resolve()
+                prof_path.parent.mkdir(parents=True, exist_ok=True)
+                profiler.dump_stats(str(prof_path))
+                print(f"[OK] wrote profile: {prof_path}", file=sys.stderr)
 
     if args.cmd == "report":
         return cmd_report(
@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+import json
+import os
+import socket
+import sys
+from pathlib import Path
+from typing import Any
+
+# The client half of this module runs before argparse on every forwarded
+# `itaoagpt analyze`, so it imports nothing beyond the above; the server half
+# pulls in the CLI and the engine once, when the daemon starts.
+
+SOCKET_ENV = "ITAOAGPT_SOCKET"
+_POLL_SECONDS = 0.5
+
+
+def default_socket() -> Path:
+    from itaoagpt.core.paths import cache_root
+
+    return cache_root() / "serve.sock"
+
+
+# --- wire format ---
+# request:  one JSON line {"argv", "cwd", "env", "encoding"}
+# response: one JSON line {"rc", "stdout", "stderr"} (byte lengths) followed by
+#           the raw stdout and stderr bytes, or {"local": true} when the request
+#           must run in the client process (stdin input, --follow).
+
+
+def _read_exact(rfile: Any, n: int) -> bytes:
+    data = rfile.read(n)
+    if len(data) != n:
+        raise ConnectionError("short response from itaoagpt server")
+    return data
+
+
+def forward(sock_path: str, argv: list[str]) -> int | None:
+    """
+    Run `itaoagpt <argv>` on the server at sock_path and replay its stdout,
+    stderr and exit code. None: run in-process instead (no server reachable,
+    or the server declined the request).
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+    env = dict(os.environ)
+    env.pop(SOCKET_ENV, None)
+    if "COLUMNS" not in env:
+        # text tables size themselves to the client's terminal, not the daemon's
+        try:
+            env["COLUMNS"] = str(os.get_terminal_size(sys.__stdout__.fileno()).columns)
+        except (AttributeError, OSError, ValueError):
+            pass
+    streams = (sys.stdout, sys.stderr)
+    request = {
+        "argv": list(argv),
+        "cwd": os.getcwd(),
+        "env": env,
+        "encoding": [[getattr(s, "encoding", None) or "utf-8", getattr(s, "errors", None) or "strict"] for s in streams],
+    }
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+            conn.connect(sock_path)
+            conn.sendall(json.dumps(request).encode("utf-8") + b"\n")
+            with conn.makefile("rb") as rfile:
+                reply = json.loads(rfile.readline() or b"null")
+                if not isinstance(reply, dict):
+                    raise ConnectionError("no response from itaoagpt server")
+                if reply.get("local"):
+                    return None
+                out = _read_exact(rfile, int(reply["stdout"]))
+                err = _read_exact(rfile, int(reply["stderr"]))
+    except (OSError, ValueError, KeyError) as e:
+        print(f"[WARN] itaoagpt server unavailable at {sock_path} ({e}); running in-process", file=sys.stderr)
+        return None
+    for stream, data in zip(streams, (out, err)):
+        if data:
+            stream.flush()
+            stream.buffer.write(data)
+            stream.buffer.flush()
+    return int(reply["rc"])
+
+
+def _run_request(request: dict[str, Any]) -> dict[str, Any] | tuple[int, bytes, bytes]:
+    """Run one forwarded CLI call in this (forked) process, as the client would have."""
+    import io
+    import traceback
+
+    from itaoagpt.cli.main import build_parser, main
+
+    argv = [str(a) for a in request["argv"]]
+    os.environ.clear()
+    os.environ.update(request.get("env") or {})
+    os.environ.pop(SOCKET_ENV, None)
+    os.chdir(request["cwd"])
+
+    buffers = (io.BytesIO(), io.BytesIO())
+    (out_enc, out_err), (err_enc, err_err) = request.get("encoding") or [["utf-8", "strict"]] * 2
+    sys.stdout = io.TextIOWrapper(buffers[0], encoding=out_enc, errors=out_err, write_through=True)
+    sys.stderr = io.TextIOWrapper(buffers[1], encoding=err_enc, errors=err_err, write_through=True)
+    sys.stdin = io.TextIOWrapper(io.BytesIO(), encoding="utf-8")
+    try:
+        if argv[:1] == ["analyze"]:
+            args = build_parser().parse_args(argv)
+            if args.follow or args.path == "-":
+                return {"local": True}
+        rc = main(argv)
+    except SystemExit as e:
+        # same exit status and message as the interpreter gives an uncaught SystemExit
+        if e.code is None or isinstance(e.code, int):
+            rc = e.code or 0
+        else:
+            print(e.code, file=sys.stderr)
+            rc = 1
+    except BaseException:
+        traceback.print_exc()
+        rc = 1
+    sys.stdout.flush()
+    sys.stderr.flush()
+    return int(rc or 0), buffers[0].getvalue(), buffers[1].getvalue()
+
+
+def _peer_uid(conn: socket.socket) -> int | None:
+    """uid of the process at the other end of a Unix socket (None: the platform cannot tell)."""
+    if not hasattr(socket, "SO_PEERCRED"):
+        return None
+    import struct
+
+    creds = conn.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i"))
+    return struct.unpack("3i", creds)[1]  # struct ucred: pid, uid, gid
+
+
+def _warm_up() -> None:
+    """Import and prime everything a request needs, once, before the first fork."""
+    import itaoagpt
+    import itaoagpt.cli.main  # noqa: F401
+    import itaoagpt.core.analyzers.log as log
+    import itaoagpt.core.engine as engine
+    import itaoagpt.core.render_text  # noqa: F401
+    import itaoagpt.core.timeline  # noqa: F401
+
+    engine._pkg_version()
+    log._pkg_version()
+    itaoagpt.__version__  # noqa: B018
+
+
+def serve(sock_path: str | None = None, idle_timeout: float = 0.0) -> int:
+    """
+    Serve forwarded `itaoagpt` calls on a Unix socket until interrupted (or
+    idle for idle_timeout seconds). Each request runs in a process forked from
+    this warmed-up one, so it starts with modules imported, patterns compiled
+    and metadata resolved, but never sees state left by an earlier request:
+    output is the same as an in-process run.
+    """
+    if not hasattr(socket, "AF_UNIX") or not hasattr(os, "fork"):
+        print("[ERR] serve needs Unix domain sockets and fork (not available on this platform)", file=sys.stderr)
+        return 1
+    import signal
+    import socketserver
+    import time
+
+    path = Path(sock_path).expanduser().resolve() if sock_path else default_socket()
+    if path.exists() and not path.is_socket():
+        print(f"[ERR] not a socket: {path}", file=sys.stderr)
+        return 1
+    if path.exists():
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            try:
+                probe.connect(str(path))
+            except OSError:
+                path.unlink()  # stale socket of a server that is gone
+            else:
+                print(f"[ERR] a server is already listening on {path}", file=sys.stderr)
+                return 1
+    path.parent.mkdir(parents=True, exist_ok=True)
+    _warm_up()
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self) -> None:
+            request = json.loads(self.rfile.readline() or b"null")
+            if not isinstance(request, dict):
+                return
+            result = _run_request(request)
+            if isinstance(result, dict):
+                self.wfile.write(json.dumps(result).encode("utf-8") + b"\n")
+                return
+            rc, out, err = result
+            head = {"rc": rc, "stdout": len(out), "stderr": len(err)}
+            self.wfile.write(json.dumps(head).encode("utf-8") + b"\n" + out + err)
+
+    class Server(socketserver.ForkingMixIn, socketserver.UnixStreamServer):
+        last_request = time.monotonic()
+
+        def verify_request(self, request: Any, client_address: Any) -> bool:
+            # requests run as this user: refuse peers of any other uid, even if
+            # the socket's permissions were loosened after it was created
+            uid = _peer_uid(request)
+            if uid is None or uid == os.getuid():
+                return True
+            print(f"[WARN] refused connection from uid {uid}", file=sys.stderr, flush=True)
+            return False
+
+        def process_request(self, request: Any, client_address: Any) -> None:
+            self.last_request = time.monotonic()
+            super().process_request(request, client_address)
+
+        def idle(self) -> bool:
+            return (idle_timeout > 0 and not self.active_children
+                    and time.monotonic() - self.last_request >= idle_timeout)
+
+    def _stop(signum: int, frame: Any) -> None:
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, _stop)
+    # bind under a 0o077 umask so the socket is never reachable by other users,
+    # not even between bind() and chmod()
+    umask = os.umask(0o077)
+    try:
+        server = Server(str(path), Handler)
+    finally:
+        os.umask(umask)
+    os.chmod(path, 0o600)
+    server.timeout = _POLL_SECONDS  # handle_request() then reaps finished requests
+    print(f"[OK] itaoagpt serving on {path} (set {SOCKET_ENV}={path} to use it)", file=sys.stderr, flush=True)
+    try:
+        while not server.idle():
+            server.handle_request()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        try:
+            path.unlink()
+        except OSError:
+            pass
+    return 0
@@ -1,5 +1,5 @@
 from __future__ import annotations
 
-from .log import analyze_log
+from .log import LogAggregate, analyze_log, build_log_result
 
-__all__ = ["analyze_log"]
+__all__ = ["LogAggregate", "analyze_log", "build_log_result"]
@@ -2,14 +2,24 @@ from __future__ import annotations
 
 from collections import Counter
 from datetime import datetime, timezone
+from functools import lru_cache
+import heapq
 import importlib.metadata as _imd
+from itertools import islice
+import os
 from pathlib import Path
 import re
-from typing import Any
+from time import perf_counter_ns
+from typing import Any, Callable, Iterable, Iterator
 
 from itaoagpt.core.fingerprint import normalize_message
+from itaoagpt.core.reader import compression, iter_file_blocks, iter_file_lines, iter_range_lines, strip_bom
+from itaoagpt.core.sketch import HyperLogLog, SpaceSaving, stable_hash64
+from itaoagpt.core.timeline import find_window, format_timestamp, window_lines
+from itaoagpt.core.timing import StageTimer, active_timer, stage
 
 
+@lru_cache(maxsize=None)
 def _pkg_version() -> str:
     try:
         return _imd.version("itaoagpt")
@@ -19,6 +29,18 @@ def _pkg_version() -> str:
 
 _SEV_RANK = {"low": 1, "medium": 2, "high": 3}
 _LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
+_LEVEL_INDEX = {level: i for i, level in enumerate(_LEVELS)}
+_EVIDENCE_MAX = 5  # evidence lines kept per finding; the rest is only counted
+_TOP_FINGERPRINTS = 10  # rows rendered into top_fingerprints
+PARSE_CACHE_SIZE = 16384  # default LRU entries for _classify_text (0 disables)
+
+# Memory budget (LogAggregate.budget): estimated bytes per exact fingerprint
+# on top of its fingerprint and sample text (the fps entry, its _FpStat and
+# levels list, str headers, the fp_seen hash), and the share of the budget a
+# degraded aggregate gives its sketch.
+_FP_STATE_BYTES = 320
+_BUDGET_SKETCH_SHARE = 2
+_BUDGET_HLL_MAX = 14
 
 _RE_MS = re.compile(r"\b\d+ms\b")
 _RE_INT = re.compile(r"\b\d+\b")
@@ -28,6 +50,40 @@ _RE_IP = re.compile(r"\b(?:\d{1,3}\.){3}\d{1,3}\b")
 _RE_WS = re.compile(r"\s+")
 _RE_LOOSE_LEVEL = re.compile(r"\b(ERROR|WARN(?:ING)?|CRITICAL|FATAL)\b", re.IGNORECASE)
 
+# Byte-level pre-filter (aggregate floor): only lines containing one of the
+# floor's tokens (any case) can be an event at or above it, so only they are
+# decoded and parsed. Every other line is counted (lines, events, by_level)
+# on the lowercased raw bytes, which is exact for ASCII text whose only line
+# breaks are \n / \r\n; anything else (non-ASCII, exotic separators, BOM)
+# takes the str path.
+_PREFILTER_BLOCK = 1 << 20
+# A block with more than one candidate token per this many lines is fed line
+# by line: cutting out dense candidates costs more than it saves.
+_DENSE_CANDIDATE_LINES = 4
+_CANDIDATE_TOKENS = {
+    "high": (b"error", b"critical", b"fatal"),
+    "medium": (b"error", b"critical", b"fatal", b"warn"),
+}
+_STR_ONLY_WHITESPACE = b"\x0b\x0c\x1c\x1d\x1e\x1f"  # str.split()/splitlines() separators bytes ignore
+# Layer A on bytes: >= 4 tokens and the third one a (sub-threshold) level
+_RE_GAP_STRICT = re.compile(
+    rb"^[ \t]*[^ \t\r\n]+[ \t]+[^ \t\r\n]+[ \t]+(debug|info|warn|warning)[ \t]+[^ \t\r\n]",
+    re.MULTILINE,
+)
+# Layer B on bytes: without error/critical/fatal only WARN can match loosely
+_RE_GAP_WARN = re.compile(rb"\bwarn(?:ing)?\b")
+_GAP_LEVELS = {b"debug": "DEBUG", b"info": "INFO", b"warn": "WARNING", b"warning": "WARNING"}
+_BOM = b"\xef\xbb\xbf"
+
+
+def _plain_ascii(data: bytes) -> bool:
+    """True when bytes-level line splitting/tokenizing of data equals the str semantics."""
+    return (
+        data.isascii()
+        and len(data.translate(None, _STR_ONLY_WHITESPACE)) == len(data)
+        and data.count(b"\r") == data.count(b"\r\n")
+    )
+
 
 def _now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
@@ -59,6 +115,12 @@ def _max_sev(sevs: list[str]) -> str:
     return best
 
 
+def aggregate_floor(min_severity: str | None) -> str | None:
+    """Severity below which events are only counted, never fingerprinted (None: track all)."""
+    ms = (min_severity or "low").strip().lower()
+    return ms if ms in _CANDIDATE_TOKENS else None
+
+
 def _fingerprint_text(msg: str) -> str:
     s = msg.strip()
     s = _RE_UUID.sub("<uuid>", s)
@@ -109,140 +171,648 @@ def _extract_level_and_message(line: str) -> tuple[str | None, str]:
     return None, line.strip()
 
 
-def analyze_log(
-    path: Path,
-    deterministic: bool = False,
-    *,
-    lines: list[str] | None = None,
-    max_lines: int | None = None,
-    min_severity: str | None = None,
-    debug: bool = False,
-) -> dict[str, Any]:
+def _classify_text(text: str, strict: bool) -> tuple[str, str, str] | None:
     """
-    V0 log analyzer.
+    (level, fingerprint, severity) for one line, or None if it is not an event.
 
-    - Reads a log file (best-effort parsing), or accepts pre-read lines (stdin).
-    - Supports max_lines safety cap.
-    - Supports min_severity filtering for findings.
+    strict=True:  text is the line after its two timestamp tokens (Layer A).
+    strict=False: text is the whole stripped line (Layer B, loose keyword).
+    Both are pure functions of text, which is what makes them cacheable:
+    repeated messages hit the cache no matter how the timestamp changes.
     """
-    ms = (min_severity or "low").strip().lower()
-    ms_rank = _SEV_RANK.get(ms, 1)
+    event = _split_event(text, strict)
+    if event is None:
+        return None
+    level, msg = event
+    return level, normalize_message(msg or text), _sev_from_level(level)
 
-    source: str | None
-    if lines is not None:
-        events = list(lines)
-        source = "<stdin>"
-    else:
-        p = Path(path)
-        if not p.exists():
-            by_level_out = {k: 0 for k in _LEVELS}
-            out: dict[str, Any] = {
-                "tool": "itaoagpt",
-                "version": _pkg_version(),
-                "schema_version": "0.1",
-                "created_at": "1970-01-01T00:00:00+00:00" if deterministic else _now_iso(),
-                "input_summary": {"lines": 0, "events": 0, "source": None},
-                "by_level": by_level_out,
-                "stats": {
-                    "total": 0,
-                    "by_level": by_level_out,
-                    "counts": {
-                        "unique_fingerprints": 0,
-                    },
-                },
-                "top_fingerprints": [],
-                "findings": [
-                    {
-                        "kind": "input_error",
-                        "severity": "high",
-                        "title": f"log file not found: {str(p)}",
-                        "evidence": [],
-                        "hint": "Verilen path dogru mu? Dosya gercekten var mi?",
-                    }
-                ],
-            }
-            if debug and not deterministic:
-                out["debug_meta"] = {"lines_read": 0, "min_severity": None}
-            return out
-        events = p.read_text(encoding="utf-8", errors="replace").splitlines()
-        source = str(p)
-    if events:
-        events[0] = events[0].lstrip("\ufeff")  # D: strip BOM from first line
-    if max_lines is not None and max_lines > 0:
-        events = events[: max_lines]
-
-    total = len(events)
-
-    high_hits: list[str] = []
-    med_hits: list[str] = []
-    low_hits: list[str] = []
-    by_level: Counter[str] = Counter()
-    fp_counter: Counter[str] = Counter()
-    fp_sev: dict[str, str] = {}
-    fp_sample: dict[str, str] = {}
-    fp_levels: dict[str, Counter[str]] = {}
-
-    parsed_events = 0
-    loose_events = 0
-    for line in events:
-        # Layer A — strict: timestamp + level + message
-        level, msg = _extract_level_and_message(line)
-        parsed_loose = False
-        # Layer B — fallback: keyword anywhere in line, no timestamp required
-        if level is None:
-            level, msg = _loose_extract(line)
-            if level is not None:
-                parsed_loose = True
+
+def _split_event(text: str, strict: bool) -> tuple[str, str] | None:
+    """(level, message) part of _classify_text."""
+    if strict:
+        parts = text.split()
+        if len(parts) < 2:
+            return None
+        level = _normalize_level(parts[0])
         if level is None:
-            continue
-        parsed_events += 1
-        if parsed_loose:
-            loose_events += 1
-        if level not in _LEVELS:
-            level = "INFO"
-
-        msg = (msg or line).strip()
+            return None
+        return level, " ".join(parts[1:])
+    level, msg = _loose_extract(text)
+    if level is None:
+        return None
+    return level, msg
+
+
+def _floored_classify_text(floor_rank: int) -> Callable[[str, bool], tuple[str, str, str] | None]:
+    """_classify_text that leaves the fingerprint of events below floor_rank empty."""
+
+    def classify(text: str, strict: bool) -> tuple[str, str, str] | None:
+        event = _split_event(text, strict)
+        if event is None:
+            return None
+        level, msg = event
+        sev = _sev_from_level(level)
+        if _SEV_RANK[sev] < floor_rank:
+            return level, "", sev
+        return level, normalize_message(msg or text), sev
+
+    return classify
+
+
+def _timed_classify_text(
+    timer: StageTimer, floor_rank: int = 0
+) -> Callable[[str, bool], tuple[str, str, str] | None]:
+    """_classify_text (floored like _floored_classify_text) that books its time as "parse" and "normalize"."""
+
+    ns = timer.ns
+
+    def classify(text: str, strict: bool) -> tuple[str, str, str] | None:
+        t0 = perf_counter_ns()
+        event = _split_event(text, strict)
+        t1 = perf_counter_ns()
+        ns["parse"] += t1 - t0
+        if event is None:
+            return None
+        level, msg = event
         sev = _sev_from_level(level)
+        if _SEV_RANK[sev] < floor_rank:
+            return level, "", sev
+        fp = normalize_message(msg or text)
+        ns["normalize"] += perf_counter_ns() - t1
+        return level, fp, sev
+
+    return classify
+
+
+_Classifier = Callable[[str, bool], tuple[str, str, str] | None]
+
+
+def make_classifier(cache_size: int | None = None, floor: str | None = None) -> _Classifier:
+    """
+    Per-run bounded LRU around _classify_text (own hit/miss counters).
+
+    With the floor of the aggregate it feeds (see aggregate_floor), events
+    below it are not normalized: their fingerprint is "", which
+    LogAggregate.feed never looks at. Under an active StageTimer the cache
+    misses are timed (parse, normalize); hits stay untimed, so the cached hot
+    path costs the same either way.
+    """
+    size = PARSE_CACHE_SIZE if cache_size is None else max(0, int(cache_size))
+    floor_rank = _SEV_RANK[floor] if floor else 0
+    timer = active_timer()
+    if timer is not None:
+        fn = _timed_classify_text(timer, floor_rank)
+    else:
+        fn = _floored_classify_text(floor_rank) if floor_rank else _classify_text
+    return lru_cache(maxsize=size)(fn)
+
+
+def parse_cache_stats(classify: _Classifier) -> dict[str, int]:
+    """debug_meta.parse_cache counters of a classifier from make_classifier()."""
+    info = classify.cache_info()  # type: ignore[attr-defined]
+    return {
+        "size": int(info.maxsize or 0),
+        "entries": int(info.currsize),
+        "hits": int(info.hits),
+        "misses": int(info.misses),
+    }
+
+
+class _FpStat:
+    """
+    Per-fingerprint state: first-seen sample line and event counts per level.
+
+    levels is indexed like _LEVELS. The occurrence count (exact mode) and the
+    severity are derived from it instead of being stored, so an event costs
+    one fps lookup and one list increment.
+    """
+
+    __slots__ = ("sample", "levels")
+
+    def __init__(self, sample: str, level_index: int) -> None:
+        self.sample = sample
+        self.levels = [0, 0, 0, 0, 0]
+        self.levels[level_index] = 1
+
+    @property
+    def count(self) -> int:
+        return sum(self.levels)
+
+    @property
+    def severity(self) -> str:
+        levels = self.levels
+        if levels[3] or levels[4]:
+            return "high"
+        return "medium" if levels[2] else "low"
+
+    def level_counts(self) -> dict[str, int]:
+        """Non-zero level counts, in _LEVELS order."""
+        return {level: n for level, n in zip(_LEVELS, self.levels) if n}
+
+    def merge(self, other: _FpStat) -> None:
+        """Add the counts of a later stretch of input; the sample stays the first one."""
+        self.levels = [a + b for a, b in zip(self.levels, other.levels)]
+
+    def copy(self) -> _FpStat:
+        out = _FpStat.__new__(_FpStat)
+        out.sample = self.sample
+        out.levels = list(self.levels)
+        return out
+
+
+class LogAggregate:
+    """
+    Mergeable aggregation state of the log analyzer.
+
+    Holds only counters, first-seen samples and the first _EVIDENCE_MAX
+    evidence lines, so its size depends on distinct fingerprints, never on
+    input size. Partials built over consecutive slices of the input (files,
+    byte ranges) and merged in input order equal one serial pass.
 
-        by_level[level] += 1
-
-        fp = normalize_message(msg)
-        fp_counter[fp] += 1
-        prev = fp_sev.get(fp)
-        fp_sev[fp] = sev if prev is None else _max_sev([prev, sev])
-        if fp not in fp_sample:
-            fp_sample[fp] = line
-        if fp not in fp_levels:
-            fp_levels[fp] = Counter()
-        fp_levels[fp][level] += 1
-
-        if sev == "high":
-            high_hits.append(line)
-        elif sev == "medium":
-            med_hits.append(line)
-        else:
-            low_hits.append(line)
+    With a floor (see aggregate_floor) events below it still count towards
+    lines/events/by_level, but skip fingerprints and evidence (a classifier
+    made with the same floor does not even normalize them); feed_file can
+    then pre-filter on raw bytes instead of decoding every line.
+
+    Each tracked fingerprint has one _FpStat in fps (sample, level counts);
+    without a sketch its count is the sum of its level counts.
+
+    With topk > 0 fingerprints are counted by a Space-Saving sketch of that
+    capacity instead: fps holds at most topk entries, counts become upper
+    bounds with a per-fingerprint error, and severity/sample/levels describe
+    the occurrences since the fingerprint was last (re)tracked. The exact
+    unique count still keeps one 64-bit hash per distinct fingerprint in
+    fp_seen (about 80 bytes each), so memory stays linear in distinct
+    fingerprints unless hll is set too.
+
+    With hll > 0 the unique fingerprint count is a HyperLogLog estimate of
+    that precision instead (constant memory, no fp_seen; only together with
+    topk does nothing grow with distinct fingerprints).
+
+    With a budget (bytes) the size of the per-fingerprint state is estimated
+    as it grows (state_bytes); once it exceeds the budget the aggregate
+    degrades: exact fingerprint counts become a Space-Saving sketch sized to
+    the budget (evicted fingerprints lose their sample and levels) and the
+    unique count a HyperLogLog, exactly as if topk / hll had been set from
+    the start for the rest of the input. With topk but no hll every newly
+    tracked fingerprint still counts towards state_bytes, so the linear
+    fp_seen is what the budget then bounds. Evidence is always bounded
+    (_EVIDENCE_MAX), so nothing else grows with the input.
+
+    With since/until (epoch microseconds, see timeline.parse_timestamp) only
+    the lines of the time window [since, until) are consumed; files are
+    assumed to be in time order, so feed_file bisects an uncompressed file
+    to the window's byte range instead of reading it (timeline.find_window).
+    """
+
+    __slots__ = (
+        "floor",
+        "sketch",
+        "fp_seen",
+        "hll",
+        "topk_capacity",
+        "hll_precision",
+        "since",
+        "until",
+        "budget",
+        "state_bytes",
+        "degraded",
+        "lines",
+        "events",
+        "loose_events",
+        "by_level",
+        "fps",
+        "high_count",
+        "high_hits",
+        "med_count",
+        "med_hits",
+    )
+
+    def __init__(
+        self,
+        floor: str | None = None,
+        topk: int = 0,
+        hll: int = 0,
+        since: int | None = None,
+        until: int | None = None,
+        budget: int = 0,
+    ) -> None:
+        self.floor = floor
+        self.sketch = SpaceSaving(topk) if topk else None
+        self.hll = HyperLogLog(hll) if hll else None
+        # as configured: a degraded aggregate has a sketch / hll it was not set up with
+        self.topk_capacity = topk
+        self.hll_precision = hll
+        self.since = since
+        self.until = until
+        self.budget = budget
+        self.state_bytes = 0
+        self.degraded = False
+        # hashes for an exact unique count once fps no longer holds every fingerprint
+        self.fp_seen: set[int] | None = set() if topk and not hll else None
+        self.lines = 0
+        self.events = 0
+        self.loose_events = 0
+        self.by_level: Counter[str] = Counter()
+        self.fps: dict[str, _FpStat] = {}
+        self.high_count = 0
+        self.high_hits: list[str] = []
+        self.med_count = 0
+        self.med_hits: list[str] = []
+
+    def feed(self, lines: Iterable[str], classify: _Classifier) -> None:
+        """Consume lines (any iterable, read once) into this aggregate."""
+        by_level = self.by_level
+        fps = self.fps
+        level_index = _LEVEL_INDEX
+        high_hits = self.high_hits
+        med_hits = self.med_hits
+        sketch = self.sketch
+        monitored = sketch.counts if sketch is not None else None
+        seen = self.fp_seen
+        hll = self.hll
+        total = self.lines
+        parsed_events = self.events
+        loose_events = self.loose_events
+        high_count = self.high_count
+        med_count = self.med_count
+        floor_rank = _SEV_RANK[self.floor] if self.floor else 0
+        # bytes of new fingerprint state left before degrading (None: no budget to track)
+        state = self.state_bytes
+        limit = self.budget if self._can_degrade() else None
+        try:
+            for line in lines:
+                total += 1
+                s = line.strip()
+                # Layer A — strict: timestamp + level + message (keyed on post-timestamp text)
+                head = s.split(None, 2)
+                hit = classify(head[2], True) if len(head) == 3 else None
+                if hit is None:
+                    # Layer B — fallback: keyword anywhere in line, no timestamp required
+                    hit = classify(s, False)
+                    if hit is None:
+                        continue
+                    loose_events += 1
+                parsed_events += 1
+                level, fp, sev = hit
+
+                by_level[level] += 1
+                if floor_rank and _SEV_RANK[sev] < floor_rank:
+                    continue
+
+                if sketch is not None:
+                    if fp in monitored:  # type: ignore[operator]
+                        monitored[fp] += 1  # type: ignore[index]
+                    else:
+                        gone = sketch.insert(fp)
+                        if gone is not None:
+                            del fps[gone]
+                rec = fps.get(fp)
+                if rec is not None:
+                    rec.levels[level_index[level]] += 1
+                else:
+                    # first sighting (or re-tracking after eviction: adding a hash is idempotent)
+                    fps[fp] = _FpStat(line, level_index[level])
+                    if seen is not None:
+                        seen.add(stable_hash64(fp))
+                    elif hll is not None:
+                        hll.add(stable_hash64(fp))
+                    if limit is not None:
+                        state += _FP_STATE_BYTES + len(fp) + len(line)
+                        if state > limit:
+                            self.state_bytes = state
+                            self._degrade()
+                            limit = None
+                            sketch = self.sketch
+                            monitored = sketch.counts  # type: ignore[union-attr]
+                            seen = self.fp_seen
+                            hll = self.hll
+
+                if sev == "high":
+                    high_count += 1
+                    if high_count <= _EVIDENCE_MAX:
+                        high_hits.append(line)
+                elif sev == "medium":
+                    med_count += 1
+                    if med_count <= _EVIDENCE_MAX:
+                        med_hits.append(line)
+        finally:
+            self.state_bytes = state
+            self.lines = total
+            self.events = parsed_events
+            self.loose_events = loose_events
+            self.high_count = high_count
+            self.med_count = med_count
+
+    def _can_degrade(self) -> bool:
+        return bool(self.budget) and not self.degraded and (self.sketch is None or self.hll is None)
+
+    def _degrade(self) -> None:
+        """Switch the unbounded fingerprint structures to sketches sized by the budget."""
+        if self.hll is None:
+            hll = HyperLogLog(min(_BUDGET_HLL_MAX, max(4, (self.budget // 16).bit_length() - 1)))
+            hashes = self.fp_seen if self.fp_seen is not None else map(stable_hash64, self.fps)
+            for h in hashes:
+                hll.add(h)
+            self.hll = hll
+            self.fp_seen = None
+        if self.sketch is None:
+            capacity = max(16, self.budget // _BUDGET_SKETCH_SHARE // _FP_STATE_BYTES)
+            self.sketch, dropped = SpaceSaving.from_counts(capacity, self.fp_counts())
+            for fp in dropped:
+                del self.fps[fp]
+        self.degraded = True
+
+    def _feed_gap(self, gap: bytes) -> None:
+        """Count a run of complete, lowercased, plain-ASCII non-candidate lines."""
+        self.lines += gap.count(b"\n") + (0 if gap.endswith(b"\n") else 1)
+        by_level = self.by_level
+        strict = _RE_GAP_STRICT.findall(gap)
+        for token in strict:
+            by_level[_GAP_LEVELS[token]] += 1
+        loose = 0
+        pos = gap.find(b"warn")
+        while pos >= 0:
+            if _RE_GAP_WARN.match(gap, pos) is None:
+                pos = gap.find(b"warn", pos + 1)
+                continue
+            if _RE_GAP_STRICT.match(gap, gap.rfind(b"\n", 0, pos) + 1) is None:
+                loose += 1
+            end = gap.find(b"\n", pos)
+            pos = -1 if end < 0 else gap.find(b"warn", end)
+        if loose:
+            by_level["WARNING"] += loose
+            self.loose_events += loose
+        self.events += len(strict) + loose
+
+    def _feed_block(self, buf: bytes, classify: _Classifier) -> None:
+        """Pre-filtered feed of a block of complete lines: decode candidates, count the rest."""
+        tokens = _CANDIDATE_TOKENS[self.floor]  # type: ignore[index]
+        low = buf.lower()  # ASCII-only case fold, offsets unchanged
+        if sum(low.count(t) for t in tokens) * _DENSE_CANDIDATE_LINES > low.count(b"\n") + 1:
+            self.feed(buf.decode("utf-8", errors="replace").splitlines(), classify)
+            return
+        block_plain = _plain_ascii(buf)
+        pending: list[str] = []  # candidate (and fallback) lines, in input order
+        nxt = [low.find(t) for t in tokens]  # next hit per token, refreshed lazily
+        pos = 0
+        n = len(buf)
+        while pos < n:
+            for i, hit in enumerate(nxt):
+                if 0 <= hit < pos:
+                    nxt[i] = low.find(tokens[i], pos)
+            hits = [hit for hit in nxt if hit >= 0]
+            if not hits:
+                start = end = n
+            else:
+                hit = min(hits)
+                nl = low.rfind(b"\n", pos, hit)
+                start = pos if nl < 0 else nl + 1
+                nl = low.find(b"\n", hit)
+                end = n if nl < 0 else nl + 1
+            if start > pos:
+                if block_plain or _plain_ascii(buf[pos:start]):
+                    self._feed_gap(low[pos:start])
+                else:
+                    pending.extend(buf[pos:start].decode("utf-8", errors="replace").splitlines())
+            if end > start:
+                pending.extend(buf[start:end].decode("utf-8", errors="replace").splitlines())
+            pos = end
+        # gap counters commute with feed(); evidence/sample order only depends on `pending`
+        self.feed(pending, classify)
+
+    def feed_file(
+        self,
+        path: Path,
+        classify: _Classifier,
+        *,
+        start: int = 0,
+        end: int | None = None,
+        max_lines: int | None = None,
+    ) -> None:
+        """
+        Consume the lines of a file, or of its newline-aligned byte range [start, end).
+
+        Same result as feed(iter_range_lines(...)) capped at max_lines. With a
+        floor the file is read in blocks (memory-mapped, or stream-decompressed
+        for gzip/bz2/xz) and pre-filtered: only lines that may reach the floor
+        are decoded and classified. Compressed files only support the whole
+        file (start=0, end=None).
+
+        With a time window the range is first narrowed to the window's byte
+        range (bisection); compressed files are streamed and filtered instead.
+        """
+        p = Path(path)
+        cap = max_lines if max_lines is not None and max_lines > 0 else None
+        if self.since is not None or self.until is not None:
+            if compression(p) is not None:
+                lines = window_lines(iter_file_lines(p), self.since, self.until)
+                self.feed(lines if cap is None else islice(lines, cap), classify)
+                return
+            lo, hi = find_window(p, self.since, self.until)
+            start = max(start, lo)
+            end = hi if end is None else min(end, hi)
+            if start >= end:
+                return
+        if self.floor is None:
+            if start == 0 and end is None:
+                lines = iter_file_lines(p)
+            else:
+                lines = iter_range_lines(p, start, os.path.getsize(p) if end is None else end)
+            self.feed(lines if cap is None else islice(lines, cap), classify)
+            return
+
+        stop_at = None if cap is None else self.lines + cap
+        first = start == 0
+        for buf in iter_file_blocks(p, start, end, block_size=_PREFILTER_BLOCK):
+            if stop_at is not None and self.lines >= stop_at:
+                return
+            if first and buf[:3] == _BOM:
+                # the first line alone, decoded with its BOM stripped
+                cut = buf.find(b"\n") + 1 or len(buf)
+                lines: Iterator[str] = strip_bom(buf[:cut].decode("utf-8", errors="replace").splitlines())
+                self.feed(lines if stop_at is None else islice(lines, stop_at - self.lines), classify)
+                buf = buf[cut:]
+            first = False
+            if not buf or (stop_at is not None and self.lines >= stop_at):
+                continue
+            if stop_at is not None and self.lines + len(buf) >= stop_at:
+                # may hit the cap (a line takes >= 1 byte): str path
+                lines = iter(buf.decode("utf-8", errors="replace").splitlines())
+                self.feed(islice(lines, stop_at - self.lines), classify)
+                continue
+            self._feed_block(buf, classify)
+
+    def settings(self) -> dict[str, Any]:
+        """What the aggregate tracks; only aggregates with equal settings merge."""
+        return {
+            "floor": self.floor,
+            "topk": self.topk_capacity,
+            "hll": self.hll_precision,
+            "since": self.since,
+            "until": self.until,
+            "budget": self.budget,
+        }
+
+    def empty(self) -> LogAggregate:
+        """A new, empty aggregate with the same settings."""
+        return LogAggregate(**self.settings())
+
+    def unique_fingerprints(self) -> int:
+        """Distinct fingerprints seen (rounded estimate when hll is set)."""
+        if self.hll is not None:
+            return int(round(self.hll.estimate()))
+        if self.fp_seen is not None:
+            return len(self.fp_seen)
+        return len(self.fps)
+
+    def fp_counts(self) -> dict[str, int]:
+        """Occurrences per tracked fingerprint (upper bounds when sketched)."""
+        if self.sketch is not None:
+            return self.sketch.counts
+        return {fp: rec.count for fp, rec in self.fps.items()}
+
+    def merge(self, other: LogAggregate) -> None:
+        """Fold in an aggregate of the input that directly follows this one."""
+        if other.settings() != self.settings():
+            raise ValueError(f"cannot merge aggregates with settings {self.settings()} and {other.settings()}")
+        if other.degraded and not self.degraded:
+            self._degrade()
+        elif self.degraded and not other.degraded:
+            other = other.copy()
+            other._degrade()
+        self.lines += other.lines
+        self.events += other.events
+        self.loose_events += other.loose_events
+        self.by_level.update(other.by_level)
+        dropped: list[str] = []
+        if self.sketch is not None:
+            dropped = self.sketch.merge(other.sketch)  # type: ignore[arg-type]
+        if self.fp_seen is not None:
+            self.fp_seen |= other.fp_seen  # type: ignore[operator]
+        if self.hll is not None:
+            self.hll.merge(other.hll)  # type: ignore[arg-type]
+        fps = self.fps
+        for fp, rec in other.fps.items():
+            mine = fps.get(fp)
+            if mine is None:
+                fps[fp] = rec.copy()
+            else:
+                mine.merge(rec)
+        for fp in dropped:
+            del fps[fp]
+        self.high_hits.extend(other.high_hits[: _EVIDENCE_MAX - len(self.high_hits)])
+        self.high_count += other.high_count
+        self.med_hits.extend(other.med_hits[: _EVIDENCE_MAX - len(self.med_hits)])
+        self.med_count += other.med_count
+        # shared fingerprints are counted twice: an upper bound
+        self.state_bytes += other.state_bytes
+        if self._can_degrade() and self.state_bytes > self.budget:
+            self._degrade()
+
+    def copy(self) -> LogAggregate:
+        out = self.empty()
+        out.merge(self)
+        return out
+
+    def to_dict(self) -> dict[str, Any]:
+        """JSON-safe snapshot; from_dict(to_dict()) restores an equal aggregate."""
+        return {
+            "floor": self.floor,
+            "topk": self.sketch.to_dict() if self.sketch is not None else None,
+            "fp_seen": sorted(self.fp_seen) if self.fp_seen is not None else None,
+            "hll": self.hll.to_dict() if self.hll is not None else None,
+            "topk_capacity": self.topk_capacity,
+            "hll_precision": self.hll_precision,
+            "since": self.since,
+            "until": self.until,
+            "budget": self.budget,
+            "state_bytes": self.state_bytes,
+            "degraded": self.degraded,
+            "lines": self.lines,
+            "events": self.events,
+            "loose_events": self.loose_events,
+            "by_level": dict(self.by_level),
+            # one row per fingerprint, in first-seen order: [fp, count, sev, sample, levels]
+            "fingerprints": [
+                [fp, cnt, self.fps[fp].severity, self.fps[fp].sample, self.fps[fp].level_counts()]
+                for fp, cnt in self.fp_counts().items()
+            ],
+            "high_count": self.high_count,
+            "high_hits": list(self.high_hits),
+            "med_count": self.med_count,
+            "med_hits": list(self.med_hits),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> LogAggregate:
+        agg = cls(
+            data.get("floor"),
+            topk=int(data.get("topk_capacity", (data.get("topk") or {}).get("capacity", 0))),
+            hll=int(data.get("hll_precision", (data.get("hll") or {}).get("precision", 0))),
+            since=data.get("since"),
+            until=data.get("until"),
+            budget=int(data.get("budget", 0)),
+        )
+        agg.state_bytes = int(data.get("state_bytes", 0))
+        agg.degraded = bool(data.get("degraded", False))
+        agg.sketch = agg.fp_seen = agg.hll = None
+        if data.get("topk") is not None:
+            agg.sketch = SpaceSaving.from_dict(data["topk"])
+        if data.get("fp_seen") is not None:
+            agg.fp_seen = {int(h) for h in data["fp_seen"]}
+        if data.get("hll") is not None:
+            agg.hll = HyperLogLog.from_dict(data["hll"])
+        agg.lines = int(data["lines"])
+        agg.events = int(data["events"])
+        agg.loose_events = int(data["loose_events"])
+        agg.by_level = Counter({str(k): int(v) for k, v in data["by_level"].items()})
+        # count and sev follow from the level counts (or the sketch)
+        for fp, _cnt, _sev, sample, levels in data["fingerprints"]:
+            rec = _FpStat.__new__(_FpStat)
+            rec.sample = sample
+            rec.levels = [int(levels.get(level, 0)) for level in _LEVELS]
+            agg.fps[fp] = rec
+        agg.high_count = int(data["high_count"])
+        agg.high_hits = [str(x) for x in data["high_hits"]]
+        agg.med_count = int(data["med_count"])
+        agg.med_hits = [str(x) for x in data["med_hits"]]
+        return agg
+
+
+def build_log_result(
+    agg: LogAggregate,
+    *,
+    source: str | None,
+    deterministic: bool = False,
+    min_severity: str | None = None,
+    debug: bool = False,
+    parse_cache: dict[str, int] | None = None,
+) -> dict[str, Any]:
+    """Render an aggregate into the analyze_log result dict (findings, top fingerprints, stats)."""
+    ms = (min_severity or "low").strip().lower()
+    ms_rank = _SEV_RANK.get(ms, 1)
 
     findings: list[dict[str, Any]] = []
 
-    if _SEV_RANK["high"] >= ms_rank and high_hits:
+    if _SEV_RANK["high"] >= ms_rank and agg.high_count:
         findings.append(
             {
                 "kind": "high_severity_present",
                 "severity": "high",
-                "title": f"ERROR/CRITICAL tespit edildi: {len(high_hits)} adet",
-                "evidence": high_hits[:5],
+                "title": f"ERROR/CRITICAL tespit edildi: {agg.high_count} adet",
+                "evidence": list(agg.high_hits),
                 "hint": "Ilk gorunen high-severity hatadan baslayip ayni request/trace akisina bak.",
             }
         )
 
-    if _SEV_RANK["medium"] >= ms_rank and med_hits:
+    if _SEV_RANK["medium"] >= ms_rank and agg.med_count:
         findings.append(
             {
                 "kind": "medium_severity_present",
                 "severity": "medium",
-                "title": f"WARN tespit edildi: {len(med_hits)} adet",
-                "evidence": med_hits[:5],
+                "title": f"WARN tespit edildi: {agg.med_count} adet",
+                "evidence": list(agg.med_hits),
                 "hint": "WARN kayitlari genelde gelecekteki ERROR'larin habercisi olur.",
             }
         )
@@ -260,21 +830,30 @@ def analyze_log(
 
     _ = _max_sev([str(f.get("severity", "low")) for f in findings])
 
-    # sort: count desc, severity desc, fingerprint asc — fully deterministic
-    sorted_fps = sorted(
+    fp_counter = agg.fp_counts()
+    fps = agg.fps
+    fp_errors = agg.sketch.errors if agg.sketch is not None else None
+
+    # order: count desc, severity desc, fingerprint asc — fully deterministic;
+    # heap selection of the top rows instead of sorting every fingerprint
+    top_fps = heapq.nsmallest(
+        _TOP_FINGERPRINTS,
         fp_counter.items(),
-        key=lambda item: (-item[1], -_SEV_RANK.get(fp_sev.get(item[0], "low"), 1), item[0]),
+        key=lambda item: (-item[1], -_SEV_RANK[fps[item[0]].severity], item[0]),
     )
     top_fingerprints = []
-    for fp, cnt in sorted_fps[:10]:
-        sev = fp_sev.get(fp, "low")
-        top_fingerprints.append({
+    for fp, cnt in top_fps:
+        rec = fps[fp]
+        row: dict[str, Any] = {
             "fingerprint": fp,
             "count": int(cnt),
-            "severity": sev,
-            "sample": fp_sample.get(fp, ""),
-            "levels": {k: int(v) for k, v in (fp_levels.get(fp) or Counter()).items()},
-        })
+            "severity": rec.severity,
+            "sample": rec.sample,
+            "levels": rec.level_counts(),
+        }
+        if fp_errors is not None:
+            row["count_error"] = int(fp_errors[fp])  # true count is in [count - count_error, count]
+        top_fingerprints.append(row)
 
     if min_severity:
         ms = (min_severity or "low").strip().lower()
@@ -284,21 +863,66 @@ def analyze_log(
             if _SEV_RANK.get(fp["severity"], 1) >= ms_rank
         ]
 
-    by_level_out = {k: int(by_level.get(k, 0)) for k in _LEVELS}
+    total = agg.lines
+    by_level_out = {k: int(agg.by_level.get(k, 0)) for k in _LEVELS}
     stats = {
         "total": int(total),
         "by_level": by_level_out,
         "counts": {
-            "unique_fingerprints": int(len(fp_counter)),
+            "unique_fingerprints": agg.unique_fingerprints(),
         },
     }
+    approximate: dict[str, Any] = {}
+    if agg.hll is not None:
+        estimate = agg.hll.estimate()
+        approximate["unique_fingerprints"] = {
+            "method": "hyperloglog",
+            "precision": agg.hll.precision,
+            "estimate": round(estimate, 1),
+            "relative_std_error": round(agg.hll.relative_error, 4),
+            "std_error": round(estimate * agg.hll.relative_error, 1),
+        }
+    if agg.sketch is not None:
+        approximate["top_fingerprints"] = {
+            "method": "space_saving",
+            "capacity": agg.sketch.capacity,
+            # any fingerprint missing from the sketch occurred at most this often
+            "untracked_max": agg.sketch.bound,
+        }
+    if agg.degraded:
+        # exact fields that the memory budget turned into the estimates above
+        approximate["memory_budget"] = {
+            "max_bytes": agg.budget,
+            "fields": (["counts.unique_fingerprints"] if not agg.hll_precision else [])
+            + (["top_fingerprints"] if not agg.topk_capacity else []),
+        }
+    if approximate:
+        stats["approximate"] = approximate
+    if agg.floor:
+        # fingerprint-derived fields only saw events at/above the floor
+        stats["scope"] = {
+            "min_severity": agg.floor,
+            "fields": ["counts.unique_fingerprints", "top_fingerprints"],
+        }
+
+    input_summary: dict[str, Any] = {
+        "lines": total,
+        "events": agg.events,
+        "loose_events": agg.loose_events,
+        "source": source,
+    }
+    if agg.since is not None or agg.until is not None:
+        input_summary["time_window"] = {
+            "since": format_timestamp(agg.since) if agg.since is not None else None,
+            "until": format_timestamp(agg.until) if agg.until is not None else None,
+        }
 
     result: dict[str, Any] = {
         "tool": "itaoagpt",
         "version": _pkg_version(),
         "schema_version": "0.1",
         "created_at": "1970-01-01T00:00:00+00:00" if deterministic else _now_iso(),
-        "input_summary": {"lines": total, "events": parsed_events, "loose_events": loose_events, "source": source},
+        "input_summary": input_summary,
         "by_level": by_level_out,
         "stats": stats,
         "top_fingerprints": top_fingerprints,
@@ -306,5 +930,115 @@ def analyze_log(
     }
     if debug and not deterministic:
         result["debug_meta"] = {"lines_read": total, "min_severity": ms}
+        if agg.budget:
+            result["debug_meta"]["memory"] = {
+                "state_bytes": agg.state_bytes,
+                "budget": agg.budget,
+                "degraded": agg.degraded,
+            }
+        if parse_cache is not None:
+            result["debug_meta"]["parse_cache"] = parse_cache
     return result
 
+
+def analyze_log(
+    path: Path,
+    deterministic: bool = False,
+    *,
+    lines: Iterable[str] | None = None,
+    max_lines: int | None = None,
+    min_severity: str | None = None,
+    debug: bool = False,
+    parse_cache_size: int | None = None,
+    topk: int = 0,
+    hll: int = 0,
+    since: int | None = None,
+    until: int | None = None,
+    max_memory: int = 0,
+) -> dict[str, Any]:
+    """
+    V0 log analyzer.
+
+    - Streams a log file (best-effort parsing), or consumes any iterable of
+      lines (stdin, directory scan) without copying it.
+    - Supports max_lines safety cap (applied while reading).
+    - Supports min_severity filtering for findings; with "medium" or "high"
+      the file is pre-filtered on raw bytes, events below it are not
+      fingerprinted and fingerprint stats cover only events at/above it
+      (stats.scope), while lines/events/by_level stay exact.
+    - Caches (level, fingerprint, severity) per message text in a bounded LRU
+      (parse_cache_size entries, default PARSE_CACHE_SIZE, 0 disables).
+    - topk > 0: approximate fingerprint counts from a Space-Saving sketch of
+      that capacity (see LogAggregate), reported with count_error bounds.
+    - hll > 0: unique_fingerprints is a HyperLogLog estimate of that precision,
+      described (std_error) in stats.approximate.
+    - since/until (epoch microseconds): only the time window [since, until)
+      of a time-ordered log is analyzed; a file is bisected to its byte
+      range, so lines outside it are never read (input_summary.time_window).
+    - max_memory > 0: budget in bytes for the fingerprint state; past it the
+      counts degrade to sketches (see LogAggregate) and stats.approximate
+      lists the fields that became estimates.
+    - Under an active StageTimer (core.timing) the scan and report stages
+      are timed.
+
+    Memory is bounded by the number of distinct fingerprints, not input size.
+    """
+    source: str | None
+    agg = LogAggregate(
+        aggregate_floor(min_severity), topk=topk, hll=hll, since=since, until=until, budget=max_memory
+    )
+    classify = make_classifier(parse_cache_size, agg.floor)
+    if lines is not None:
+        events: Iterator[str] = strip_bom(lines)  # D: strip BOM from first line
+        if since is not None or until is not None:
+            events = window_lines(events, since, until)
+        if max_lines is not None and max_lines > 0:
+            events = islice(events, max_lines)
+        with stage("scan"):
+            agg.feed(events, classify)
+        source = "<stdin>"
+    else:
+        p = Path(path)
+        if not p.exists():
+            by_level_out = {k: 0 for k in _LEVELS}
+            out: dict[str, Any] = {
+                "tool": "itaoagpt",
+                "version": _pkg_version(),
+                "schema_version": "0.1",
+                "created_at": "1970-01-01T00:00:00+00:00" if deterministic else _now_iso(),
+                "input_summary": {"lines": 0, "events": 0, "source": None},
+                "by_level": by_level_out,
+                "stats": {
+                    "total": 0,
+                    "by_level": by_level_out,
+                    "counts": {
+                        "unique_fingerprints": 0,
+                    },
+                },
+                "top_fingerprints": [],
+                "findings": [
+                    {
+                        "kind": "input_error",
+                        "severity": "high",
+                        "title": f"log file not found: {str(p)}",
+                        "evidence": [],
+                        "hint": "Verilen path dogru mu? Dosya gercekten var mi?",
+                    }
+                ],
+            }
+            if debug and not deterministic:
+                out["debug_meta"] = {"lines_read": 0, "min_severity": None}
+            return out
+        with stage("scan"):
+            agg.feed_file(p, classify, max_lines=max_lines)
+        source = str(p)
+
+    with stage("report"):
+        return build_log_result(
+            agg,
+            source=source,
+            deterministic=deterministic,
+            min_severity=min_severity,
+            debug=debug,
+            parse_cache=parse_cache_stats(classify),
+        )
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import os
+from pathlib import Path
+import time
+from typing import Any, Callable
+
+import itaoagpt
+from itaoagpt.core.analyzers.log import LogAggregate
+from itaoagpt.core.paths import cache_root
+from itaoagpt.core.reader import compression
+
+CHECKPOINT_FORMAT = 1
+_HEAD_BYTES = 4096   # file prefix hashed to detect rotation / copytruncate
+_ANCHOR_BYTES = 256  # bytes right before the saved offset, hashed to detect rewrites
+_STALE_SECONDS = 7 * 24 * 3600
+
+
+def default_checkpoint_dir() -> Path:
+    return cache_root() / "checkpoints"
+
+
+def _digest(mm: mmap.mmap, start: int, end: int) -> str:
+    return hashlib.sha256(mm[start:end]).hexdigest()
+
+
+class CheckpointStore:
+    """
+    One JSON file per (st_dev, st_ino): byte offset of the last complete line
+    plus the serialized LogAggregate of everything before it.
+
+    Keying on the inode (not the path) means a renamed (rotated) file keeps
+    its checkpoint and a fresh file at the same path starts from 0. File names
+    also carry a hash of the path, which makes a rename replace the old entry;
+    entries not refreshed for _STALE_SECONDS are pruned on save.
+    """
+
+    def __init__(self, root: Path | None = None) -> None:
+        self.root = Path(root) if root is not None else default_checkpoint_dir()
+
+    @staticmethod
+    def _path_tag(path: str) -> str:
+        return hashlib.sha1(path.encode("utf-8")).hexdigest()[:16]  # not security-relevant
+
+    def load(self, st: os.stat_result) -> dict[str, Any] | None:
+        for f in sorted(self.root.glob(f"{st.st_dev}-{st.st_ino}-*.json")):
+            try:
+                data = json.loads(f.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                continue
+            if data.get("format") != CHECKPOINT_FORMAT or data.get("version") != itaoagpt.__version__:
+                return None  # aggregation semantics may differ between versions
+            return data
+        return None
+
+    def save(self, st: os.stat_result, record: dict[str, Any]) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        key = f"{st.st_dev}-{st.st_ino}"
+        tag = self._path_tag(record["path"])
+        target = self.root / f"{key}-{tag}.json"
+        tmp = target.with_suffix(".tmp")
+        record = {"format": CHECKPOINT_FORMAT, "version": itaoagpt.__version__, **record}
+        tmp.write_text(json.dumps(record, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, target)
+        cutoff = time.time() - _STALE_SECONDS
+        for other in self.root.glob("*.json"):
+            if other == target:
+                continue
+            try:
+                if other.name.startswith(key + "-") or other.stat().st_mtime < cutoff:
+                    other.unlink()
+            except OSError:
+                pass
+
+
+def aggregate_incremental(
+    path: Path,
+    *,
+    store: CheckpointStore,
+    max_lines: int | None,
+    classify: Callable[[str, bool], Any],
+    proto: LogAggregate | None = None,
+) -> tuple[LogAggregate, dict[str, int]]:
+    """
+    Aggregate a file, resuming from its checkpoint when it is still valid.
+
+    Only bytes past the checkpoint offset are read. The state is saved up to
+    the last b"\\n"; a trailing incomplete line is aggregated into a copy used
+    for this run's output only, so the result always equals a full rescan.
+    The checkpoint is discarded (full rescan) when the file shrank, its head
+    or the bytes before the offset changed, or max_lines / the settings of
+    proto (an empty aggregate: floor, sketch) differ. Compressed files are
+    all-or-nothing: an unchanged archive is served from its checkpoint, a
+    changed one is rescanned in full.
+    """
+    p = Path(path)
+    st = p.stat()
+    size = st.st_size
+    cap = max_lines if max_lines is not None and max_lines > 0 else None
+    info = {"resumed": 0, "bytes_read": 0}
+    proto = proto if proto is not None else LogAggregate()
+
+    if size == 0:
+        return proto.empty(), info
+
+    with p.open("rb") as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        agg = proto.empty()
+        offset = 0
+        saved = store.load(st)
+        if saved is not None:
+            off = int(saved.get("offset", -1))
+            head_len = int(saved.get("head_len", -1))
+            anchor = max(0, off - _ANCHOR_BYTES)
+            if (
+                0 <= off <= size
+                and saved.get("max_lines") == cap
+                and saved.get("settings") == proto.settings()
+                and 0 <= head_len <= size
+                and saved.get("head") == _digest(mm, 0, head_len)
+                and saved.get("anchor") == _digest(mm, anchor, off)
+            ):
+                agg = LogAggregate.from_dict(saved["state"])
+                offset = off
+                info["resumed"] = 1
+
+        if compression(p) is not None:
+            # compressed data cannot be resumed mid-stream: a checkpoint of the
+            # whole (unchanged) archive is reused as is, anything else rescans
+            if offset != size:
+                agg = proto.empty()
+                info["resumed"] = 0
+                offset = 0
+            complete = size
+        else:
+            last_nl = mm.rfind(b"\n", offset, size)
+            complete = last_nl + 1 if last_nl >= 0 else offset
+
+        def feed(target: LogAggregate, start: int, end: int) -> None:
+            if start >= end or (cap is not None and target.lines >= cap):
+                return
+            rest = None if cap is None else cap - target.lines
+            if start == 0 and end == size:
+                target.feed_file(p, classify, max_lines=rest)
+            else:
+                target.feed_file(p, classify, start=start, end=end, max_lines=rest)
+            info["bytes_read"] += end - start
+
+        feed(agg, offset, complete)
+        head_len = min(size, _HEAD_BYTES)
+        store.save(
+            st,
+            {
+                "path": str(p.resolve()),
+                "offset": complete,
+                "max_lines": cap,
+                "settings": proto.settings(),
+                "head_len": head_len,
+                "head": _digest(mm, 0, head_len),
+                "anchor": _digest(mm, max(0, complete - _ANCHOR_BYTES), complete),
+                "state": agg.to_dict(),
+            },
+        )
+
+        if complete < size:
+            agg = agg.copy()
+            feed(agg, complete, size)
+    return agg, info
@@ -1,13 +1,33 @@
 from __future__ import annotations
 
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import lru_cache
 import importlib.metadata as _imd
+from itertools import chain, islice
+import os
 from pathlib import Path
-from typing import Any
+import tracemalloc
+from typing import Any, Iterable, Iterator, Sequence
 
-from itaoagpt.core.analyzers.log import analyze_log
+from itaoagpt.core.analyzers.log import (
+    LogAggregate,
+    aggregate_floor,
+    analyze_log,
+    build_log_result,
+    make_classifier,
+    parse_cache_stats,
+)
+from itaoagpt.core.checkpoint import CheckpointStore, aggregate_incremental
+from itaoagpt.core.reader import compression, split_ranges
+from itaoagpt.core.result_cache import ResultCache
+from itaoagpt.core.timeline import iter_merged_lines, window_lines
+from itaoagpt.core.timing import StageTimer, stage, timed
 from itaoagpt.core.triage import build_triage
+from itaoagpt.core.walk import scan_directory
 
 
+@lru_cache(maxsize=None)
 def _pkg_version() -> str:
     try:
         return _imd.version("itaoagpt")
@@ -15,44 +35,308 @@ def _pkg_version() -> str:
         return "0.4.2"
 
 
-def _scan_directory(
-    path: Path,
-    glob_pattern: str,
+def resolve_jobs(jobs: int | None) -> int:
+    """Worker count for a --jobs value: None means 1, 0 or less means one per CPU."""
+    if jobs is None:
+        return 1
+    if jobs <= 0:
+        return os.cpu_count() or 1
+    return jobs
+
+
+# Files at least twice this size are split into newline-aligned byte ranges
+# when jobs > 1, so a single huge log is spread over the pool too.
+_RANGE_MIN_BYTES = 32 << 20
+
+# (path, start, end): a whole file when start/end are None, else a byte range
+_Segment = tuple[Path, int | None, int | None]
+
+
+def _plan_segments(files: list[Path], jobs: int, range_bytes: int = _RANGE_MIN_BYTES) -> list[_Segment]:
+    """
+    Work units in input order: whole files, or offset-ordered ranges of large
+    files (compressed files are never split: they can only be read as a stream).
+    """
+    segments: list[_Segment] = []
+    for f in files:
+        parts = min(jobs, f.stat().st_size // range_bytes) if jobs > 1 else 1
+        if parts > 1 and compression(f) is not None:
+            parts = 1
+        if parts > 1:
+            segments.extend((f, start, end) for start, end in split_ranges(f, parts))
+        else:
+            segments.append((f, None, None))
+    return segments
+
+
+def _analyze_segment(
+    path: str,
+    start: int | None,
+    end: int | None,
     max_lines: int | None,
-) -> tuple[list[str], int]:
-    """Collect lines from all matching files in a directory (sorted for determinism)."""
-    files = sorted(f for f in path.glob(glob_pattern) if f.is_file())
-    all_lines: list[str] = []
+    parse_cache_size: int | None,
+    proto: LogAggregate | None = None,
+) -> tuple[LogAggregate, dict[str, int]]:
+    """
+    Worker: partial aggregate of one segment (top-level so process pools can pickle it).
+
+    proto is an empty aggregate carrying the settings (floor, sketch) to use.
+    """
+    agg = proto.empty() if proto is not None else LogAggregate()
+    classify = make_classifier(parse_cache_size, agg.floor)
+    if start is None or end is None:
+        agg.feed_file(Path(path), classify, max_lines=max_lines)
+    else:
+        agg.feed_file(Path(path), classify, start=start, end=end, max_lines=max_lines)
+    return agg, parse_cache_stats(classify)
+
+
+def _merge_cache_stats(total: dict[str, int], part: dict[str, int]) -> None:
+    total["size"] = part["size"]  # per worker, not additive
+    for k in ("entries", "hits", "misses"):
+        total[k] = total.get(k, 0) + part[k]
+
+
+# (file, cache key, cached aggregate, segments to read) -- see _iter_units
+_Unit = tuple[Path, str | None, LogAggregate | None, list[_Segment]]
+
+
+def _iter_units(
+    files: Iterable[Path],
+    jobs: int,
+    range_bytes: int,
+    cache: ResultCache | None,
+    proto: LogAggregate,
+) -> Iterator[_Unit]:
     for f in files:
-        file_lines = f.read_text(encoding="utf-8", errors="replace").splitlines()
-        all_lines.extend(file_lines)
-        if max_lines is not None and max_lines > 0 and len(all_lines) >= max_lines:
-            all_lines = all_lines[:max_lines]
+        key = cache.key(f, proto) if cache is not None else None
+        hit = cache.load(key) if cache is not None and key is not None else None
+        yield f, key, hit, [] if hit is not None else _plan_segments([f], jobs, range_bytes)
+
+
+def _aggregate_files(
+    files: Iterable[Path],
+    *,
+    jobs: int,
+    max_lines: int | None,
+    parse_cache_size: int | None,
+    proto: LogAggregate | None = None,
+    range_bytes: int = _RANGE_MIN_BYTES,
+    cache: ResultCache | None = None,
+) -> tuple[LogAggregate, dict[str, int]]:
+    """
+    Aggregate files in order, serially or over a process pool.
+
+    Files are consumed lazily, so a directory walk overlaps with the
+    analysis. Workers return one partial per segment (file or byte range);
+    at most 2 * jobs segments are in flight ahead of the one being merged,
+    and partials are merged in file/offset order, so the result equals the
+    serial scan. With a max_lines cap every worker reads at most max_lines;
+    the segment that crosses the cap is re-read with the exact remainder and
+    later ones are dropped. Sketched (topk) partials merge within their error
+    bounds rather than byte-identically.
+
+    With a cache, unchanged files are merged from their cached aggregate and
+    every other file is aggregated on its own (then stored, if it was read to
+    the end); a warm run therefore equals a cold one.
+    """
+    cap = max_lines if max_lines is not None and max_lines > 0 else None
+    proto = proto if proto is not None else LogAggregate()
+    total = proto.empty()
+    classify = make_classifier(parse_cache_size, proto.floor)
+    stats: dict[str, int] = {}
+
+    units = _iter_units(files, jobs, range_bytes, cache, proto)
+    # a pool only pays off with at least two segments to read
+    head: list[_Unit] = []
+    if jobs > 1:
+        for unit in units:
+            head.append(unit)
+            if sum(len(u[3]) for u in head) >= 2:
+                break
+    parallel = sum(len(u[3]) for u in head) >= 2
+    units = chain(head, units)
+
+    pool = ProcessPoolExecutor(max_workers=jobs) if parallel else None
+    window = 2 * jobs
+    ahead: deque[tuple[_Unit, list[tuple[int | None, int | None, Future]]]] = deque()
+    in_flight = 0
+    try:
+        while True:
+            while not ahead or (pool is not None and in_flight < window and len(ahead) < window):
+                unit = next(units, None)
+                if unit is None:
+                    break
+                futs = []
+                if pool is not None:
+                    futs = [
+                        (start, end, pool.submit(_analyze_segment, str(f), start, end, cap, parse_cache_size, proto))
+                        for f, start, end in unit[3]
+                    ]
+                    in_flight += len(futs)
+                ahead.append((unit, futs))
+            if not ahead:
+                break
+            (f, key, hit, _), futs = ahead.popleft()
+            in_flight -= len(futs)
+            if cap is not None and total.lines >= cap:
+                break
+            rest = None if cap is None else cap - total.lines
+            if hit is not None and (rest is None or hit.lines <= rest):
+                total.merge(hit)
+                continue
+            # without a cache feed the total directly; with one, build the file's own aggregate
+            target = total if cache is None else proto.empty()
+            if not futs:
+                target.feed_file(f, classify, max_lines=rest)
+            else:
+                base = target.lines
+                for start, end, fut in futs:
+                    seg_part, seg_stats = fut.result()
+                    left = None if rest is None else rest - (target.lines - base)
+                    if left is not None and seg_part.lines > left:
+                        seg_part, seg_stats = _analyze_segment(str(f), start, end, left, parse_cache_size, proto)
+                    target.merge(seg_part)
+                    _merge_cache_stats(stats, seg_stats)
+                    if left is not None and seg_part.lines >= left:
+                        break
+            if cache is not None:
+                if key is not None and (rest is None or target.lines < rest):
+                    cache.save(key, target)  # read to the end: the whole file's aggregate
+                total.merge(target)
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+    if pool is None:
+        return total, parse_cache_stats(classify)
+    serial = parse_cache_stats(classify)
+    if serial["hits"] or serial["misses"]:
+        _merge_cache_stats(stats, serial)
+    return total, stats
+
+
+def _aggregate_incremental(
+    files: Iterable[Path],
+    *,
+    store: CheckpointStore,
+    max_lines: int | None,
+    parse_cache_size: int | None,
+    proto: LogAggregate | None = None,
+) -> tuple[LogAggregate, dict[str, int], dict[str, int]]:
+    """Like _aggregate_files, but each file resumes from its checkpoint (serial)."""
+    cap = max_lines if max_lines is not None and max_lines > 0 else None
+    total = proto.empty() if proto is not None else LogAggregate()
+    classify = make_classifier(parse_cache_size, total.floor)
+    info = {"files": 0, "resumed": 0, "bytes_read": 0}
+    for f in files:
+        part, part_info = aggregate_incremental(
+            f, store=store, max_lines=cap, classify=classify, proto=proto
+        )
+        info["files"] += 1
+        info["resumed"] += part_info["resumed"]
+        info["bytes_read"] += part_info["bytes_read"]
+        if cap is not None and total.lines + part.lines > cap:
+            part, _ = _analyze_segment(str(f), None, None, cap - total.lines, parse_cache_size, proto)
+        total.merge(part)
+        if cap is not None and total.lines >= cap:
             break
-    return all_lines, len(files)
+    return total, parse_cache_stats(classify), info
+
+
+def _aggregate_merged(
+    files: list[Path],
+    *,
+    max_lines: int | None,
+    parse_cache_size: int | None,
+    proto: LogAggregate | None = None,
+) -> tuple[LogAggregate, dict[str, int]]:
+    """Aggregate the lines of all files in timestamp order (one open file per input)."""
+    cap = max_lines if max_lines is not None and max_lines > 0 else None
+    agg = proto.empty() if proto is not None else LogAggregate()
+    classify = make_classifier(parse_cache_size, agg.floor)
+    lines = iter_merged_lines(files)
+    events: Iterator[str] = lines
+    if agg.since is not None or agg.until is not None:
+        events = window_lines(lines, agg.since, agg.until)
+    try:
+        agg.feed(events if cap is None else islice(events, cap), classify)
+    finally:
+        lines.close()
+    return agg, parse_cache_stats(classify)
 
 
 def run_analysis(
     path: Path,
     analyzer_type: str = "log",
     *,
-    lines: list[str] | None = None,
-    glob: str | None = None,
+    lines: Iterable[str] | None = None,
+    glob: str | Sequence[str] | None = None,
     max_lines: int | None = None,
     min_severity: str | None = None,
     deterministic: bool = False,
     debug: bool = False,
+    parse_cache_size: int | None = None,
+    jobs: int | None = 1,
+    incremental: bool = False,
+    checkpoint_dir: Path | None = None,
+    topk: int = 0,
+    hll: int = 0,
+    result_cache: bool = False,
+    cache_dir: Path | None = None,
+    cache_verify: bool = False,
+    exclude: Sequence[str] = (),
+    max_depth: int | None = None,
+    order: str = "name",
+    since: int | None = None,
+    until: int | None = None,
+    max_memory: int = 0,
 ) -> dict[str, Any]:
     """
     Contract-safe analysis router.
 
     CLI may pass extra knobs (glob/max_lines/min_severity). For V0:
     - analyzer_type: only "log" supported
-    - glob: accepted for compatibility (directory scanning can be added later)
-    - max_lines/min_severity: forwarded to analyzer when supported
+    - glob: file pattern(s) when path is a directory; exclude: patterns of
+      files / directories to skip; max_depth: directory levels to descend
+      (None: as deep as the patterns reach, < 0: unlimited). Files stream
+      into the analysis in sorted path order while the tree is walked.
+    - order: "name" reads the files one after the other; "time" interleaves
+      their lines by leading timestamp (k-way merge, see
+      timeline.iter_merged_lines) so first-seen samples and evidence follow
+      the clock. Time order reads serially: jobs, incremental and
+      result_cache do not apply.
+    - max_lines/min_severity/parse_cache_size: forwarded to analyzer when supported
+    - jobs: worker processes (1 = serial, <=0 = CPU count) over the files of a
+      directory and over byte ranges of large files; output is identical for
+      any value
+    - incremental: resume every file from its checkpoint in checkpoint_dir
+      (default: user cache dir) and read only appended bytes; output equals a
+      full rescan. Runs serially (jobs is ignored).
+    - topk: > 0 counts fingerprints with a Space-Saving sketch of that capacity
+      (bounded memory; approximate top_fingerprints with count_error bounds)
+    - hll: > 0 estimates unique_fingerprints with a HyperLogLog of that
+      precision (mergeable across files, workers and checkpoints)
+    - result_cache: directory scans merge unchanged files from per-file
+      aggregates cached in cache_dir (default: user cache dir) instead of
+      parsing them; cache_verify also keys entries on a content hash. Output
+      equals a cold run. Not used with incremental (checkpoints cover it).
+    - since/until: epoch microseconds (timeline.parse_timestamp) bounding the
+      time window [since, until) to analyze. Each file is assumed to be in
+      time order and is bisected to the window's byte range, so the cost
+      depends on the window, not the file size.
+    - max_memory: > 0 caps the estimated fingerprint state (bytes) of every
+      aggregate (per worker, per file); past it counts degrade to a sketch
+      and a HyperLogLog, listed in stats.approximate.memory_budget. With
+      tracemalloc tracing, debug_meta.memory reports the traced peak.
+    - debug (outside deterministic mode) also reports debug_meta.timing:
+      milliseconds per stage (read, parse, normalize, aggregate, report,
+      triage; see core.timing.StageTimer) and scan lines/bytes per second.
     """
     atype = (analyzer_type or "log").strip().lower()
 
+    if order not in ("name", "time"):
+        raise ValueError(f"order must be 'name' or 'time', got {order!r}")
+
     if atype != "log":
         # V0: keep it explicit
         return {
@@ -64,33 +348,118 @@ def run_analysis(
 
     p = Path(path)
     dir_file_count: int | None = None
-
-    # Directory scan: collect lines from all matching files, pass as lines=
-    if lines is None and p.is_dir():
-        lines, dir_file_count = _scan_directory(p, glob or "*.log", max_lines)
-
-    out = analyze_log(
-        p,
-        lines=lines,
-        max_lines=max_lines,
-        min_severity=min_severity,
-        deterministic=deterministic,
-        debug=debug,
+    n_jobs = resolve_jobs(jobs)
+    incremental_info: dict[str, int] | None = None
+    cache: ResultCache | None = None
+    proto = LogAggregate(
+        aggregate_floor(min_severity), topk=topk, hll=hll, since=since, until=until, budget=max_memory
     )
 
-    if dir_file_count is not None:
-        out["input_summary"]["files"] = dir_file_count
-        out["input_summary"]["source"] = "dir:" + str(p)  # directory scan
+    # debug runs time every stage (debug_meta.timing); deterministic output stays untimed
+    timer = StageTimer() if debug and not deterministic else None
+    with timed(timer):
+        if lines is None and (p.is_dir() or ((n_jobs > 1 or incremental) and p.is_file())):
+            # Directory scan / parallel file: partial aggregates merged in input order
+            files: Iterable[Path]
+            if p.is_dir():
+                include = [glob] if isinstance(glob, str) else list(glob or ["*.log"])
+                walker = scan_directory(p, include, exclude, max_depth)
+                dir_file_count = 0
+
+                def counted() -> Iterator[Path]:
+                    nonlocal dir_file_count
+                    for f in walker:
+                        dir_file_count += 1
+                        yield f
+
+                files = counted()
+                source = "dir:" + str(p)
+            else:
+                files = [p]
+                source = str(p)
+            with stage("scan"):
+                if order == "time":
+                    agg, cache_stats = _aggregate_merged(
+                        list(files), max_lines=max_lines, parse_cache_size=parse_cache_size, proto=proto
+                    )
+                elif incremental:
+                    agg, cache_stats, incremental_info = _aggregate_incremental(
+                        files,
+                        store=CheckpointStore(checkpoint_dir),
+                        max_lines=max_lines,
+                        parse_cache_size=parse_cache_size,
+                        proto=proto,
+                    )
+                else:
+                    if result_cache and p.is_dir():
+                        cache = ResultCache(cache_dir, verify=cache_verify)
+                    agg, cache_stats = _aggregate_files(
+                        files,
+                        jobs=n_jobs,
+                        max_lines=max_lines,
+                        parse_cache_size=parse_cache_size,
+                        proto=proto,
+                        cache=cache,
+                    )
+                    if cache is not None:
+                        cache.prune()
+                for _ in files:
+                    pass  # input_summary.files counts every match, also those past max_lines
+            with stage("report"):
+                out = build_log_result(
+                    agg,
+                    source=source,
+                    deterministic=deterministic,
+                    min_severity=min_severity,
+                    debug=debug,
+                    parse_cache=cache_stats,
+                )
+        else:
+            out = analyze_log(
+                p,
+                lines=lines,
+                max_lines=max_lines,
+                min_severity=min_severity,
+                deterministic=deterministic,
+                debug=debug,
+                parse_cache_size=parse_cache_size,
+                topk=topk,
+                hll=hll,
+                since=since,
+                until=until,
+                max_memory=max_memory,
+            )
 
+        if dir_file_count is not None:
+            out["input_summary"]["files"] = dir_file_count
+        if incremental_info is not None and "debug_meta" in out:
+            out["debug_meta"]["incremental"] = incremental_info
+        if cache is not None and "debug_meta" in out:
+            out["debug_meta"]["result_cache"] = dict(cache.stats)
+
+        out = finalize_result(out, min_severity=min_severity)
+
+    if timer is not None and "debug_meta" in out:
+        timer.lines = int(out["input_summary"].get("lines") or 0)
+        out["debug_meta"]["timing"] = timer.report()
+    if "debug_meta" in out and tracemalloc.is_tracing():
+        memory = out["debug_meta"].setdefault("memory", {})
+        memory["tracemalloc_peak_bytes"] = tracemalloc.get_traced_memory()[1]
+    return out
+
+
+def finalize_result(out: dict[str, Any], *, min_severity: str | None = None) -> dict[str, Any]:
+    """Turn an analyzer result into the run_analysis contract shape (version, triage)."""
     out["version"] = _pkg_version()  # A: single version source (overrides analyzer hardcode)
 
-    out["triage"] = build_triage(
-        stats=out.get("stats"),
-        top_fingerprints=out.get("top_fingerprints"),
-        findings=out.get("findings"),
-        loose_events=int((out.get("input_summary") or {}).get("loose_events", 0)),
-        min_severity=min_severity or "low",
-    )
+    with stage("triage"):
+        out["triage"] = build_triage(
+            stats=out.get("stats"),
+            top_fingerprints=out.get("top_fingerprints"),
+            findings=out.get("findings"),
+            loose_events=int((out.get("input_summary") or {}).get("loose_events", 0)),
+            min_severity=min_severity or "low",
+        )
 
     out.pop("top_fingerprints", None)  # C: canonical home is triage.top_fingerprints
 
@@ -16,6 +16,30 @@ _RE_EMAIL = re.compile(r"\b[A-Za-z0-9._%+\-]+@[A-Za-z0-9.\-]+\.[A-Za-z]{2,}\b")
 # word boundary before "m", but it is not preceded/followed by another digit).
 _RE_NUM = re.compile(r"(?<!\d)\d{2,}(?!\d)")
 
+# Fused tokenizer: the passes above as one alternation, dispatched on the
+# matched group. UUID/HEX/IPv4/NUM matches can never overlap or touch (each is
+# delimited by \b or a digit lookaround), so one leftmost scan gives the same
+# result as running them in order. EMAIL is the exception: its character class
+# spans the other tokens, so it must see their replacements first -- lines
+# containing "@" take a fused UUID/HEX/IPv4 scan, then EMAIL, then NUM.
+# The leading lookahead lets the scanner skip characters that cannot start a
+# token cheaply; it admits any Unicode digit, like the \d of IPv4/NUM.
+_RE_FUSED = re.compile(
+    r"(?=[\da-fA-F])(?:"
+    rf"({_RE_UUID.pattern})|({_RE_HEX.pattern})|({_RE_IPV4.pattern})|({_RE_NUM.pattern})"
+    r")"
+)
+_RE_FUSED_NO_NUM = re.compile(
+    r"(?=[\da-fA-F])(?:"
+    rf"({_RE_UUID.pattern})|({_RE_HEX.pattern})|({_RE_IPV4.pattern})"
+    r")"
+)
+_TOKENS = (None, "<UUID>", "<HEX>", "<IP>", "<N>")  # indexed by group number
+
+
+def _token(m: re.Match[str]) -> str:
+    return _TOKENS[m.lastindex]  # type: ignore[index]
+
 
 def normalize_message(text: str) -> str:
     """
@@ -34,6 +58,26 @@ def normalize_message(text: str) -> str:
 
     s = text.strip()
 
+    # Single pass unless an EMAIL is possible (see _RE_FUSED)
+    if "@" in s:
+        s = _RE_FUSED_NO_NUM.sub(_token, s)
+        s = _RE_EMAIL.sub("<EMAIL>", s)
+        s = _RE_NUM.sub("<N>", s)
+    else:
+        s = _RE_FUSED.sub(_token, s)
+
+    # Collapse repeated whitespace
+    s = " ".join(s.split())
+    return s
+
+
+def _normalize_message_reference(text: str) -> str:
+    """Pass-per-token normalizer; the specification normalize_message must match."""
+    if not text:
+        return ""
+
+    s = text.strip()
+
     # Order matters: do specific tokens first, then generic numbers
     s = _RE_UUID.sub("<UUID>", s)
     s = _RE_HEX.sub("<HEX>", s)
@@ -0,0 +1,277 @@
+from __future__ import annotations
+
+import asyncio
+import os
+from pathlib import Path
+import time
+from typing import Any, BinaryIO, Callable, Sequence
+
+from itaoagpt.core.analyzers.log import LogAggregate, aggregate_floor, build_log_result, make_classifier
+from itaoagpt.core.engine import finalize_result
+from itaoagpt.core.reader import iter_chunk_lines, sniff_open
+from itaoagpt.core.walk import scan_directory
+
+_READ_BYTES = 1 << 20      # per file per poll: bounds memory while catching up on a backlog
+_MAX_PENDING = 1 << 20     # an unterminated "line" longer than this is flushed as-is
+_RESCAN_SECONDS = 5.0      # directory mode: how often new files are picked up
+
+
+def _ident(path: Path) -> tuple[int, int] | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_dev, st.st_ino
+
+
+class _Tail:
+    """
+    One followed file. Yields only newline-terminated lines; survives
+    rotation (path now points to a new inode: drain the old handle, reopen)
+    and truncation (size dropped below our position: restart at 0).
+    Compressed files are read through their decompressor; positions then
+    count decompressed bytes, so they are not checked for truncation.
+
+    With keep_rotated (directory mode), the old handle of a rotation is kept
+    in `rotated` instead of drained, so the next rescan can hand it to the
+    name it was renamed to (see _rescan).
+    """
+
+    def __init__(self, path: Path, keep_rotated: bool = False) -> None:
+        self.path = path
+        self.keep_rotated = keep_rotated
+        self.fh: BinaryIO | None = None
+        self.ident: tuple[int, int] | None = None
+        self.pos = 0
+        self.pending = b""
+        self.compressed = False
+        self.rotated: _Tail | None = None
+
+    def _open(self) -> bool:
+        try:
+            fh, kind = sniff_open(self.path)
+        except OSError:
+            return False
+        st = os.fstat(fh.fileno())
+        self.fh, self.ident, self.pos, self.pending = fh, (st.st_dev, st.st_ino), 0, b""
+        self.compressed = kind is not None
+        return True
+
+    def take(self, other: _Tail) -> None:
+        """Continue reading other's open file (it was renamed to our path) where it left off."""
+        self.close()
+        self.fh, self.ident, self.pos, self.pending = other.fh, other.ident, other.pos, other.pending
+        self.compressed = other.compressed
+        other.fh, other.ident, other.pos, other.pending = None, None, 0, b""
+
+    def _flush(self) -> list[str]:
+        lines = list(iter_chunk_lines([self.pending])) if self.pending else []
+        self.pending = b""
+        return lines
+
+    def close(self) -> None:
+        if self.fh is not None:
+            self.fh.close()
+            self.fh = None
+
+    def drain(self) -> list[str]:
+        """Read the open file to its end, flush the unterminated rest and close it."""
+        lines: list[str] = []
+        while self.fh is not None and (more := self._chunk()) is not None:
+            lines.extend(more)
+        lines.extend(self._flush())
+        self.close()
+        return lines
+
+    def _chunk(self) -> list[str] | None:
+        """Lines completed by the next chunk of the open file; None at EOF."""
+        assert self.fh is not None
+        try:
+            chunk = self.fh.read(_READ_BYTES)
+        except EOFError:
+            chunk = b""  # compressed file still being written
+        if not chunk:
+            return None
+        start = self.pos
+        self.pos += len(chunk)
+        data = self.pending + chunk
+        cut = data.rfind(b"\n") + 1
+        if cut == 0 and len(data) > _MAX_PENDING:
+            cut = len(data)
+        self.pending = data[cut:]
+        lines = list(iter_chunk_lines([data[:cut]]))
+        if start == 0 and lines and len(data) == len(chunk):
+            lines[0] = lines[0].lstrip("\ufeff")
+        return lines
+
+    def detach(self) -> list[str]:
+        """Our path names another file now: move the old handle to `rotated` (drained unless keep_rotated)."""
+        lines = self.rotated.drain() if self.rotated is not None else []
+        self.rotated = _Tail(self.path)
+        self.rotated.take(self)
+        if not self.keep_rotated:
+            lines.extend(self.rotated.drain())
+            self.rotated = None
+        return lines
+
+    def read(self) -> list[str]:
+        if self.fh is None and (self.rotated is not None or not self._open()):
+            return []  # a rotated-away handle is resolved by the next rescan before we reopen
+        assert self.fh is not None
+        lines = self._chunk()
+        if lines is not None:
+            return lines
+
+        # at EOF: check whether the path was rotated or truncated under us
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return []  # rotated away, new file not created yet
+        if (st.st_dev, st.st_ino) != self.ident:
+            return self.detach()
+        if not self.compressed and st.st_size < self.pos:
+            lines = self._flush()
+            self.fh.seek(0)
+            self.pos = 0
+            return lines
+        return []
+
+
+def _rescan(tails: dict[Path, _Tail], found: list[Path]) -> list[str]:
+    """
+    Bring tails in line with the files a directory rescan found. A name whose
+    file is still open in a tail (renamed by rotation, e.g. app.log ->
+    app-1.log) takes over that handle and position instead of re-reading the
+    file from 0. Handles nobody took, and tails whose file is gone, are
+    drained and closed. Returns the drained lines.
+    """
+    for f in found:
+        if f not in tails:
+            tails[f] = _Tail(f, keep_rotated=True)
+    idents = {path: _ident(path) for path in tails}
+    lines: list[str] = []
+    for path, tail in tails.items():
+        if tail.fh is not None and idents[path] != tail.ident:
+            lines.extend(tail.detach())
+    held = {tail.rotated.ident: tail.rotated for tail in tails.values() if tail.rotated is not None}
+    for path, tail in tails.items():
+        if tail.fh is None and idents[path] in held:
+            tail.take(held.pop(idents[path]))
+    for path, tail in list(tails.items()):
+        if tail.rotated is not None:
+            lines.extend(tail.rotated.drain())
+            tail.rotated = None
+        if idents[path] is None:
+            lines.extend(tail.drain())
+            del tails[path]
+    return lines
+
+
+def _discover(path: Path, include: Sequence[str], exclude: Sequence[str], max_depth: int | None) -> list[Path]:
+    if path.is_dir():
+        return list(scan_directory(path, include, exclude, max_depth))
+    return [path]
+
+
+async def follow_async(
+    path: Path,
+    *,
+    emit: Callable[[dict[str, Any]], None],
+    glob: str | Sequence[str] = "*.log",
+    exclude: Sequence[str] = (),
+    max_depth: int | None = None,
+    interval: float = 10.0,
+    every_events: int = 0,
+    min_severity: str | None = None,
+    deterministic: bool = False,
+    parse_cache_size: int | None = None,
+    topk: int = 0,
+    hll: int = 0,
+    max_memory: int = 0,
+    poll_interval: float = 0.5,
+    max_snapshots: int | None = None,
+) -> int:
+    """
+    Tail a file (or the glob-matching files of a directory) and emit triage snapshots.
+
+    glob / exclude / max_depth select the files of a directory like in
+    run_analysis; the directory is re-walked for new files (see _rescan):
+    a file renamed to a matching name is read on from where it was, and
+    deleted files are closed and no longer counted in input_summary.files.
+
+    The aggregate is updated incrementally; a full run_analysis-shaped
+    snapshot (plus a "snapshot" sequence number) is emitted every `interval`
+    seconds and/or every `every_events` parsed events, and once more on stop.
+    Memory is bounded by distinct fingerprints (or by the topk sketch
+    capacity, or by max_memory bytes past which counts degrade to sketches), and a snapshot costs O(tracked fingerprints) regardless of
+    how many lines were seen.
+
+    Returns the number of snapshots emitted.
+    """
+    p = Path(path)
+    include = [glob] if isinstance(glob, str) else list(glob)
+    source = ("dir:" + str(p)) if p.is_dir() else str(p)
+    agg = LogAggregate(aggregate_floor(min_severity), topk=topk, hll=hll, budget=max_memory)
+    classify = make_classifier(parse_cache_size, agg.floor)
+    tails: dict[Path, _Tail] = {}
+    seq = 0
+
+    def snapshot() -> None:
+        nonlocal seq
+        seq += 1
+        out = build_log_result(
+            agg,
+            source=source,
+            deterministic=deterministic,
+            min_severity=min_severity,
+        )
+        if p.is_dir():
+            out["input_summary"]["files"] = len(tails)
+        out = finalize_result(out, min_severity=min_severity)
+        out["snapshot"] = seq
+        emit(out)
+
+    loop = asyncio.get_running_loop()
+    last_emit = last_scan = time.monotonic()
+    events_at_emit = 0
+    for f in _discover(p, include, exclude, max_depth):
+        tails[f] = _Tail(f, keep_rotated=p.is_dir())
+
+    try:
+        while max_snapshots is None or seq < max_snapshots:
+            busy = False
+            for tail in list(tails.values()):
+                lines = await loop.run_in_executor(None, tail.read)
+                if lines:
+                    busy = True
+                    agg.feed(lines, classify)
+
+            now = time.monotonic()
+            if p.is_dir() and now - last_scan >= _RESCAN_SECONDS:
+                last_scan = now
+                found = _discover(p, include, exclude, max_depth)
+                lines = await loop.run_in_executor(None, _rescan, tails, found)
+                if lines:
+                    agg.feed(lines, classify)
+
+            due_time = interval > 0 and now - last_emit >= interval
+            due_events = every_events > 0 and agg.events - events_at_emit >= every_events
+            if due_time or due_events:
+                snapshot()
+                last_emit, events_at_emit = now, agg.events
+                continue
+            if not busy:
+                await asyncio.sleep(poll_interval)
+    finally:
+        if max_snapshots is None or seq < max_snapshots:
+            snapshot()  # final state on cancel / Ctrl+C
+        for tail in tails.values():
+            tail.close()
+            if tail.rotated is not None:
+                tail.rotated.close()
+    return seq
+
+
+def follow(path: Path, **kwargs: Any) -> int:
+    """Blocking wrapper around follow_async (CLI entry point)."""
+    return asyncio.run(follow_async(path, **kwargs))
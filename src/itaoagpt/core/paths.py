@@ -0,0 +1,14 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+import sys
+
+
+def cache_root() -> Path:
+    """Per-user cache directory for itaoagpt state (checkpoints, result cache)."""
+    if sys.platform.startswith("win"):
+        base = os.environ.get("LOCALAPPDATA") or str(Path.home() / "AppData" / "Local")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(base) / "itaoagpt"
@@ -0,0 +1,305 @@
+from __future__ import annotations
+
+import bz2
+import codecs
+import gzip
+import lzma
+import mmap
+import os
+from pathlib import Path
+from time import perf_counter_ns
+from typing import BinaryIO, Callable, Iterable, Iterator
+
+from itaoagpt.core.timing import active_timer
+
+# 1 MiB reads: large enough to amortize syscalls, small enough to keep RSS flat
+_CHUNK_SIZE = 1 << 20
+
+# every separator str.splitlines() honours
+_LINE_BREAKS = frozenset("\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029")
+
+# name suffixes of compressed logs; the format itself is sniffed from magic bytes
+COMPRESSED_SUFFIXES = (".gz", ".bz2", ".xz")
+_SNIFF_BYTES = 10
+# bzip2: "BZh" + block size digit + the magic of a first block or of an empty stream
+_BZ2_MAGICS = (b"1AY&SY", b"\x17rE8P\x90")
+
+
+def _sniff(head: bytes) -> str | None:
+    if head[:2] == b"\x1f\x8b":
+        return "gzip"
+    if head[:6] == b"\xfd7zXZ\x00":
+        return "xz"
+    if head[:3] == b"BZh" and head[3:4] in b"123456789" and len(head) >= 10 and head[4:10] in _BZ2_MAGICS:
+        return "bz2"
+    return None
+
+
+def compression(path: Path) -> str | None:
+    """Compression format of a file from its magic bytes: "gzip", "bz2", "xz" or None."""
+    with Path(path).open("rb") as fh:
+        return _sniff(fh.read(_SNIFF_BYTES))
+
+
+class _ClosesFile:
+    """Decompressor mixin: close() also closes the file it reads from (opened by open_log)."""
+
+    _file: BinaryIO | None = None
+
+    def close(self) -> None:
+        try:
+            super().close()  # type: ignore[misc]
+        finally:
+            if self._file is not None:
+                self._file.close()
+
+
+class _GzipLog(_ClosesFile, gzip.GzipFile):
+    pass
+
+
+class _Bz2Log(_ClosesFile, bz2.BZ2File):
+    pass
+
+
+class _XzLog(_ClosesFile, lzma.LZMAFile):
+    pass
+
+
+def _decompressor(fh: BinaryIO, kind: str | None, owns_file: bool = False) -> BinaryIO:
+    """Read fh through the decompressor of kind; with owns_file, closing the result closes fh."""
+    dec: BinaryIO
+    if kind == "gzip":
+        dec = (_GzipLog if owns_file else gzip.GzipFile)(fileobj=fh, mode="rb")  # type: ignore[assignment]
+    elif kind == "bz2":
+        dec = (_Bz2Log if owns_file else bz2.BZ2File)(fh, mode="rb")  # type: ignore[assignment]
+    elif kind == "xz":
+        dec = (_XzLog if owns_file else lzma.LZMAFile)(fh, mode="rb")  # type: ignore[assignment]
+    else:
+        return fh
+    if owns_file:
+        dec._file = fh  # type: ignore[attr-defined]
+    return dec
+
+
+def sniff_open(path: Path) -> tuple[BinaryIO, str | None]:
+    """open_log that also returns the compression format it sniffed (None: plain file)."""
+    fh = Path(path).open("rb")
+    try:
+        kind = _sniff(fh.read(_SNIFF_BYTES))
+        fh.seek(0)
+        return _decompressor(fh, kind, owns_file=True), kind
+    except BaseException:
+        fh.close()
+        raise
+
+
+def open_log(path: Path) -> BinaryIO:
+    """
+    Open a log file for binary reading, decompressing gzip/bz2/xz on the fly.
+
+    The format is sniffed from magic bytes, not from the name. Closing the
+    returned stream closes the file.
+    """
+    return sniff_open(path)[0]
+
+
+def open_stream(fh: BinaryIO) -> BinaryIO:
+    """Wrap a buffered binary stream (stdin) in a decompressor when it starts with a known magic."""
+    peek = getattr(fh, "peek", None)
+    head = peek(_SNIFF_BYTES)[:_SNIFF_BYTES] if peek is not None else b""
+    return _decompressor(fh, _sniff(head))
+
+
+def _read_chunks(read: Callable[[int], bytes], size: int) -> Iterator[bytes]:
+    """Chunks of read(size) until EOF; a truncated compressed stream (EOFError) ends early."""
+    try:
+        while chunk := read(size):
+            yield chunk
+    except EOFError:
+        return
+
+
+class LineSplitter:
+    """
+    Incremental form of iter_chunk_lines: push() byte chunks as they arrive
+    and get back their complete lines; flush() returns the rest at the end.
+    """
+
+    __slots__ = ("_decoder", "_pending")
+
+    def __init__(self) -> None:
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._pending = ""
+
+    def push(self, chunk: bytes) -> list[str]:
+        text = self._pending + self._decoder.decode(chunk)
+        if not text:
+            return []
+        lines = text.splitlines()
+        last = text[-1]
+        if last == "\r":
+            # "\r" may be the first half of a "\r\n" that continues in the next chunk
+            self._pending = lines.pop() + "\r"
+        elif last in _LINE_BREAKS:
+            self._pending = ""
+        else:
+            self._pending = lines.pop()
+        return lines
+
+    def flush(self) -> list[str]:
+        text = self._pending + self._decoder.decode(b"", final=True)
+        self._pending = ""
+        return text.splitlines()
+
+
+def iter_chunk_lines(chunks: Iterable[bytes]) -> Iterator[str]:
+    """
+    Yield decoded lines from an iterable of byte chunks.
+
+    Output is identical to ``b"".join(chunks).decode("utf-8", errors="replace").splitlines()``:
+    chunks go through an incremental UTF-8 decoder (multi-byte sequences may
+    straddle chunk borders) and the last, possibly incomplete line of every
+    chunk is carried over to the next one.
+
+    Under an active StageTimer, fetching, decoding and splitting each chunk
+    counts as "read" time.
+    """
+    timer = active_timer()
+    splitter = LineSplitter()
+    t0 = perf_counter_ns() if timer is not None else 0
+    for chunk in chunks:
+        lines = splitter.push(chunk)
+        if timer is not None:
+            timer.add("read", perf_counter_ns() - t0, len(chunk))
+        yield from lines
+        if timer is not None:
+            t0 = perf_counter_ns()
+    yield from splitter.flush()
+
+
+def iter_stream_lines(fh: BinaryIO, *, chunk_size: int = _CHUNK_SIZE) -> Iterator[str]:
+    """
+    Yield decoded lines from a binary stream without reading it all at once.
+
+    Uses read1() when available so pipes (stdin) hand over whatever is
+    buffered instead of blocking until a full chunk arrives.
+    """
+    read = getattr(fh, "read1", None) or fh.read
+    return iter_chunk_lines(_read_chunks(read, chunk_size))
+
+
+def strip_bom(lines: Iterable[str]) -> Iterator[str]:
+    """Strip a UTF-8 BOM from the first line (matches ``lines[0].lstrip("\\ufeff")``)."""
+    it = iter(lines)
+    for first in it:
+        yield first.lstrip("\ufeff")
+        break
+    yield from it
+
+
+def iter_file_lines(path: Path, *, chunk_size: int = _CHUNK_SIZE) -> Iterator[str]:
+    """Stream the lines of a UTF-8 log file (BOM stripped, invalid bytes replaced, decompressed)."""
+    with open_log(path) as fh:
+        yield from strip_bom(iter_stream_lines(fh, chunk_size=chunk_size))
+
+
+def split_ranges(path: Path, parts: int) -> list[tuple[int, int]]:
+    """
+    Split a file into at most ``parts`` contiguous byte ranges ending on b"\n".
+
+    Cutting right after a newline is always a str.splitlines() boundary and
+    never splits a UTF-8 sequence, so decoding the ranges one by one yields
+    exactly the lines of the whole file, in offset order.
+    """
+    with Path(path).open("rb") as fh:
+        size = os.fstat(fh.fileno()).st_size
+        if size == 0:
+            return []
+        if parts <= 1:
+            return [(0, size)]
+        bounds = [0]
+        with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for k in range(1, parts):
+                target = max(bounds[-1], size * k // parts)
+                nl = mm.find(b"\n", target)
+                if nl < 0:
+                    break
+                if nl + 1 > bounds[-1] and nl + 1 < size:
+                    bounds.append(nl + 1)
+    bounds.append(size)
+    return list(zip(bounds, bounds[1:]))
+
+
+def iter_range_lines(
+    path: Path,
+    start: int,
+    end: int,
+    *,
+    chunk_size: int = _CHUNK_SIZE,
+) -> Iterator[str]:
+    """Stream the lines of bytes [start, end) of a file via mmap (BOM stripped at offset 0)."""
+    with Path(path).open("rb") as fh:
+        # the file may have shrunk since split_ranges; an empty one cannot be mapped
+        end = min(end, os.fstat(fh.fileno()).st_size)
+        if start >= end:
+            return
+        with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            chunks = (mm[pos:min(pos + chunk_size, end)] for pos in range(start, end, chunk_size))
+            lines = iter_chunk_lines(chunks)
+            yield from strip_bom(lines) if start == 0 else lines
+
+
+def iter_file_blocks(
+    path: Path,
+    start: int = 0,
+    end: int | None = None,
+    *,
+    block_size: int = _CHUNK_SIZE,
+) -> Iterator[bytes]:
+    """
+    Yield the raw bytes of a file (or of its byte range [start, end)) in
+    blocks of about block_size that end on b"\n" (except the last).
+
+    Uncompressed files are memory-mapped; compressed ones are decompressed
+    as a stream and only support the whole file (start=0, end=None). Under
+    an active StageTimer, producing each block counts as "read" time.
+    """
+    timer = active_timer()
+    t0 = perf_counter_ns() if timer is not None else 0
+    if compression(path) is not None:
+        if start != 0 or end is not None:
+            raise ValueError(f"byte ranges are not supported for compressed files: {path}")
+        with open_log(path) as fh:
+            pending = b""
+            for chunk in _read_chunks(fh.read, block_size):
+                data = pending + chunk
+                cut = data.rfind(b"\n") + 1
+                if timer is not None:
+                    timer.add("read", perf_counter_ns() - t0, len(chunk))
+                if cut:
+                    yield data[:cut]
+                if timer is not None:
+                    t0 = perf_counter_ns()
+                pending = data[cut:]
+            if pending:
+                yield pending
+        return
+
+    with Path(path).open("rb") as fh:
+        size = os.fstat(fh.fileno()).st_size
+        end = size if end is None else min(end, size)
+        if start >= end:
+            return
+        with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            pos = start
+            while pos < end:
+                nl = mm.find(b"\n", min(pos + block_size, end) - 1, end)
+                cut = end if nl < 0 else nl + 1
+                block = mm[pos:cut]
+                if timer is not None:
+                    timer.add("read", perf_counter_ns() - t0, len(block))
+                yield block
+                if timer is not None:
+                    t0 = perf_counter_ns()
+                pos = cut
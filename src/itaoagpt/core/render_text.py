@@ -55,8 +55,12 @@ def render_text_table(result: dict) -> str:
     evs = inp.get("events", 0)
     loose = inp.get("loose_events", 0)
     uniq = tri.get("unique_fingerprints", counts.get("unique_fingerprints", 0))
+    scope = tri.get("scope") or stats.get("scope") or {}
     lines.append(f"file={inp.get('source') or inp.get('input_summary', {}).get('source') or src or '?'}")
-    lines.append(f"lines={lns} events={evs} loose={loose} unique={uniq}")
+    lines.append(
+        f"lines={lns} events={evs} loose={loose} unique={uniq}"
+        + (f" (>= {scope['min_severity']})" if scope.get("min_severity") else "")
+    )
     lines.append("")
     box_rows: list[tuple[str, str]] = [
         ("max", str(tri.get("max_severity", "n/a"))),
@@ -106,6 +110,10 @@ def render_text_ci(out: dict[str, Any]) -> str:
         f"loose={inp.get('loose_events', 0)} "
         f"unique={counts.get('unique_fingerprints', 0)}"
     )
+    scope = stats.get("scope") or {}
+    if scope.get("min_severity"):
+        # unique= and top_issue.* only count events at/above this severity
+        lines.append(f"scope.min_severity={scope['min_severity']}")
 
     # --- Result summary ---
     triage = out.get("triage") or {}
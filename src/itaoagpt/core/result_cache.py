@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+from functools import partial
+import hashlib
+import json
+import os
+from pathlib import Path
+import time
+from typing import Any
+
+import itaoagpt
+from itaoagpt.core.analyzers.log import LogAggregate
+from itaoagpt.core.paths import cache_root
+
+RESULT_CACHE_FORMAT = 1
+_MAX_BYTES = 256 << 20            # total size kept after prune()
+_MAX_AGE_SECONDS = 30 * 24 * 3600  # entries not used for this long are pruned
+# a file modified this recently may change again within the same mtime tick
+# without changing its size, so it is neither served from nor stored in the cache
+_SETTLE_NS = 2_000_000_000
+
+
+def default_result_cache_dir() -> Path:
+    return cache_root() / "results"
+
+
+class ResultCache:
+    """
+    One JSON file per file identity: the serialized LogAggregate of a whole
+    file, reused while the file is unchanged.
+
+    The key covers (path, size, mtime_ns, st_dev, st_ino), the aggregate
+    settings (floor, sketch) and the itaoagpt version; with verify=True also
+    a SHA-256 of the content (reads the file, but skips parsing it). Hits
+    refresh the entry's mtime; prune() drops entries older than max_age and
+    then the least recently used ones beyond max_bytes. I/O errors only make
+    the cache miss: a broken cache never fails an analysis.
+    """
+
+    def __init__(
+        self,
+        root: Path | None = None,
+        *,
+        verify: bool = False,
+        max_bytes: int = _MAX_BYTES,
+        max_age: float = _MAX_AGE_SECONDS,
+    ) -> None:
+        self.root = Path(root) if root is not None else default_result_cache_dir()
+        self.verify = verify
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.stats = {"hits": 0, "misses": 0, "stored": 0}
+
+    def key(self, path: Path, proto: LogAggregate) -> str | None:
+        """Key of the file's current identity, or None when it cannot be cached (yet)."""
+        try:
+            st = os.stat(path)
+            if time.time_ns() - st.st_mtime_ns < _SETTLE_NS:
+                return None
+            fields: dict[str, Any] = {
+                "path": str(Path(path).resolve()),
+                "size": st.st_size,
+                "mtime_ns": st.st_mtime_ns,
+                "dev": st.st_dev,
+                "ino": st.st_ino,
+                "settings": proto.settings(),
+                "version": itaoagpt.__version__,
+            }
+            if self.verify:
+                digest = hashlib.sha256()
+                with open(path, "rb") as fh:
+                    for chunk in iter(partial(fh.read, 1 << 20), b""):
+                        digest.update(chunk)
+                fields["sha256"] = digest.hexdigest()
+        except OSError:
+            return None
+        return json.dumps(fields, sort_keys=True)
+
+    def _entry(self, key: str) -> Path:
+        return self.root / (hashlib.sha256(key.encode("utf-8")).hexdigest()[:32] + ".json")
+
+    def load(self, key: str) -> LogAggregate | None:
+        entry = self._entry(key)
+        try:
+            data = json.loads(entry.read_text(encoding="utf-8"))
+            if data.get("format") != RESULT_CACHE_FORMAT or data.get("key") != key:
+                raise ValueError("stale entry")
+            agg = LogAggregate.from_dict(data["state"])
+            os.utime(entry)
+        except (OSError, ValueError, KeyError, TypeError):
+            self.stats["misses"] += 1
+            return None
+        self.stats["hits"] += 1
+        return agg
+
+    def save(self, key: str, agg: LogAggregate) -> None:
+        entry = self._entry(key)
+        tmp = entry.with_suffix(".tmp")
+        record = {"format": RESULT_CACHE_FORMAT, "key": key, "state": agg.to_dict()}
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(json.dumps(record, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp, entry)
+        except OSError:
+            return
+        self.stats["stored"] += 1
+
+    def prune(self) -> None:
+        """Evict entries older than max_age, then the least recently used beyond max_bytes."""
+        cutoff = time.time() - self.max_age
+        entries = []
+        try:
+            for f in self.root.glob("*.json"):
+                st = f.stat()
+                if st.st_mtime < cutoff:
+                    f.unlink()
+                else:
+                    entries.append((st.st_mtime, st.st_size, f))
+            kept = 0
+            for _, size, f in sorted(entries, key=lambda e: (-e[0], e[2].name)):
+                kept += size
+                if kept > self.max_bytes:
+                    f.unlink()
+        except OSError:
+            pass
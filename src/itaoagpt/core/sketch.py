@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import base64
+import hashlib
+import heapq
+import math
+from typing import Any
+
+
+def stable_hash64(text: str) -> int:
+    """64-bit hash of text that is identical across processes and runs (unlike hash())."""
+    return int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+class SpaceSaving:
+    """
+    Space-Saving heavy-hitter sketch over at most `capacity` items.
+
+    counts[x] is an upper bound of x's true count and counts[x] - errors[x] a
+    lower bound; any item not monitored occurred at most `bound` times. An
+    item entering a full sketch evicts the one with the smallest
+    (count, item) -- the tie-break on the item keeps eviction deterministic
+    no matter how the sketch was built, copied or deserialized.
+
+    Sketches merge (Agarwal et al., "Mergeable Summaries") with the same
+    guarantees, so partials over files, byte ranges or checkpoints can be
+    combined; the merged counters can differ from a single pass, but always
+    stay within the reported bounds.
+    """
+
+    __slots__ = ("capacity", "counts", "errors", "bound", "_heap")
+
+    def __init__(self, capacity: int) -> None:
+        if capacity < 1:
+            raise ValueError(f"capacity must be >= 1, got {capacity}")
+        self.capacity = int(capacity)
+        self.counts: dict[str, int] = {}
+        self.errors: dict[str, int] = {}
+        self.bound = 0
+        # one (count, item) entry per monitored item; counts only grow, so an
+        # entry may be stale (too small) and is refreshed when it surfaces
+        self._heap: list[tuple[int, str]] = []
+
+    def insert(self, item: str) -> str | None:
+        """
+        Count one occurrence of an item that is not monitored yet.
+
+        Monitored items are counted by the caller (counts[item] += 1) to keep
+        the hot path to one dict update. Returns the evicted item, if any.
+        """
+        evicted = None
+        if len(self.counts) >= self.capacity:
+            evicted = self._evict()
+        b = self.bound
+        self.counts[item] = b + 1
+        self.errors[item] = b
+        heapq.heappush(self._heap, (b + 1, item))
+        return evicted
+
+    def add(self, item: str) -> str | None:
+        """Count one occurrence of item; returns the evicted item, if any."""
+        if item in self.counts:
+            self.counts[item] += 1
+            return None
+        return self.insert(item)
+
+    def _evict(self) -> str:
+        heap = self._heap
+        counts = self.counts
+        while True:
+            count, item = heap[0]
+            current = counts[item]
+            if count == current:
+                heapq.heappop(heap)
+                break
+            heapq.heapreplace(heap, (current, item))
+        del counts[item]
+        del self.errors[item]
+        self.bound = max(self.bound, count)
+        return item
+
+    def merge(self, other: SpaceSaving) -> list[str]:
+        """Fold other into this sketch; returns the items no longer monitored."""
+        if other.capacity != self.capacity:
+            raise ValueError(f"cannot merge sketches of capacity {self.capacity} and {other.capacity}")
+        upper: dict[str, int] = {}
+        lower: dict[str, int] = {}
+        for x in self.counts.keys() | other.counts.keys():
+            mine = self.counts.get(x)
+            theirs = other.counts.get(x)
+            upper[x] = (self.bound if mine is None else mine) + (other.bound if theirs is None else theirs)
+            lower[x] = (0 if mine is None else mine - self.errors[x]) + (
+                0 if theirs is None else theirs - other.errors[x]
+            )
+        # keep self's first-seen order, then other's new items
+        order = list(self.counts) + [x for x in other.counts if x not in self.counts]
+        keep = set(heapq.nsmallest(self.capacity, order, key=lambda x: (-upper[x], x)))
+        dropped = [x for x in order if x not in keep]
+        self.bound = max([self.bound + other.bound] + [upper[x] for x in dropped])
+        self.counts = {x: upper[x] for x in order if x in keep}
+        self.errors = {x: upper[x] - lower[x] for x in self.counts}
+        self._heap = [(c, x) for x, c in self.counts.items()]
+        heapq.heapify(self._heap)
+        return dropped
+
+    @classmethod
+    def from_counts(cls, capacity: int, counts: dict[str, int]) -> tuple[SpaceSaving, list[str]]:
+        """
+        Sketch of exact counts: the `capacity` largest stay monitored with
+        error 0 (first-seen order kept), the rest are returned as dropped and
+        raise the bound.
+        """
+        sk = cls(capacity)
+        keep = set(heapq.nsmallest(capacity, counts, key=lambda x: (-counts[x], x)))
+        dropped = [x for x in counts if x not in keep]
+        sk.bound = max((counts[x] for x in dropped), default=0)
+        sk.counts = {x: int(c) for x, c in counts.items() if x in keep}
+        sk.errors = dict.fromkeys(sk.counts, 0)
+        sk._heap = [(c, x) for x, c in sk.counts.items()]
+        heapq.heapify(sk._heap)
+        return sk, dropped
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "capacity": self.capacity,
+            "bound": self.bound,
+            "items": [[x, c, self.errors[x]] for x, c in self.counts.items()],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> SpaceSaving:
+        sk = cls(int(data["capacity"]))
+        sk.bound = int(data["bound"])
+        for x, c, e in data["items"]:
+            sk.counts[x] = int(c)
+            sk.errors[x] = int(e)
+        sk._heap = [(c, x) for x, c in sk.counts.items()]
+        heapq.heapify(sk._heap)
+        return sk
+
+
+class HyperLogLog:
+    """
+    HyperLogLog cardinality estimate over 64-bit hashes (see stable_hash64).
+
+    2**precision one-byte registers; the relative standard error is
+    1.04 / sqrt(2**precision) (precision 14: ~0.8% in 16 KiB). Adding the
+    same hash twice is a no-op and merging is a register-wise max, so
+    sketches of files, byte ranges and checkpointed runs combine exactly
+    into the sketch of the whole input.
+    """
+
+    __slots__ = ("precision", "registers")
+
+    MIN_PRECISION = 4
+    MAX_PRECISION = 18
+
+    def __init__(self, precision: int) -> None:
+        if not self.MIN_PRECISION <= precision <= self.MAX_PRECISION:
+            raise ValueError(
+                f"precision must be in [{self.MIN_PRECISION}, {self.MAX_PRECISION}], got {precision}"
+            )
+        self.precision = int(precision)
+        self.registers = bytearray(1 << self.precision)
+
+    def add(self, h: int) -> None:
+        """Add a 64-bit hash."""
+        bits = 64 - self.precision
+        idx = h >> bits
+        rank = bits - (h & ((1 << bits) - 1)).bit_length() + 1
+        if rank > self.registers[idx]:
+            self.registers[idx] = rank
+
+    def merge(self, other: HyperLogLog) -> None:
+        if other.precision != self.precision:
+            raise ValueError(f"cannot merge precisions {self.precision} and {other.precision}")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+    @property
+    def relative_error(self) -> float:
+        return 1.04 / math.sqrt(len(self.registers))
+
+    def estimate(self) -> float:
+        m = len(self.registers)
+        if m == 16:
+            alpha = 0.673
+        elif m == 32:
+            alpha = 0.697
+        elif m == 64:
+            alpha = 0.709
+        else:
+            alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / math.fsum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if raw <= 2.5 * m and zeros:
+            return m * math.log(m / zeros)  # small range: linear counting
+        return raw  # 64-bit hashes: no large-range correction needed
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"precision": self.precision, "registers": base64.b64encode(self.registers).decode("ascii")}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> HyperLogLog:
+        hll = cls(int(data["precision"]))
+        registers = base64.b64decode(data["registers"])
+        if len(registers) != len(hll.registers):
+            raise ValueError("register count does not match precision")
+        hll.registers = bytearray(registers)
+        return hll
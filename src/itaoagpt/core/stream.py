@@ -0,0 +1,353 @@
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, islice
+import os
+import tracemalloc
+from typing import Any, AsyncIterable, Iterable, Iterator
+
+from itaoagpt.core.analyzers.log import (
+    LogAggregate,
+    aggregate_floor,
+    build_log_result,
+    make_classifier,
+    parse_cache_stats,
+)
+from itaoagpt.core.engine import finalize_result
+from itaoagpt.core.reader import LineSplitter
+from itaoagpt.core.timeline import parse_timestamp
+from itaoagpt.core.timing import StageTimer, stage, timed
+
+_SLICE_LINES = 1_000  # lines aggregated per cooperative slice before yielding to the event loop
+
+
+class Analyzer:
+    """
+    Push-style log analysis for embedding (log shippers, pipelines).
+
+        an = Analyzer(min_severity="medium")
+        for batch in batches:
+            an.feed(batch)           # any iterable of lines, consumed once
+        result = an.finish()
+
+    feed() takes lines without their line breaks (like iter_file_lines);
+    feed_bytes() takes raw UTF-8 chunks split anywhere and carries the
+    unterminated last line over to the next call (so do not interleave the
+    two in the middle of a line). Nothing is buffered beyond that partial
+    line: memory is the aggregate's (see LogAggregate), never the input's.
+
+    snapshot() renders the lines fed so far into the same dict as
+    run_analysis(path, lines=<all of them>, ...) with the same options, and
+    can be called any number of times; finish() also flushes the partial
+    line of feed_bytes() and closes the analyzer. The time window and
+    max_lines cap apply to the whole stream, across calls.
+    """
+
+    def __init__(
+        self,
+        *,
+        min_severity: str | None = None,
+        deterministic: bool = False,
+        debug: bool = False,
+        max_lines: int | None = None,
+        parse_cache_size: int | None = None,
+        topk: int = 0,
+        hll: int = 0,
+        since: int | None = None,
+        until: int | None = None,
+        max_memory: int = 0,
+        source: str = "<stdin>",
+    ) -> None:
+        self.min_severity = min_severity
+        self.deterministic = deterministic
+        self.debug = debug
+        self.source = source
+        self._cap = max_lines if max_lines is not None and max_lines > 0 else None
+        self._taken = 0  # lines admitted so far (max_lines)
+        self._agg = LogAggregate(
+            aggregate_floor(min_severity), topk=topk, hll=hll, since=since, until=until, budget=max_memory
+        )
+        # debug runs time every stage (debug_meta.timing), like run_analysis
+        self._timer = StageTimer() if debug and not deterministic else None
+        with timed(self._timer):
+            self._classify = make_classifier(parse_cache_size, self._agg.floor)
+        self._splitter: LineSplitter | None = None
+        self._first = True  # the next line is the first of the stream (BOM)
+        # time window progress: inside once a line stamped >= since was seen, done at until
+        self._inside = since is None
+        self._done = False
+        self._closed = False
+        # parse cache counters of batches aggregated elsewhere (AsyncAnalyzer workers)
+        self._worker_cache: dict[str, int] = {}
+
+    def feed(self, lines: Iterable[str]) -> None:
+        """Consume lines (any iterable, read once and not copied)."""
+        if self._closed:
+            raise ValueError("analyzer is finished")
+        agg = self._agg
+        before = agg.lines
+        with timed(self._timer), stage("scan"):
+            agg.feed(self._admit(lines), self._classify)
+        self._taken += agg.lines - before
+
+    def feed_bytes(self, chunk: bytes) -> None:
+        """Consume raw UTF-8 bytes; a trailing partial line waits for the next chunk."""
+        if self._closed:
+            raise ValueError("analyzer is finished")
+        if self._splitter is None:
+            self._splitter = LineSplitter()
+        lines = self._splitter.push(chunk)
+        if lines:
+            self.feed(lines)
+
+    def snapshot(self) -> dict[str, Any]:
+        """Result dict (run_analysis shape) of everything fed so far."""
+        timer = self._timer
+        with timed(timer):
+            with stage("report"):
+                out = build_log_result(
+                    self._agg,
+                    source=self.source,
+                    deterministic=self.deterministic,
+                    min_severity=self.min_severity,
+                    debug=self.debug,
+                    parse_cache=self._cache_stats(),
+                )
+            out = finalize_result(out, min_severity=self.min_severity)
+        if timer is not None and "debug_meta" in out:
+            timer.lines = self._agg.lines
+            out["debug_meta"]["timing"] = timer.report()
+        if "debug_meta" in out and tracemalloc.is_tracing():
+            memory = out["debug_meta"].setdefault("memory", {})
+            memory["tracemalloc_peak_bytes"] = tracemalloc.get_traced_memory()[1]
+        return out
+
+    def finish(self) -> dict[str, Any]:
+        """Flush the partial line of feed_bytes(), close the analyzer and return the final result."""
+        if not self._closed and self._splitter is not None:
+            self.feed(self._splitter.flush())
+        self._closed = True
+        return self.snapshot()
+
+    def _feed_admitted(self, lines: list[str]) -> None:
+        """Aggregate lines that already went through _admit() (and were counted in _taken)."""
+        with timed(self._timer), stage("scan"):
+            self._agg.feed(lines, self._classify)
+
+    def _merge_partial(self, part: LogAggregate, cache: dict[str, int]) -> None:
+        """Fold in the aggregate of the admitted lines that follow everything fed so far."""
+        self._agg.merge(part)
+        for k, v in cache.items():
+            self._worker_cache[k] = v if k == "size" else self._worker_cache.get(k, 0) + v
+
+    def _full(self) -> bool:
+        """Nothing more can be admitted: past the time window or at max_lines."""
+        return self._done or (self._cap is not None and self._taken >= self._cap)
+
+    def _admit(self, lines: Iterable[str]) -> Iterator[str]:
+        """lines as the aggregate gets them (BOM, time window, max_lines across calls)."""
+        if self._full():
+            return iter(())
+        events = self._events(lines)
+        return events if self._cap is None else islice(events, self._cap - self._taken)
+
+    def _cache_stats(self) -> dict[str, int]:
+        stats = parse_cache_stats(self._classify)
+        for k, v in self._worker_cache.items():
+            if k != "size":  # per process, not additive
+                stats[k] += v
+        return stats
+
+    def _events(self, lines: Iterable[str]) -> Iterator[str]:
+        """lines with the stream's BOM stripped and the time window applied."""
+        it = iter(lines)
+        if self._first:
+            for first in it:
+                self._first = False
+                it = chain((first.lstrip("\ufeff"),), it)
+                break
+        agg = self._agg
+        if agg.since is None and agg.until is None:
+            yield from it
+            return
+        # window_lines() with its progress kept across calls
+        since, until = agg.since, agg.until
+        for line in it:
+            if not self._inside or until is not None:
+                ts = parse_timestamp(line)
+                if not self._inside:
+                    if ts is None or ts < since:  # type: ignore[operator]
+                        continue
+                    self._inside = True
+                if until is not None and ts is not None and ts >= until:
+                    self._done = True
+                    return
+            yield line
+
+
+def analyze_iter(lines: Iterable[str], **options: Any) -> dict[str, Any]:
+    """One-shot Analyzer over any iterable of lines (options: see Analyzer)."""
+    an = Analyzer(**options)
+    an.feed(lines)
+    return an.finish()
+
+
+def _aggregate_batch(
+    lines: list[str], proto: LogAggregate, parse_cache_size: int | None
+) -> tuple[LogAggregate, dict[str, int]]:
+    """Worker: partial aggregate of admitted lines (top-level so process pools can pickle it)."""
+    agg = proto.empty()
+    classify = make_classifier(parse_cache_size, agg.floor)
+    agg.feed(lines, classify)
+    return agg, parse_cache_stats(classify)
+
+
+class AsyncAnalyzer:
+    """
+    asyncio front end of Analyzer for async ingestion pipelines.
+
+        async with AsyncAnalyzer(min_severity="high", offload_lines=50_000) as an:
+            await an.ingest(source)       # async iterator of lines or byte chunks
+            print((await an.triage())["summary"])
+            result = await an.finish()
+
+    Work runs in cooperative slices of at most slice_lines lines with a yield
+    to the event loop after each, so the loop never stalls for a whole batch.
+    ingest() pulls the next item only once the current slice is done, which
+    is the backpressure: a fast producer waits on the analyzer instead of
+    queueing input in memory.
+
+    With offload_lines > 0, admitted lines are collected (slice by slice)
+    into batches of that many, which are aggregated in a process pool
+    (workers processes, None: CPU count; started on the first batch) and
+    merged in input order. At most 2 * workers batches are in flight; then
+    ingestion waits for the oldest. Results equal the in-process ones
+    (sketched / budgeted counts within their error bounds, like
+    run_analysis jobs).
+
+    snapshot() / triage() first merge the batches in flight and aggregate a
+    partly collected one; their cost is bounded by tracked fingerprints, not
+    by the lines seen.
+    """
+
+    def __init__(
+        self,
+        *,
+        slice_lines: int = _SLICE_LINES,
+        offload_lines: int = 0,
+        workers: int | None = None,
+        **options: Any,
+    ) -> None:
+        self._an = Analyzer(**options)
+        self.slice_lines = max(1, int(slice_lines))
+        self.offload_lines = max(0, int(offload_lines))
+        self.workers = workers if workers is not None and workers > 0 else (os.cpu_count() or 1)
+        self._parse_cache_size = options.get("parse_cache_size")
+        self._pool: ProcessPoolExecutor | None = None
+        self._inflight: deque[asyncio.Future[tuple[LogAggregate, dict[str, int]]]] = deque()
+        self._batch: list[str] = []  # admitted lines collected for the next offloaded batch
+        self._splitter = LineSplitter()
+        self._lock = asyncio.Lock()  # one feeder at a time keeps the input order
+
+    async def __aenter__(self) -> AsyncAnalyzer:
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        await self.aclose()
+
+    async def feed(self, lines: Iterable[str]) -> None:
+        """Consume lines (as Analyzer.feed) in cooperative slices."""
+        async with self._lock:
+            await self._feed(lines)
+
+    async def feed_bytes(self, chunk: bytes) -> None:
+        """Consume raw UTF-8 bytes (as Analyzer.feed_bytes)."""
+        async with self._lock:
+            await self._feed(self._splitter.push(chunk))
+
+    async def ingest(self, source: AsyncIterable[str | bytes]) -> None:
+        """
+        Consume an async iterator (async for) until it is exhausted.
+
+        bytes items are raw chunks split anywhere; str items are whole lines,
+        with or without their line break (e.g. StreamReader.readline()).
+        Stops pulling once the time window or max_lines is done.
+        """
+        async with self._lock:
+            pending: list[str] = []
+            async for item in source:
+                if isinstance(item, str):
+                    pending.extend(item.splitlines())
+                else:
+                    pending.extend(self._splitter.push(bytes(item)))
+                if len(pending) >= self.slice_lines:
+                    await self._feed(pending)
+                    pending = []
+                    if self._an._full():
+                        break
+            await self._feed(pending)
+
+    async def snapshot(self) -> dict[str, Any]:
+        """Result dict (run_analysis shape) of everything fed so far."""
+        async with self._lock:
+            await self._settle()
+            return self._an.snapshot()
+
+    async def triage(self) -> dict[str, Any]:
+        """The triage block (build_triage) of snapshot()."""
+        return (await self.snapshot())["triage"]
+
+    async def finish(self) -> dict[str, Any]:
+        """Flush the partial line of feed_bytes() / ingest(), settle the pool and return the final result."""
+        async with self._lock:
+            await self._feed(self._splitter.flush())
+            await self._settle()
+            result = self._an.finish()
+        await self.aclose()
+        return result
+
+    async def aclose(self) -> None:
+        """Shut the process pool down (batches still in flight are dropped)."""
+        for fut in self._inflight:
+            fut.cancel()
+        self._inflight.clear()
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    async def _feed(self, lines: Iterable[str]) -> None:
+        admitted = self._an._admit(lines)
+        while part := list(islice(admitted, self.slice_lines)):
+            self._an._taken += len(part)
+            if not self.offload_lines:
+                self._an._feed_admitted(part)
+            else:
+                self._batch.extend(part)
+                if len(self._batch) >= self.offload_lines:
+                    await self._submit()
+            await asyncio.sleep(0)
+
+    async def _submit(self) -> None:
+        batch, self._batch = self._batch, []
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        loop = asyncio.get_running_loop()
+        proto = self._an._agg.empty()
+        self._inflight.append(loop.run_in_executor(self._pool, _aggregate_batch, batch, proto, self._parse_cache_size))
+        if len(self._inflight) >= 2 * self.workers:
+            await self._merge_next()
+
+    async def _merge_next(self) -> None:
+        part, cache = await self._inflight.popleft()
+        self._an._merge_partial(part, cache)
+
+    async def _settle(self) -> None:
+        """Merge the batches in flight, then aggregate the partly collected one in slices."""
+        while self._inflight:
+            await self._merge_next()
+        batch, self._batch = self._batch, []
+        for i in range(0, len(batch), self.slice_lines):
+            self._an._feed_admitted(batch[i:i + self.slice_lines])
+            await asyncio.sleep(0)
@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+from datetime import date, datetime, timezone
+from functools import lru_cache
+import heapq
+import mmap
+import os
+from pathlib import Path
+import re
+from typing import Iterable, Iterator, Sequence
+
+from itaoagpt.core.reader import iter_file_lines
+
+# leading "YYYY-MM-DD HH:MM:SS" (also "T" / "/" separators), then an optional
+# fraction and Z / +hh:mm offset
+_TS_HEAD = 19
+_RE_TS_HEAD = re.compile(r"(\d{4})[-/](\d{2})[-/](\d{2})[T ](\d{2}):(\d{2}):(\d{2})")
+_RE_TS_TAIL = re.compile(r"(?:[.,](\d{1,9}))?(Z|[+-]\d{2}:?\d{2})?")
+_EPOCH_DAY = date(1970, 1, 1).toordinal()
+
+# sort key of lines before the first timestamp of a file: ahead of everything
+NO_TIMESTAMP = float("-inf")
+
+# per-file read size while merging: one buffer per open file
+_MERGE_CHUNK = 64 << 10
+
+# find_offset: bisect down to this many bytes, then scan lines
+_BISECT_SPAN = 64 << 10
+_STAMP_PEEK = 48  # bytes read per probe: the longest timestamp form fits
+_BOM = b"\xef\xbb\xbf"
+
+
+@lru_cache(maxsize=4096)
+def _head_seconds(head: str) -> int | None:
+    """Seconds since the epoch of a "YYYY-MM-DD HH:MM:SS" prefix (consecutive lines share it)."""
+    m = _RE_TS_HEAD.fullmatch(head)
+    if m is None:
+        return None
+    y, mo, d, h, mn, s = map(int, m.groups())
+    if h > 23 or mn > 59 or s > 60:
+        return None
+    try:
+        day = date(y, mo, d).toordinal() - _EPOCH_DAY
+    except ValueError:
+        return None
+    return day * 86400 + h * 3600 + mn * 60 + s
+
+
+def parse_timestamp(line: str) -> int | None:
+    """
+    Microseconds since the epoch of a line's leading timestamp, or None.
+
+    Timestamps without a zone are taken as UTC, so only files that share a
+    zone (or state it) interleave correctly.
+    """
+    secs = _head_seconds(line[:_TS_HEAD])
+    if secs is None:
+        return None
+    if line[_TS_HEAD:_TS_HEAD + 1] not in (".", ",", "Z", "+", "-"):
+        return secs * 1_000_000
+    # both parts are optional, so the tail always matches
+    frac, tz = _RE_TS_TAIL.match(line, _TS_HEAD).groups()  # type: ignore[union-attr]
+    if tz and tz != "Z":
+        off = int(tz[1:3]) * 3600 + int(tz[-2:]) * 60
+        secs += -off if tz[0] == "+" else off
+    return secs * 1_000_000 + (int(frac[:6].ljust(6, "0")) if frac else 0)
+
+
+def parse_time_bound(value: str) -> int | None:
+    """
+    A --since/--until value as parse_timestamp() microseconds, or None when
+    it is not exactly one timestamp; a bare date means its midnight.
+    """
+    value = value.strip()
+    if len(value) == 10:
+        value += " 00:00:00"
+    ts = parse_timestamp(value)
+    if ts is None or _RE_TS_TAIL.match(value, _TS_HEAD).end() != len(value):  # type: ignore[union-attr]
+        return None
+    return ts
+
+
+def iter_merged_lines(paths: Sequence[Path], *, chunk_size: int = _MERGE_CHUNK) -> Iterator[str]:
+    """
+    Lines of several files interleaved by leading timestamp (heap k-way merge).
+
+    Only the next line of each file is buffered (plus its read chunk), so
+    every input stays open until it is drained. Each file is assumed to be
+    in time order; a file that is not is still merged deterministically.
+
+    Ties are broken deterministically: a line without a parseable timestamp
+    takes the one of the line before it in the same file (continuations and
+    stack traces stay with their event), lines before a file's first
+    timestamp sort first (NO_TIMESTAMP), and equal timestamps keep the
+    order of `paths`, then the order within the file.
+    """
+    streams = [iter_file_lines(p, chunk_size=chunk_size) for p in paths]
+    heap: list[tuple[float, int, str]] = []
+    parse = parse_timestamp
+    try:
+        for i, stream in enumerate(streams):
+            for line in stream:
+                ts = parse(line)
+                heap.append((NO_TIMESTAMP if ts is None else ts, i, line))
+                break
+        heapq.heapify(heap)
+        while heap:
+            last, i, line = heapq.heappop(heap)
+            yield line
+            # drain file i while it stays ahead of every other file's next line
+            bound = heap[0][:2] if heap else None
+            for line in streams[i]:
+                ts = parse(line)
+                if ts is not None:
+                    last = ts
+                if bound is None or (last, i) < bound:
+                    yield line
+                    continue
+                heapq.heappush(heap, (last, i, line))
+                break
+    finally:
+        for stream in streams:
+            stream.close()
+
+
+def window_lines(lines: Iterable[str], since: int | None, until: int | None) -> Iterator[str]:
+    """
+    The lines of a time-ordered stream from the first one stamped >= since
+    up to (excluding) the first one stamped >= until.
+
+    Unstamped lines go with the stamped line before them, exactly like the
+    byte offsets of find_window(); reading stops at the end of the window.
+    """
+    it = iter(lines)
+    if since is not None:
+        for line in it:
+            ts = parse_timestamp(line)
+            if ts is not None and ts >= since:
+                if until is not None and ts >= until:
+                    return
+                yield line
+                break
+    for line in it:
+        if until is not None:
+            ts = parse_timestamp(line)
+            if ts is not None and ts >= until:
+                return
+        yield line
+
+
+def _stamp_at(mm: mmap.mmap, pos: int) -> int | None:
+    head = mm[pos:pos + _STAMP_PEEK]
+    if pos == 0 and head.startswith(_BOM):
+        head = head[len(_BOM):]
+    return parse_timestamp(head.decode("ascii", errors="replace"))
+
+
+def _next_stamped(mm: mmap.mmap, pos: int, hi: int) -> tuple[int, int | None]:
+    """(offset, timestamp) of the first stamped line starting in [pos, hi), else (hi, None)."""
+    while pos < hi:
+        ts = _stamp_at(mm, pos)
+        if ts is not None:
+            return pos, ts
+        nl = mm.find(b"\n", pos, hi)
+        if nl < 0:
+            break
+        pos = nl + 1
+    return hi, None
+
+
+def find_offset(mm: mmap.mmap, target: int, lo: int, hi: int) -> int:
+    """
+    Offset of the first line in [lo, hi) stamped >= target (hi if none);
+    lo must be a line start and the lines in time order.
+
+    Bisects on byte offsets: each probe resyncs to the next line start and
+    reads forward to the first stamped line, so the cost is O(log n) probes
+    plus one linear scan of at most _BISECT_SPAN bytes.
+    """
+    end = hi
+    while hi - lo > _BISECT_SPAN:
+        mid = (lo + hi) // 2
+        nl = mm.find(b"\n", mid, hi)
+        if nl < 0:
+            hi = mid
+            continue
+        q, ts = _next_stamped(mm, nl + 1, hi)
+        if ts is None or ts >= target:
+            hi = mid
+        else:
+            # every stamped line up to q is before target: resume after it
+            nl = mm.find(b"\n", q, end)
+            lo = end if nl < 0 else nl + 1
+    pos = lo
+    while pos < end:
+        q, ts = _next_stamped(mm, pos, end)
+        if ts is None or ts >= target:
+            return q
+        nl = mm.find(b"\n", q, end)
+        pos = end if nl < 0 else nl + 1
+    return end
+
+
+def find_window(path: Path, since: int | None, until: int | None) -> tuple[int, int]:
+    """
+    Byte range [start, end) of a time-ordered, uncompressed file that
+    window_lines() would keep: found by bisection, without reading the file.
+    """
+    with Path(path).open("rb") as fh:
+        size = os.fstat(fh.fileno()).st_size
+        if size == 0:
+            return 0, 0
+        with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            start = find_offset(mm, since, 0, size) if since is not None else 0
+            end = find_offset(mm, until, start, size) if until is not None else size
+    return start, end
+
+
+def format_timestamp(ts: int) -> str:
+    """ISO 8601 (UTC) form of a parse_timestamp() value."""
+    return datetime.fromtimestamp(ts / 1_000_000, timezone.utc).isoformat().replace("+00:00", "Z")
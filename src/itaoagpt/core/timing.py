@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from time import perf_counter_ns
+from typing import Any, ContextManager, Iterator
+
+# stages reported by StageTimer.report(), in pipeline order
+STAGES = ("read", "parse", "normalize", "aggregate", "report", "triage")
+
+_ACTIVE: ContextVar[StageTimer | None] = ContextVar("itaoagpt_stage_timer", default=None)
+
+
+class StageTimer:
+    """
+    Monotonic nanosecond counters per pipeline stage.
+
+    Only hot-path boundaries that are already coarse are timed: read time
+    per chunk / block (I/O, decompression, decoding, line splitting), parse
+    and normalize time per parse-cache miss. "aggregate" is the rest of the
+    scan (counting, parse-cache hits, byte pre-filter), so instrumentation
+    adds no per-line work. Bytes are counted as read (after decompression).
+    Worker processes (jobs > 1) are not timed: their share of the scan shows
+    up as aggregate time.
+    """
+
+    __slots__ = ("ns", "bytes", "lines")
+
+    def __init__(self) -> None:
+        self.ns: dict[str, int] = dict.fromkeys(STAGES, 0)
+        self.ns["scan"] = 0
+        self.bytes = 0
+        self.lines = 0
+
+    def add(self, stage: str, ns: int, nbytes: int = 0) -> None:
+        self.ns[stage] = self.ns.get(stage, 0) + ns
+        self.bytes += nbytes
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        t0 = perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.add(name, perf_counter_ns() - t0)
+
+    def report(self) -> dict[str, Any]:
+        """debug_meta.timing: milliseconds per stage and scan throughput."""
+        ns = dict(self.ns)
+        ns["aggregate"] = max(0, ns["scan"] - ns["read"] - ns["parse"] - ns["normalize"])
+        scan_s = ns["scan"] / 1e9
+        return {
+            "stages_ms": {k: round(v / 1e6, 3) for k, v in ns.items()},
+            "lines_per_sec": round(self.lines / scan_s) if scan_s else 0,
+            "bytes_per_sec": round(self.bytes / scan_s) if scan_s else 0,
+        }
+
+
+def active_timer() -> StageTimer | None:
+    """The timer of the analysis running in this context, if it is being timed."""
+    return _ACTIVE.get()
+
+
+@contextmanager
+def timed(timer: StageTimer | None) -> Iterator[StageTimer | None]:
+    """Make timer the active one (None: timing off) for the enclosed analysis."""
+    token = _ACTIVE.set(timer)
+    try:
+        yield timer
+    finally:
+        _ACTIVE.reset(token)
+
+
+def stage(name: str) -> ContextManager[Any]:
+    """Time the enclosed block as `name` on the active timer (no-op when timing is off)."""
+    timer = _ACTIVE.get()
+    return timer.stage(name) if timer is not None else nullcontext()
@@ -110,7 +110,7 @@ def build_triage(
         for t in top_fps
     ]
 
-    return {
+    out = {
         "max_severity": max_sev,
         "finding_count": finding_count,
         "total_events": total_events,
@@ -124,3 +124,12 @@ def build_triage(
         "top_issues": top_issues,     # deprecated: use top_fingerprints; removal candidate V1.0
         "actions": actions,
     }
+    scope = _stats.get("scope")
+    if scope:
+        # counted only over events at/above the analysis floor (see stats.scope); summary quotes
+        # unique_fingerprints and actions are derived from top_fingerprints
+        out["scope"] = {
+            "min_severity": scope.get("min_severity"),
+            "fields": ["unique_fingerprints", "top_fingerprints", "top_issues", "summary", "actions"],
+        }
+    return out
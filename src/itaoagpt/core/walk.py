@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+from fnmatch import fnmatch
+import os
+from pathlib import Path
+from typing import Iterator, Sequence
+
+from itaoagpt.core.reader import COMPRESSED_SUFFIXES
+
+
+def _split_pattern(pattern: str) -> tuple[tuple[str, ...], bool]:
+    """(segments, matches the name only) of a pattern; "**" segments stand for any number of directories."""
+    segments: list[str] = []
+    for seg in pattern.replace(os.sep, "/").split("/"):
+        if seg == "**" and segments[-1:] == ["**"]:
+            continue  # "**/**" matches what "**" does
+        segments.append(seg)
+    return tuple(segments), len(segments) == 1
+
+
+def _match_segments(parts: Sequence[str], segments: Sequence[str]) -> bool:
+    """Path.glob semantics: each segment matches one path component, "**" zero or more of them."""
+    if not segments:
+        return not parts
+    head = segments[0]
+    if head == "**":
+        return any(_match_segments(parts[i:], segments[1:]) for i in range(len(parts) + 1))
+    return bool(parts) and fnmatch(parts[0], head) and _match_segments(parts[1:], segments[1:])
+
+
+def _matches(rel: str, name: str, patterns: Sequence[tuple[tuple[str, ...], bool]]) -> bool:
+    parts: list[str] | None = None
+    for segments, name_only in patterns:
+        if name_only:
+            if fnmatch(name, segments[0]):
+                return True
+            continue
+        if parts is None:
+            parts = rel.split("/")
+        if _match_segments(parts, segments):
+            return True
+    return False
+
+
+def _strip_compressed(s: str) -> str | None:
+    for ext in COMPRESSED_SUFFIXES:
+        if s.endswith(ext):
+            return s[: -len(ext)]
+    return None
+
+
+def _pattern_depth(include: Sequence[str]) -> int | None:
+    """Depth the include patterns reach: None (unlimited) with a "**" segment, else their deepest "/"."""
+    depth = 0
+    for segments, _ in map(_split_pattern, include):
+        if "**" in segments:
+            return None
+        depth = max(depth, len(segments) - 1)
+    return depth
+
+
+def walk_files(
+    root: Path,
+    include: Sequence[str] = ("*.log",),
+    exclude: Sequence[str] = (),
+    max_depth: int | None = None,
+) -> Iterator[Path]:
+    """
+    Yield the files under root matching an include and no exclude pattern.
+
+    Patterns are fnmatch patterns: without "/" they match the file name, with
+    "/" the path relative to root one component per segment, as Path.glob
+    does ("*" never crosses "/", a "**" segment spans zero or more
+    directories). A compressed
+    file also matches when its name without .gz/.bz2/.xz does. Excluded
+    directories are not entered. max_depth limits how many directories
+    down files are taken from (0: root only, None: unlimited).
+
+    Every directory is listed once with os.scandir and its entries are
+    visited in name order, descending into subdirectories as they come; the
+    output is therefore in sorted path order, produced lazily, without
+    collecting the tree. Symlinked directories are followed, but a
+    directory (st_dev, st_ino) already visited is skipped, which breaks
+    symlink loops. Unreadable directories are skipped.
+    """
+    inc = [_split_pattern(g) for g in include]
+    exc = [_split_pattern(g) for g in exclude]
+    root = Path(root)
+    try:
+        st = root.stat()
+    except OSError:
+        return
+    visited = {(st.st_dev, st.st_ino)}
+
+    def walk(directory: Path, prefix: str, depth: int) -> Iterator[Path]:
+        try:
+            with os.scandir(directory) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError:
+            return
+        for entry in entries:
+            rel = prefix + entry.name
+            try:
+                is_dir = entry.is_dir()
+                is_file = not is_dir and entry.is_file()
+            except OSError:
+                continue
+            if _matches(rel, entry.name, exc):
+                continue
+            if is_dir:
+                if max_depth is not None and depth >= max_depth:
+                    continue
+                try:
+                    dst = entry.stat()
+                except OSError:
+                    continue
+                ident = (dst.st_dev, dst.st_ino)
+                if ident in visited:
+                    continue
+                visited.add(ident)
+                yield from walk(Path(entry.path), rel + "/", depth + 1)
+            elif is_file:
+                if _matches(rel, entry.name, inc):
+                    yield Path(entry.path)
+                    continue
+                base = _strip_compressed(entry.name)
+                if base is not None and _matches(rel[: len(rel) - len(entry.name)] + base, base, inc):
+                    yield Path(entry.path)
+
+    yield from walk(root, "", 0)
+
+
+def scan_directory(
+    root: Path,
+    include: Sequence[str] = ("*.log",),
+    exclude: Sequence[str] = (),
+    max_depth: int | None = None,
+) -> Iterator[Path]:
+    """
+    walk_files() with the CLI's depth convention: max_depth None follows the
+    patterns (top level only unless they contain "/" or "**"), < 0 is
+    unlimited.
+    """
+    if max_depth is None:
+        depth = _pattern_depth(include)
+    else:
+        depth = None if max_depth < 0 else max_depth
+    return walk_files(root, include, exclude, depth)
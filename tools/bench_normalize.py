@@ -0,0 +1,159 @@
+"""
+normalize_message: equivalence check + micro-benchmark.
+
+Compares the fused single-pass normalizer against the pass-per-token
+reference (_normalize_message_reference) on a fixed corpus of edge cases
+plus a seeded random corpus, then reports lines/sec for both.
+
+Usage (repo root, editable install or PYTHONPATH=src):
+    python tools/bench_normalize.py            # check + benchmark
+    python tools/bench_normalize.py --check    # equivalence only (CI gate)
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from typing import Callable
+
+from itaoagpt.core.fingerprint import _normalize_message_reference, normalize_message
+
+# Hand-picked inputs where token passes can interact (adjacency, overlap,
+# boundaries created or destroyed by earlier replacements).
+CORPUS: tuple[str, ...] = (
+    "",
+    "   ",
+    "db timeout after 2000ms",
+    "db timeout after 3000ms",
+    "out of memory at 0xDEADBEEF",
+    "retrying",
+    "req 550e8400-e29b-41d4-a716-446655440000 failed code=500",
+    "uuid=550E8400-E29B-41D4-A716-446655440000",
+    "abcdefab-abcd-abcd-abcd-abcdefabcdef",
+    "0x550e8400-e29b-41d4-a716-446655440000",
+    "550e8400-e29b-41d4-a716-446655440000-x@foo.com",
+    "550e8400-e29b-41d4-a716-4466554400001",
+    "conn refused 10.0.0.1:5432",
+    "1.2.3.4@foo.com",
+    "x-1.2.3.4@foo.com",
+    "1234.1.2.3.4",
+    "1.2.3.12345678-1234-1234-1234-123456789012",
+    "999.999.999.999 and 1.2.3",
+    "10.20.30.40.50",
+    "0x12.1.2.3.4",
+    "0x12g 0X12 0x 0xZZ",
+    "_12.x@y.com",
+    "user bob.smith+tag@example.org logged in 42 times",
+    "mail to a@b.c and a@b.co and 12@34.com",
+    "ids 1 12 123 1234 a12b 12ab ab12",
+    "tab\tseparated\t\t42",
+    "ünïcödé 123 ok",
+    "code ١٢٣ failed",
+    "port ４４３",
+    "ip ١.٢.٣.٤",
+    "mixed 1٢ and ٣4 and ０x1F",
+    "user ١٢@example.com retried ٤٥ times",
+    "2026-02-24 11:00:02 ERROR db timeout after 2000ms",
+    "GET /api/v1/users/12345/orders?limit=50 200 17ms",
+    "worker-07 pid=31337 rss=1048576 cpu=99.5%",
+)
+
+_ALPHABET: tuple[str, ...] = tuple("0123456789abcdefABCDEFxXg.-@_%+ <>:=/,") + (
+    "0x",
+    "550e8400-e29b-41d4-a716-446655440000",
+    "1.2.3.4",
+    "255.255.255.255",
+    "a@b.co",
+    "ü",
+    "\t",
+    "١",
+    "٧",
+    "４",
+    "९",
+)
+
+# Realistic log messages; also the repetitive half of tools/bench_suite.py's mix
+TEMPLATES: tuple[str, ...] = (
+    "db timeout after {n}ms",
+    "GET /api/v1/users/{n}/orders 200 {n}ms",
+    "req {u} failed code={n}",
+    "conn refused {ip}:{n}",
+    "out of memory at 0x{h}",
+    "cache miss key=session:{n}",
+    "user u{n}@example.com login from {ip}",
+    "retrying",
+    "worker started",
+)
+
+
+def fill_template(template: str, rnd: random.Random) -> str:
+    """template with fresh random {n} / {u} (UUID) / {ip} / {h} (hex) / {w} (word) values."""
+    return template.format(
+        n=rnd.randint(0, 99999),
+        u="%08x-%04x-%04x-%04x-%012x" % tuple(rnd.getrandbits(b) for b in (32, 16, 16, 16, 48)),
+        ip=".".join(str(rnd.randint(0, 255)) for _ in range(4)),
+        h="%x" % rnd.getrandbits(32),
+        w="".join(rnd.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(6)),
+    )
+
+
+def _random_corpus(seed: int, n: int) -> list[str]:
+    rnd = random.Random(seed)
+    return ["".join(rnd.choice(_ALPHABET) for _ in range(rnd.randint(0, 30))) for _ in range(n)]
+
+
+def _log_messages(seed: int, n: int) -> list[str]:
+    rnd = random.Random(seed)
+    return [fill_template(rnd.choice(TEMPLATES), rnd) for _ in range(n)]
+
+
+def check(seed: int, n: int) -> int:
+    bad = 0
+    for text in list(CORPUS) + _random_corpus(seed, n) + _log_messages(seed, n):
+        got = normalize_message(text)
+        want = _normalize_message_reference(text)
+        if got != want:
+            bad += 1
+            if bad <= 10:
+                print(f"[DIFF] {text!r}: fused={got!r} reference={want!r}", file=sys.stderr)
+    return bad
+
+
+def _lines_per_sec(fn: Callable[[str], str], data: list[str], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for text in data:
+            fn(text)
+        best = min(best, time.perf_counter() - t0)
+    return len(data) / best if best > 0 else float("inf")
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--check", action="store_true", help="Only run the equivalence check")
+    ap.add_argument("--lines", type=int, default=200_000, help="Messages per benchmark run (default: 200000)")
+    ap.add_argument("--repeat", type=int, default=3, help="Benchmark repetitions, best is reported (default: 3)")
+    ap.add_argument("--seed", type=int, default=1234)
+    args = ap.parse_args(argv)
+
+    bad = check(args.seed, 50_000)
+    if bad:
+        print(f"[ERR] normalize_message differs from reference on {bad} inputs", file=sys.stderr)
+        return 1
+    print("[OK] normalize_message == reference on corpus")
+    if args.check:
+        return 0
+
+    data = _log_messages(args.seed, args.lines)
+    ref = _lines_per_sec(_normalize_message_reference, data, args.repeat)
+    fused = _lines_per_sec(normalize_message, data, args.repeat)
+    print(f"reference: {ref:>12,.0f} lines/s")
+    print(f"fused:     {fused:>12,.0f} lines/s")
+    print(f"speedup:   {fused / ref:>12.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
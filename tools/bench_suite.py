@@ -0,0 +1,280 @@
+"""
+Benchmark suite: throughput and peak memory against a stored baseline.
+
+Generates seeded synthetic logs (strict and loose lines, continuation
+lines, repetitive and high-cardinality messages, UUID / IP / hex / number
+noise, multi-file directories) and measures, per input size:
+
+    normalize     normalize_message over the generated messages
+    analyze_log   analyze_log on one file (no line cap)
+    run_analysis  run_analysis on a directory of --files files (serial, no result cache)
+    render        render_text_ci / render_text_table / JSON dump of a result
+
+Throughput is the best of --repeat runs (more for short ones, see
+_MIN_TIME); peak memory is the tracemalloc
+peak of one extra run. Generated inputs are kept in --workdir (keyed by
+seed and size), so only the first run pays for them.
+
+Usage (repo root, editable install or PYTHONPATH=src):
+    python tools/bench_suite.py                                  # 10^4 and 10^5 lines
+    python tools/bench_suite.py --sizes 1e4,1e5,1e6,1e7          # up to 10^7 lines
+    python tools/bench_suite.py --baseline tools/bench_baseline.json      # exit 1 on regressions
+    python tools/bench_suite.py --save-baseline tools/bench_baseline.json # refresh the baseline
+
+Rates depend on the machine: compare against a baseline recorded on the
+same machine and Python version (both are stored in the baseline).
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+from itaoagpt.core.analyzers.log import analyze_log
+from itaoagpt.core.engine import run_analysis
+from itaoagpt.core.fingerprint import normalize_message
+from itaoagpt.core.render_text import render_text_ci, render_text_table
+
+from bench_normalize import TEMPLATES, fill_template  # tools/ is sys.path[0] when run as a script
+
+BASELINE_FORMAT = 1
+
+_LEVELS = ("INFO", "INFO", "INFO", "INFO", "DEBUG", "WARN", "WARNING", "ERROR", "CRITICAL", "FATAL", "info")
+
+# tokens the normalizer keeps: one fingerprint per word combination
+_WORDS: tuple[str, ...] = (
+    "alpha", "bravo", "charlie", "delta", "echo", "foxtrot", "golf", "hotel", "india",
+    "juliet", "kilo", "lima", "mike", "november", "oscar", "papa", "quebec", "romeo",
+)
+
+
+def _message(rnd: random.Random) -> str:
+    if rnd.random() < 0.8:
+        # few distinct fingerprints once normalized: the parse cache and fp_counter stay small
+        template = rnd.choice(TEMPLATES)
+    else:
+        # high cardinality: free-form words plus a token that survives normalization
+        template = " ".join(rnd.choice(_WORDS) for _ in range(rnd.randint(2, 5))) + " job-{w} {n}"
+    return fill_template(template, rnd)
+
+
+def iter_messages(seed: int, n: int) -> Iterator[str]:
+    """n messages (no timestamp / level) of the synthetic mix."""
+    rnd = random.Random(seed)
+    for _ in range(n):
+        yield _message(rnd)
+
+
+def iter_log_lines(seed: int, n: int, start: float = 1_767_225_600.0) -> Iterator[str]:
+    """
+    n log lines: ~85% strict (timestamp + level + message, time-ordered),
+    ~10% loose (level keyword without timestamp), ~5% continuation lines.
+    """
+    rnd = random.Random(seed)
+    t = start
+    for _ in range(n):
+        t += rnd.random() * 0.01
+        r = rnd.random()
+        if r < 0.85:
+            stamp = time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(t))
+            yield f"{stamp}.{int(t * 1000) % 1000:03d} {rnd.choice(_LEVELS)} {_message(rnd)}"
+        elif r < 0.95:
+            yield f"[{rnd.choice(('worker', 'api', 'db'))}] {rnd.choice(_LEVELS)}: {_message(rnd)}"
+        else:
+            yield f"    at frame_{rnd.randint(0, 20)}(module.py:{rnd.randint(1, 999)})"
+
+
+def write_log(path: Path, seed: int, n: int) -> Path:
+    """Write n generated lines to path (reused when it already exists)."""
+    if path.exists():
+        return path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    with tmp.open("w", encoding="utf-8", newline="\n") as fh:
+        batch: list[str] = []
+        for line in iter_log_lines(seed, n):
+            batch.append(line)
+            if len(batch) >= 10_000:
+                fh.write("\n".join(batch) + "\n")
+                batch.clear()
+        if batch:
+            fh.write("\n".join(batch) + "\n")
+    tmp.replace(path)
+    return path
+
+
+def write_dir(root: Path, seed: int, n: int, files: int) -> Path:
+    """Split n generated lines over `files` files of one directory."""
+    per, extra = divmod(n, files)
+    for i in range(files):
+        write_log(root / f"app-{i:03d}.log", seed + i, per + (1 if i < extra else 0))
+    return root
+
+
+_MIN_TIME = 1.0  # keep repeating short benchmarks for this many seconds: best-of needs samples
+
+
+def _best(fn: Callable[[], Any], repeat: int) -> float:
+    best = float("inf")
+    runs = 0
+    start = time.perf_counter()
+    while runs < repeat or time.perf_counter() - start < _MIN_TIME:
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+        runs += 1
+    return best
+
+
+def _peak(fn: Callable[[], Any]) -> int:
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _measure(fn: Callable[[], Any], units: int, unit: str, repeat: int) -> dict[str, Any]:
+    seconds = _best(fn, repeat)
+    return {
+        "units": units,
+        "unit": unit,
+        "seconds": round(seconds, 4),
+        "rate": round(units / seconds, 1) if seconds > 0 else 0.0,
+        "peak_bytes": _peak(fn),
+    }
+
+
+_NORMALIZE_CORPUS_MAX = 1_000_000  # bigger sizes cycle over this many messages
+
+
+def _normalize_all(messages: list[str], n: int) -> None:
+    for i in range(n):
+        normalize_message(messages[i % len(messages)])
+
+
+def run_suite(sizes: list[int], *, seed: int, repeat: int, files: int, workdir: Path) -> dict[str, Any]:
+    results: dict[str, Any] = {}
+    for n in sizes:
+        print(f"==> {n:,} lines", file=sys.stderr)
+        log = write_log(workdir / f"s{seed}-n{n}.log", seed, n)
+        directory = write_dir(workdir / f"s{seed}-n{n}-d{files}", seed, n, files)
+
+        messages = list(iter_messages(seed, min(n, _NORMALIZE_CORPUS_MAX)))
+        results[f"normalize@{n}"] = _measure(lambda: _normalize_all(messages, n), n, "lines", repeat)
+        del messages
+        results[f"analyze_log@{n}"] = _measure(
+            lambda: analyze_log(log, deterministic=True, max_lines=0), n, "lines", repeat
+        )
+        results[f"run_analysis@{n}"] = _measure(
+            lambda: run_analysis(directory, deterministic=True, max_lines=0, result_cache=False), n, "lines", repeat
+        )
+
+        out = run_analysis(log, deterministic=True, max_lines=0)
+        calls = 200
+        for name, render in (
+            ("render_ci", render_text_ci),
+            ("render_table", render_text_table),
+            ("render_json", lambda o: json.dumps(o, ensure_ascii=False, indent=2, sort_keys=True)),
+        ):
+            results[f"{name}@{n}"] = _measure(
+                lambda render=render: [render(out) for _ in range(calls)], calls, "calls", repeat
+            )
+        for key in sorted(k for k in results if k.endswith(f"@{n}")):
+            r = results[key]
+            print(f"{key:<24} {r['rate']:>14,.0f} {r['unit']}/s  peak {r['peak_bytes'] / 2**20:>8.1f} MiB")
+    return results
+
+
+def compare(current: dict[str, Any], baseline: dict[str, Any], *, tolerance: float, mem_tolerance: float) -> list[str]:
+    """Regressions of current against baseline: rate below, or peak memory above, the tolerance."""
+    problems: list[str] = []
+    for key, base in sorted(baseline.get("results", {}).items()):
+        cur = current["results"].get(key)
+        if cur is None:
+            continue
+        if cur["rate"] < base["rate"] * (1 - tolerance):
+            problems.append(
+                f"{key}: {cur['rate']:,.0f} {cur['unit']}/s < baseline {base['rate']:,.0f} (-{1 - cur['rate'] / base['rate']:.0%})"
+            )
+        # ignore sub-MiB growth: allocator noise on small inputs
+        if cur["peak_bytes"] > base["peak_bytes"] * (1 + mem_tolerance) and cur["peak_bytes"] - base["peak_bytes"] > 2**20:
+            problems.append(
+                f"{key}: peak {cur['peak_bytes'] / 2**20:.1f} MiB > baseline {base['peak_bytes'] / 2**20:.1f} MiB"
+            )
+    return problems
+
+
+def _parse_sizes(text: str) -> list[int]:
+    return [int(float(s)) for s in text.split(",") if s.strip()]
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--sizes", default="1e4,1e5", help="Comma-separated line counts (default: 1e4,1e5)")
+    ap.add_argument("--repeat", type=int, default=3, help="Timed repetitions, best is reported (default: 3)")
+    ap.add_argument("--files", type=int, default=8, help="Files of the run_analysis directory (default: 8)")
+    ap.add_argument("--seed", type=int, default=1234)
+    ap.add_argument("--workdir", default=None, help="Where generated logs are kept (default: temp dir)")
+    ap.add_argument("--out", default=None, help="Write the results JSON to a file")
+    ap.add_argument("--baseline", default=None, help="Compare against this baseline JSON; exit 1 on regressions")
+    ap.add_argument("--save-baseline", default=None, help="Write the results as the new baseline JSON")
+    ap.add_argument("--tolerance", type=float, default=0.2, help="Allowed throughput drop (default: 0.2 = 20%%)")
+    ap.add_argument("--mem-tolerance", type=float, default=0.2, help="Allowed peak memory growth (default: 0.2)")
+    args = ap.parse_args(argv)
+
+    sizes = _parse_sizes(args.sizes)
+    if not sizes or min(sizes) <= 0 or args.repeat < 1 or args.files < 1:
+        print("[ERR] --sizes, --repeat and --files must be positive", file=sys.stderr)
+        return 1
+    workdir = Path(args.workdir) if args.workdir else Path(tempfile.gettempdir()) / "itaoagpt-bench"
+
+    current = {
+        "format": BASELINE_FORMAT,
+        "meta": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "system": platform.system(),
+            "seed": args.seed,
+            "repeat": args.repeat,
+            "files": args.files,
+        },
+        "results": run_suite(sizes, seed=args.seed, repeat=args.repeat, files=args.files, workdir=workdir),
+    }
+    data = json.dumps(current, indent=2, sort_keys=True) + "\n"
+    if args.out:
+        Path(args.out).write_text(data, encoding="utf-8")
+    if args.save_baseline:
+        Path(args.save_baseline).write_text(data, encoding="utf-8")
+        print(f"[OK] wrote baseline: {args.save_baseline}")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        if baseline.get("format") != BASELINE_FORMAT:
+            print(f"[ERR] unsupported baseline format: {baseline.get('format')}", file=sys.stderr)
+            return 1
+        base_meta = baseline.get("meta", {})
+        for k in ("python", "implementation", "machine", "seed"):
+            if base_meta.get(k) != current["meta"][k]:
+                print(f"[WARN] baseline {k}={base_meta.get(k)} differs from this run ({current['meta'][k]})",
+                      file=sys.stderr)
+        problems = compare(current, baseline, tolerance=args.tolerance, mem_tolerance=args.mem_tolerance)
+        for p in problems:
+            print(f"[REGRESSION] {p}", file=sys.stderr)
+        if problems:
+            return 1
+        print("[OK] no regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
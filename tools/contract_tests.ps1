@@ -241,6 +241,14 @@ $r = Run "$Runner analyze `"$Log`" --type log --json --deterministic --debug"
 Assert-True ($r.rc -eq 0) "deterministic+debug rc != 0"
 Assert-True ($r.out -notmatch '"debug_meta"\s*:') "deterministic+debug must NOT include debug_meta"
 
+# 3.9) debug: per-stage timing in debug_meta, --profile writes a pstats dump
+$profPath = Join-Path (Get-Location).Path "tmp_profile.pstats"
+$dbg = ConvertFrom-JsonStrict ((Invoke-Expression "$Runner analyze `"$Log`" --type log --json --debug --profile `"$profPath`"" 2>$null) -join "`n")
+Assert-True ($null -ne $dbg.debug_meta.timing.stages_ms.read) "debug: debug_meta.timing.stages_ms must report the read stage"
+Assert-True ($null -ne $dbg.debug_meta.timing.lines_per_sec) "debug: debug_meta.timing must report lines_per_sec"
+Assert-True (Test-Path -LiteralPath $profPath) "--profile must write the profile dump"
+Remove-Item -LiteralPath $profPath -Force
+
 # 4) fail-on semantics (expected: high->2, medium->2, low->2)
 $r = Run "$Runner analyze `"$Log`" --type log --json --fail-on high"
 Assert-True ($r.rc -eq 2) "fail-on high expected rc=2 got $($r.rc)"
@@ -356,8 +364,278 @@ Assert-True ($dirJson.input_summary.files -eq 2)  "dirscan: input_summary.files
 Assert-True ($dirJson.input_summary.lines -eq 4)  "dirscan: input_summary.lines must be 4"
 Assert-True ($dirJson.input_summary.source -match '^dir:' ) "dirscan: source must start with dir:"
 Assert-True ($null -ne $dirJson.triage)            "dirscan: triage must be present"
+# max-lines is applied while streaming across files (stops inside b.log)
+$dirCapOut  = (Invoke-Expression "$Runner analyze `"$dirPath`" --glob `"*.log`" --type log --json --max-lines 3") -join "`n"
+$dirCapJson = ConvertFrom-JsonStrict $dirCapOut
+Assert-True ($dirCapJson.input_summary.lines -eq 3) "dirscan: --max-lines 3 must cap input_summary.lines at 3"
+# --jobs: per-file process pool must be byte-identical to the serial scan
+$dirSerial = (Invoke-Expression "$Runner analyze `"$dirPath`" --type log --json --deterministic") -join "`n"
+$dirJobs   = (Invoke-Expression "$Runner analyze `"$dirPath`" --type log --json --deterministic --jobs 2") -join "`n"
+Assert-True ($dirSerial -eq $dirJobs) "dirscan: --jobs 2 output must equal serial output (deterministic)"
+# result cache: files settle (mtime > 2s old), then a cold and a warm run must equal --no-cache
+$rcDir = Join-Path (Get-Location).Path "tmp_result_cache"
+Start-Sleep -Seconds 3
+$rcArgs = "analyze `"$dirPath`" --type log --json --cache-dir `"$rcDir`""
+$rcCold = (Invoke-Expression "$Runner $rcArgs --deterministic") -join "`n"
+$rcWarm = (Invoke-Expression "$Runner $rcArgs --deterministic") -join "`n"
+Assert-True ($rcCold -eq $dirSerial) "result cache: cold run must equal the uncached scan"
+Assert-True ($rcWarm -eq $dirSerial) "result cache: warm run must equal the uncached scan"
+$rcMeta = (ConvertFrom-JsonStrict ((Invoke-Expression "$Runner $rcArgs --debug") -join "`n")).debug_meta.result_cache
+Assert-True ($rcMeta.hits -eq 2) "result cache: both unchanged files must be served from the cache, got $($rcMeta.hits)"
+Remove-Item -Recurse -Force $rcDir
+# compressed logs: b.log.gz / b.log.xz are matched by *.log and decompressed while streaming
+foreach ($mod in @("gzip", "lzma")) {
+  $ext = @{ gzip = "gz"; lzma = "xz" }[$mod]
+  & $Py -c "import $mod, pathlib, sys; p = pathlib.Path(sys.argv[1]); p.with_name(p.name + '.$ext').write_bytes($mod.compress(p.read_bytes())); p.unlink()" (Join-Path $dirPath "b.log")
+  $dirZip = (Invoke-Expression "$Runner analyze `"$dirPath`" --type log --json --deterministic") -join "`n"
+  Assert-True ($dirZip -eq $dirSerial) "dirscan: b.log.$ext must be analyzed like the uncompressed b.log"
+  & $Py -c "import $mod, pathlib, sys; p = pathlib.Path(sys.argv[1]); z = p.with_name(p.name + '.$ext'); p.write_bytes($mod.decompress(z.read_bytes())); z.unlink()" (Join-Path $dirPath "b.log")
+}
+# recursive walk: subdirectories only with --recursive / --max-depth, --exclude prunes them
+$null = New-Item -ItemType Directory -Force -Path (Join-Path $dirPath "pod1")
+"2026-02-24 11:00:04 ERROR disk full" | Set-Content -LiteralPath (Join-Path $dirPath "pod1/c.log") -Encoding utf8
+$walkTop  = ConvertFrom-JsonStrict ((Invoke-Expression "$Runner analyze `"$dirPath`" --type log --json --no-cache") -join "`n")
+$walkRec  = ConvertFrom-JsonStrict ((Invoke-Expression "$Runner analyze `"$dirPath`" --type log --json --no-cache --recursive") -join "`n")
+$walkExcl = ConvertFrom-JsonStrict ((Invoke-Expression "$Runner analyze `"$dirPath`" --type log --json --no-cache --recursive --exclude pod1") -join "`n")
+Assert-True ($walkTop.input_summary.files -eq 2)  "walk: default scan must stay at the top level"
+Assert-True ($walkRec.input_summary.files -eq 3)  "walk: --recursive must include pod1/c.log"
+Assert-True ($walkRec.input_summary.lines -eq 5)  "walk: --recursive must read pod1/c.log"
+Assert-True ($walkExcl.input_summary.files -eq 2) "walk: --exclude pod1 must prune the directory"
+
+# glob semantics: "/" patterns match one component per segment and "**" spans zero or more directories, like Path.glob
+$globCheck = @'
+import sys, tempfile
+from pathlib import Path
+from itaoagpt.core.walk import scan_directory
+files = ["x.log", "a/y.log", "a/b/z.log", "a/b/c/w.log", "b/v.log", "b/b/u.log", "a/b.log/t.log", "c/n.txt", "a/c/b/s.log"]
+# (a trailing "**" is left out: Path.glob only yields directories for it before Python 3.13)
+patterns = ["*.log", "**/*.log", "**/b/*.log", "a/**/*.log", "a/*.log", "*/*.log", "*/b/*.log", "a/**/b/*.log",
+            "**/b/**/*.log", "**/*", "*/*", "**/**/*.log", "a/*/*.log", "?/y.log", "[ab]/**/*.log"]
+with tempfile.TemporaryDirectory() as tmp:
+    root = Path(tmp)
+    for f in files:
+        (root / f).parent.mkdir(parents=True, exist_ok=True)
+        (root / f).write_text("x\n")
+    for pat in patterns:
+        want = sorted(p for p in root.glob(pat) if p.is_file())
+        got = sorted(scan_directory(root, [pat]))
+        assert got == want, "%s: %s != %s" % (pat, got, want)
+print("ok")
+'@
+$globOut = ($globCheck | & $Py - 2>&1 | Out-String).Trim()
+Assert-True ($globOut -eq "ok") "walk: --glob must select the files Path.glob does (got: $globOut)"
 Remove-Item -Recurse -Force $dirPath
 
+# --- time-ordered merge gate: --order time interleaves files by leading timestamp ---
+$tmPath = Join-Path (Get-Location).Path "tmp_timeorder"
+$null = New-Item -ItemType Directory -Force -Path $tmPath
+@'
+2026-02-24 11:00:01 ERROR a one
+2026-02-24 11:00:03 ERROR a three
+'@ | Set-Content -LiteralPath (Join-Path $tmPath "a.log") -Encoding utf8
+"2026-02-24 11:00:02 ERROR b two" | Set-Content -LiteralPath (Join-Path $tmPath "b.log") -Encoding utf8
+$tmName = ConvertFrom-JsonStrict ((Invoke-Expression "$Runner analyze `"$tmPath`" --type log --json --deterministic --no-cache") -join "`n")
+$tmTime = ConvertFrom-JsonStrict ((Invoke-Expression "$Runner analyze `"$tmPath`" --type log --json --deterministic --order time") -join "`n")
+$tmEvidence = @($tmTime.findings | Where-Object { $_.severity -eq "high" })[0].evidence
+Assert-True ($tmEvidence[1] -match "b two") "order time: evidence must follow timestamps across files"
+Assert-True ($tmTime.input_summary.lines -eq $tmName.input_summary.lines) "order time: line count must equal the name-ordered scan"
+Assert-True (($tmTime.by_level | ConvertTo-Json -Compress) -eq ($tmName.by_level | ConvertTo-Json -Compress)) "order time: by_level must equal the name-ordered scan"
+Remove-Item -Recurse -Force $tmPath
+
+# --- time window gate: --since / --until keep [since, until), continuation lines included ---
+$twLog = Join-Path (Get-Location).Path "tmp_timewindow.log"
+@'
+2026-02-24 11:00:01 ERROR one
+2026-02-24 11:00:02 ERROR two
+  at continuation
+2026-02-24 11:00:03 INFO three
+2026-02-24 11:00:04 ERROR four
+'@ | Set-Content -LiteralPath $twLog -Encoding utf8
+$tw = ConvertFrom-JsonStrict ((Invoke-Expression "$Runner analyze `"$twLog`" --type log --json --deterministic --since `"2026-02-24 11:00:02`" --until `"2026-02-24 11:00:04`"") -join "`n")
+Assert-True ($tw.input_summary.lines -eq 3) "time window: must keep lines two..three with the continuation"
+Assert-True ($tw.by_level.ERROR -eq 1) "time window: ERROR count must cover only the window"
+Assert-True ($tw.input_summary.time_window.since -eq "2026-02-24T11:00:02Z") "time window: must be reported in input_summary"
+$null = Invoke-Expression "$Runner analyze `"$twLog`" --type log --json --since yesterday" 2>$null
+Assert-True ($LASTEXITCODE -eq 1) "time window: an invalid --since must exit 1"
+Remove-Item -LiteralPath $twLog -Force
+
+# --- memory budget gate: past --max-memory counts degrade to sketches, reported as approximate ---
+$mbLog = Join-Path (Get-Location).Path "tmp_budget.log"
+# 3000 distinct fingerprints: digits are normalized away, so spell the number in letters
+1..3000 | ForEach-Object { "2026-02-24 11:00:01 ERROR task " + (-join ($_.ToString().ToCharArray() | ForEach-Object { [char](97 + [int]"$_") })) + " failed" } |
+  Set-Content -LiteralPath $mbLog -Encoding utf8
+$mbExact = ConvertFrom-JsonStrict ((Invoke-Expression "$Runner analyze `"$mbLog`" --type log --json --deterministic") -join "`n")
+$mb = ConvertFrom-JsonStrict ((Invoke-Expression "$Runner analyze `"$mbLog`" --type log --json --deterministic --max-memory 64K") -join "`n")
+Assert-True ($null -eq $mbExact.stats.approximate) "memory budget: an unbudgeted run must stay exact"
+Assert-True (@($mb.stats.approximate.memory_budget.fields) -contains "top_fingerprints") "memory budget: degraded fields must be listed"
+Assert-True ($mb.input_summary.lines -eq $mbExact.input_summary.lines) "memory budget: line counts must stay exact"
+Assert-True ($mb.by_level.ERROR -eq $mbExact.by_level.ERROR) "memory budget: by_level must stay exact"
+Remove-Item -LiteralPath $mbLog -Force
+
+# --- fingerprint normalizer gate: fused tokenizer must equal the reference passes ---
+& $Py tools/bench_normalize.py --check
+Assert-True ($LASTEXITCODE -eq 0) "normalize_message: fused tokenizer differs from reference (tools/bench_normalize.py --check)"
+
+# --- incremental gate: checkpointed runs must equal a full rescan ---
+$incLog  = Join-Path (Get-Location).Path "tmp_incremental.log"
+$incCk   = Join-Path (Get-Location).Path "tmp_checkpoints"
+Copy-Item -LiteralPath $log -Destination $incLog -Force
+$incArgs = "analyze `"$incLog`" --type log --json --deterministic --incremental --checkpoint-dir `"$incCk`""
+$inc1 = (Invoke-Expression "$Runner $incArgs") -join "`n"
+Add-Content -LiteralPath $incLog -Value "2026-02-24 11:00:06 ERROR db timeout after 4000ms" -Encoding utf8
+$inc2 = (Invoke-Expression "$Runner $incArgs") -join "`n"
+$full = (Invoke-Expression "$Runner analyze `"$incLog`" --type log --json --deterministic") -join "`n"
+Assert-True ($inc2 -eq $full) "incremental: output after append must equal a full rescan"
+Assert-True ((ConvertFrom-JsonStrict $inc2).input_summary.lines -eq ((ConvertFrom-JsonStrict $inc1).input_summary.lines + 1)) "incremental: appended line must be counted"
+Remove-Item -LiteralPath $incLog -Force
+Remove-Item -Recurse -Force $incCk
+
+# --- byte pre-filter gate: --min-severity high keeps line/level counts exact ---
+$pfLow  = ConvertFrom-JsonStrict ((Invoke-Expression "$Runner analyze `"$Log`" --type log --json --deterministic --max-lines 0") -join "`n")
+$pfHigh = ConvertFrom-JsonStrict ((Invoke-Expression "$Runner analyze `"$Log`" --type log --json --deterministic --max-lines 0 --min-severity high") -join "`n")
+Assert-True ($pfHigh.input_summary.lines -eq $pfLow.input_summary.lines) "prefilter: input_summary.lines must match the unfiltered run"
+Assert-True ($pfHigh.input_summary.events -eq $pfLow.input_summary.events) "prefilter: input_summary.events must match the unfiltered run"
+Assert-True (($pfHigh.by_level | ConvertTo-Json -Compress) -eq ($pfLow.by_level | ConvertTo-Json -Compress)) "prefilter: by_level must match the unfiltered run"
+Assert-True ($pfHigh.stats.scope.min_severity -eq "high") "prefilter: stats.scope must mark fingerprint fields as high-only"
+Assert-True ($null -eq $pfLow.stats.scope) "prefilter: unfiltered run must not carry stats.scope"
+Assert-True ($pfHigh.triage.scope.min_severity -eq "high") "prefilter: triage.scope must mark unique_fingerprints/top_fingerprints as high-only"
+foreach ($field in @("unique_fingerprints", "top_fingerprints", "top_issues", "summary", "actions")) {
+  Assert-True ($pfHigh.triage.scope.fields -contains $field) "prefilter: triage.scope.fields must list $field (derived from the scoped fingerprints)"
+}
+$pfMed = ConvertFrom-JsonStrict ((Invoke-Expression "$Runner analyze `"$Log`" --type log --json --deterministic --max-lines 0 --min-severity medium") -join "`n")
+Assert-True ($pfMed.input_summary.events -eq $pfLow.input_summary.events) "prefilter: medium input_summary.events must match the unfiltered run"
+Assert-True (($pfMed.by_level | ConvertTo-Json -Compress) -eq ($pfLow.by_level | ConvertTo-Json -Compress)) "prefilter: medium by_level must match the unfiltered run"
+Assert-True ($pfMed.stats.scope.min_severity -eq "medium") "prefilter: stats.scope must mark fingerprint fields as medium-and-above"
+Assert-True ($pfMed.stats.counts.unique_fingerprints -le $pfLow.stats.counts.unique_fingerprints) "prefilter: medium unique_fingerprints cannot exceed the unfiltered count"
+$pfCi = (Invoke-Expression "$Runner analyze `"$Log`" --type log --text --deterministic --max-lines 0 --min-severity medium") -join "`n"
+Assert-True ($pfCi -match "scope\.min_severity=medium") "prefilter: --text must print scope.min_severity when fingerprint stats are scoped"
+
+# --- follow gate: appends, truncation, rename rotation to a matching name and deletion keep exact counts ---
+$followCheck = @'
+import asyncio, tempfile
+from pathlib import Path
+import itaoagpt.core.follow as follow
+
+follow._RESCAN_SECONDS = 0.0  # rescan on every poll
+
+def write(path, n, mode="a", start=0):
+    with open(path, mode, encoding="utf-8") as fh:
+        for i in range(start, start + n):
+            fh.write("2024-01-01 00:00:%02d ERROR request %d failed\n" % (i % 60, i))
+
+with tempfile.TemporaryDirectory() as tmp:
+    root = Path(tmp)
+    app = root / "app.log"
+    write(app, 5, "w")
+    steps = [
+        lambda: write(app, 3),                                   # append
+        lambda: write(app, 2, "w"),                              # truncate + rewrite
+        lambda: (app.rename(root / "app-1.log"), write(root / "app-1.log", 1), write(app, 1, "w")),  # rename rotation
+        lambda: (root / "app-1.log").unlink(),                   # rotated file deleted
+        lambda: None,
+    ]
+    want = [(5, 1), (8, 1), (10, 1), (12, 2), (12, 1)]
+    got = []
+
+    def emit(out):
+        got.append((out["input_summary"]["lines"], out["input_summary"]["files"], out["input_summary"]["events"]))
+        steps[len(got) - 1]()
+
+    asyncio.run(follow.follow_async(root, emit=emit, glob="*.log", interval=0.2, poll_interval=0.01,
+                                    max_snapshots=len(want)))
+    assert [(l, f) for l, f, _ in got] == want, got
+    assert all(e == l for l, _, e in got), got
+print("ok")
+'@
+$followOut = ($followCheck | & $Py - 2>&1 | Out-String).Trim()
+Assert-True ($followOut -eq "ok") "follow: snapshots must count every line once across append/truncate/rotate/delete (got: $followOut)"
+
+# --- Python API gate: Analyzer / AsyncAnalyzer fed in batches / raw chunks equal run_analysis over the same lines ---
+$apiCheck = @'
+import json, sys
+from itaoagpt import Analyzer
+from itaoagpt.core.engine import run_analysis
+raw = open(sys.argv[1], "rb").read()
+lines = raw.decode("utf-8", errors="replace").splitlines()
+want = json.dumps(run_analysis("<stdin>", lines=iter(lines), deterministic=True, min_severity="medium"), sort_keys=True)
+an = Analyzer(deterministic=True, min_severity="medium")
+for i in range(0, len(lines), 3):
+    an.feed(line for line in lines[i:i + 3])
+assert json.dumps(an.finish(), sort_keys=True) == want, "feed"
+an = Analyzer(deterministic=True, min_severity="medium")
+for i in range(0, len(raw), 7):
+    an.feed_bytes(raw[i:i + 7])
+assert json.dumps(an.finish(), sort_keys=True) == want, "feed_bytes"
+import asyncio
+from itaoagpt import AsyncAnalyzer
+async def chunks():
+    for i in range(0, len(raw), 5):
+        yield raw[i:i + 5]
+async def run(offload):
+    async with AsyncAnalyzer(deterministic=True, min_severity="medium", slice_lines=2, offload_lines=offload, workers=2) as an:
+        await an.ingest(chunks())
+        assert (await an.triage())["total_events"] >= 0
+        return await an.finish()
+for offload in (0, 4):
+    assert json.dumps(asyncio.run(run(offload)), sort_keys=True) == want, "async offload=%d" % offload
+print("ok")
+'@
+$apiOut = ($apiCheck | & $Py - $Log 2>&1 | Out-String).Trim()
+Assert-True ($apiOut -eq "ok") "python api: Analyzer/AsyncAnalyzer must equal run_analysis over the same lines (got: $apiOut)"
+
+# --- serve gate: analyze forwarded to `itaoagpt serve` must match the in-process run ---
+if (-not $IsWindows) {
+  $sock = Join-Path ([System.IO.Path]::GetTempPath()) "itaoagpt-contract-$PID.sock"
+  $runnerArgs = ($Runner -split ' ', 2)[1]   # "-m itaoagpt.cli.main", or empty for an installed exe
+  $srv = Start-Process -FilePath $Py -ArgumentList "$runnerArgs serve --socket `"$sock`" --idle-timeout 60".Trim() -PassThru -RedirectStandardError "$sock.log"
+  try {
+    for ($i = 0; ($i -lt 50) -and -not (Test-Path $sock); $i++) { Start-Sleep -Milliseconds 100 }
+    Assert-True (Test-Path $sock) "serve: socket was not created"
+    foreach ($extra in @("--json --deterministic --max-lines 0", "--text --min-severity medium --fail-on high")) {
+      $local = Run "$Runner analyze `"$Log`" --type log $extra"
+      $env:ITAOAGPT_SOCKET = $sock
+      try { $remote = Run "$Runner analyze `"$Log`" --type log $extra" } finally { Remove-Item Env:ITAOAGPT_SOCKET }
+      Assert-True (($remote.rc -eq $local.rc) -and ($remote.out -eq $local.out)) "serve: forwarded '$extra' must equal the in-process run (rc $($remote.rc) vs $($local.rc))"
+      Assert-True (-not ($remote.out -match "server unavailable")) "serve: client fell back to in-process"
+    }
+  } finally {
+    Stop-Process -Id $srv.Id -ErrorAction SilentlyContinue
+    Remove-Item $sock, "$sock.log" -ErrorAction SilentlyContinue
+  }
+}
+
+# --- analyze-batch gate: one JSON line per input, each equal to its own analyze run ---
+$batchInputs = @($Log, "does-not-exist.log")
+$r = Run "$Runner analyze-batch `"$Log`" does-not-exist.log --type log --deterministic --max-lines 0 --fail-on high --jobs 2"
+Assert-True ($r.rc -eq 1) "analyze-batch: a missing input must make the aggregate rc 1, got $($r.rc)"
+$batchLines = @($r.out -split "`r?`n" | Where-Object { $_.StartsWith("{") })
+Assert-True ($batchLines.Count -eq $batchInputs.Count) "analyze-batch: expected $($batchInputs.Count) JSON lines, got $($batchLines.Count)"
+$b0 = ConvertFrom-JsonStrict $batchLines[0]
+$single = Run "$Runner analyze `"$Log`" --type log --json --deterministic --max-lines 0 --fail-on high"
+$singleJson = ConvertFrom-JsonStrict $single.out
+Assert-True (($b0.batch.index -eq 0) -and ($b0.batch.exit_code -eq $single.rc)) "analyze-batch: line 0 must carry the input's own analyze exit code"
+$b0.PSObject.Properties.Remove("batch")
+Assert-True (($b0 | ConvertTo-Json -Depth 20 -Compress) -eq ($singleJson | ConvertTo-Json -Depth 20 -Compress)) "analyze-batch: line 0 must equal analyze --json for the same input"
+$b1 = ConvertFrom-JsonStrict $batchLines[1]
+Assert-True (($b1.batch.exit_code -eq 1) -and ($b1.batch.error -match "path not found")) "analyze-batch: a missing input must get an error line"
+Assert-True ($r.out -match "\[BATCH\] inputs=2 ") "analyze-batch: stderr summary missing"
+
+# --- top-k sketch gate: a sketch larger than the distinct fingerprints is exact ---
+$skJson = ConvertFrom-JsonStrict ((Invoke-Expression "$Runner analyze `"$Log`" --type log --json --deterministic --max-lines 0 --topk-sketch 1000") -join "`n")
+Assert-True ($skJson.stats.approximate.top_fingerprints.method -eq "space_saving") "topk-sketch: stats.approximate must describe the sketch"
+Assert-True ($skJson.stats.counts.unique_fingerprints -eq $pfLow.stats.counts.unique_fingerprints) "topk-sketch: unique_fingerprints must stay exact"
+for ($i = 0; $i -lt $pfLow.triage.top_fingerprints.Count; $i++) {
+  $want = $pfLow.triage.top_fingerprints[$i]
+  $got  = $skJson.triage.top_fingerprints[$i]
+  Assert-True (($got.fingerprint -eq $want.fingerprint) -and ($got.count -eq $want.count) -and ($got.count_error -eq 0)) "topk-sketch: top_fingerprints[$i] must equal the exact run with count_error 0"
+}
+
+# --- HyperLogLog gate: estimate labelled and within 3 standard errors of the exact count ---
+$hllJson = ConvertFrom-JsonStrict ((Invoke-Expression "$Runner analyze `"$Log`" --type log --json --deterministic --max-lines 0 --hll-precision 12") -join "`n")
+$hllMeta = $hllJson.stats.approximate.unique_fingerprints
+Assert-True ($hllMeta.method -eq "hyperloglog") "hll: stats.approximate.unique_fingerprints must describe the estimate"
+Assert-True ([math]::Abs($hllMeta.estimate - $pfLow.stats.counts.unique_fingerprints) -le (3 * $hllMeta.std_error + 1)) "hll: estimate too far from the exact unique count"
+
 # 7) --format table smoke
 Write-Host "==> --format table smoke" -ForegroundColor Cyan
 $r = Run "$Runner analyze `"$Log`" --type log --text --format table"